@@ -0,0 +1,59 @@
+import { describe, it, expect, vi, afterEach } from "vitest";
+
+async function loadTelemetry(enabled: boolean) {
+  vi.resetModules();
+  vi.stubEnv("CACHE_TELEMETRY", enabled ? "1" : "");
+  const mod = await import("@/lib/cache.telemetry");
+  mod.resetCacheTelemetry();
+  return mod;
+}
+
+afterEach(() => {
+  vi.unstubAllEnvs();
+});
+
+describe("instrumentedCache", () => {
+  it("does not record anything when CACHE_TELEMETRY is off", async () => {
+    const { instrumentedCache, getCacheTelemetry, cacheTelemetryEnabled } = await loadTelemetry(false);
+    const loader = instrumentedCache("getCachedX", async (id: string) => ({ id }));
+
+    await expect(loader("a")).resolves.toEqual({ id: "a" });
+    expect(cacheTelemetryEnabled).toBe(false);
+    expect(getCacheTelemetry()).toEqual({});
+  });
+
+  it("counts loader executions, first runs per argument set and payload bytes", async () => {
+    const { instrumentedCache, getCacheTelemetry } = await loadTelemetry(true);
+    const loader = instrumentedCache("getCachedClientes", async (page: number) => ({ page, rows: [1, 2] }));
+
+    await loader(1);
+    await loader(1);
+    await loader(2);
+
+    const stats = getCacheTelemetry().getCachedClientes;
+    expect(stats.calls).toBe(3);
+    expect(stats.misses + stats.hits).toBe(3);
+    expect(stats.firstRuns).toBe(2);
+    expect(stats.keys).toBe(2);
+    expect(stats.maxBytes).toBe(JSON.stringify({ page: 1, rows: [1, 2] }).length);
+    expect(stats.errors).toBe(0);
+  });
+
+  it("counts loader errors and still rethrows them", async () => {
+    const { instrumentedCache, getCacheTelemetry } = await loadTelemetry(true);
+    const loader = instrumentedCache("getCachedProyecto", async () => {
+      throw new Error("boom");
+    });
+
+    await expect(loader()).rejects.toThrow("boom");
+    expect(getCacheTelemetry().getCachedProyecto.errors).toBe(1);
+  });
+
+  it("resets every family", async () => {
+    const { instrumentedCache, getCacheTelemetry, resetCacheTelemetry } = await loadTelemetry(true);
+    await instrumentedCache("getCachedLotes", async () => [])();
+
+    resetCacheTelemetry();
+    expect(getCacheTelemetry()).toEqual({});
+  });
+});
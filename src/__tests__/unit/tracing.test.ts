@@ -0,0 +1,71 @@
+import { describe, it, expect } from "vitest";
+import { context, propagation, trace, SpanKind } from "next/dist/compiled/@opentelemetry/api";
+import {
+  formatTraceparent,
+  parseTraceparent,
+  registerTracing,
+  toOtlpRequest,
+  type ExportedSpan,
+} from "@/lib/tracing";
+
+const TRACE_ID = "4bf92f3577b34da6a3ce929d0e0e4736";
+const PARENT_ID = "00f067aa0ba902b7";
+
+describe("traceparent", () => {
+  it("round-trips a valid header", () => {
+    const header = `00-${TRACE_ID}-${PARENT_ID}-01`;
+    const parsed = parseTraceparent(header);
+
+    expect(parsed).toMatchObject({ traceId: TRACE_ID, spanId: PARENT_ID, traceFlags: 1, isRemote: true });
+    expect(formatTraceparent(parsed!)).toBe(header);
+  });
+
+  it("rejects malformed or all-zero ids", () => {
+    expect(parseTraceparent(undefined)).toBeNull();
+    expect(parseTraceparent("00-abc-def-01")).toBeNull();
+    expect(parseTraceparent(`00-${"0".repeat(32)}-${PARENT_ID}-01`)).toBeNull();
+    expect(parseTraceparent(`00-${TRACE_ID}-${"0".repeat(16)}-01`)).toBeNull();
+  });
+});
+
+describe("registerTracing", () => {
+  it("does nothing without an endpoint", () => {
+    expect(registerTracing("")).toBe(false);
+  });
+
+  it("parents server spans on the incoming traceparent", () => {
+    const spans: ExportedSpan[] = [];
+    expect(registerTracing(undefined, { add: (span) => spans.push(span) })).toBe(true);
+
+    const incoming = propagation.extract(context.active(), { traceparent: `00-${TRACE_ID}-${PARENT_ID}-01` }, {
+      get: (carrier: Record<string, string>, key) => carrier[key],
+      keys: (carrier: Record<string, string>) => Object.keys(carrier),
+    });
+    const tracer = trace.getTracer("next.js");
+    const outgoing: Record<string, string> = {};
+
+    context.with(incoming, () => {
+      tracer.startActiveSpan("GET /api/clientes/search", { kind: SpanKind.SERVER }, (server) => {
+        const fetchSpan = tracer.startSpan("fetch GET /rest/v1/cliente", { kind: SpanKind.CLIENT });
+        propagation.inject(trace.setSpan(context.active(), fetchSpan), outgoing, {
+          set: (carrier: Record<string, string>, key, value) => { carrier[key] = value; },
+        });
+        fetchSpan.end();
+        server.setAttribute("http.status_code", 200);
+        server.end();
+      });
+    });
+
+    const [fetchSpan, server] = spans;
+    expect(server).toMatchObject({ traceId: TRACE_ID, parentSpanId: PARENT_ID, kind: 2 });
+    expect(fetchSpan).toMatchObject({ traceId: TRACE_ID, parentSpanId: server.spanId, kind: 3 });
+    expect(outgoing.traceparent).toBe(`00-${TRACE_ID}-${fetchSpan.spanId}-01`);
+    expect(BigInt(server.endTimeUnixNano)).toBeGreaterThanOrEqual(BigInt(server.startTimeUnixNano));
+
+    const body = toOtlpRequest(spans, "amersurcrm");
+    expect(body.resourceSpans[0].resource.attributes).toEqual([
+      { key: "service.name", value: { stringValue: "amersurcrm" } },
+    ]);
+    expect(body.resourceSpans[0].scopeSpans[0].scope.name).toBe("next.js");
+  });
+});
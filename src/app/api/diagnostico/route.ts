@@ -1,5 +1,11 @@
 import { NextRequest, NextResponse } from "next/server";
 import { createServerOnlyClient } from "@/lib/supabase.server";
+import { esAdmin } from "@/lib/permissions/server";
+import {
+  cacheTelemetryEnabled,
+  getCacheTelemetry,
+  resetCacheTelemetry,
+} from "@/lib/cache.telemetry";
 
 export const dynamic = "force-dynamic";
 
@@ -10,6 +16,30 @@ export async function GET(req: NextRequest) {
     return NextResponse.json({ error: "No autorizado" }, { status: 401 });
   }
 
+  // Telemetría de cache.server.ts (solo con CACHE_TELEMETRY=1; sin ella la
+  // rama no existe): ?cache=1 devuelve los contadores por loader y
+  // ?cache=reset además los reinicia, esto último solo para administradores.
+  const cacheParam = req.nextUrl.searchParams.get("cache");
+  if (cacheParam) {
+    if (!cacheTelemetryEnabled) {
+      return NextResponse.json({ error: "No encontrado" }, { status: 404 });
+    }
+    if (cacheParam === "reset" && !(await esAdmin())) {
+      return NextResponse.json(
+        { error: "No tienes permisos de administrador" },
+        { status: 403 },
+      );
+    }
+    const families = getCacheTelemetry();
+    if (cacheParam === "reset") resetCacheTelemetry();
+    return NextResponse.json({
+      enabled: cacheTelemetryEnabled,
+      scope: "request",
+      pid: process.pid,
+      families,
+    });
+  }
+
   const userAgent = req.headers.get("user-agent") || "unknown";
   const isIOS = /iPhone|iPad|iPod/.test(userAgent);
   const isSafari = /Safari/.test(userAgent) && !/Chrome/.test(userAgent);
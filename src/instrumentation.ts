@@ -1,4 +1,10 @@
 export async function register() {
+  // Trazas OTLP para el escenario `trace` del harness de benchmarks (opt-in)
+  if (process.env.NEXT_RUNTIME === "nodejs" && process.env.OTEL_EXPORTER_OTLP_ENDPOINT) {
+    const { registerTracing } = await import("./lib/tracing");
+    registerTracing();
+  }
+
   // Solo en desarrollo y solo en Node.js runtime
   if (process.env.NODE_ENV === "development" && process.env.NEXT_RUNTIME === "nodejs") {
     const originalConsoleError = console.error;
@@ -1,6 +1,6 @@
 import "server-only";
-import { cache } from "react";
 import { createOptimizedServerClient, getCachedUserId } from "./supabase.server";
+import { instrumentedCache } from "./cache.telemetry";
 import type {
   ClienteCached,
   ProyectoCached,
@@ -66,7 +66,7 @@ const CLIENTE_DASHBOARD_COLUMNS = `
       created_at
     `;
 
-export const getCachedClientes = cache(async (params?: GetClientesParams): Promise<{ data: ClienteCached[], total: number }> => {
+export const getCachedClientes = instrumentedCache("getCachedClientes", async (params?: GetClientesParams): Promise<{ data: ClienteCached[], total: number }> => {
   const supabase = await createOptimizedServerClient();
   const userId = await getUserIdOrNull(supabase);
   if (!userId) return { data: [], total: 0 };
@@ -304,7 +304,7 @@ export const getCachedClientes = cache(async (params?: GetClientesParams): Promi
   };
 });
 
-export const getCachedClientesTotal = cache(async (): Promise<number> => {
+export const getCachedClientesTotal = instrumentedCache("getCachedClientesTotal", async (): Promise<number> => {
   const supabase = await createOptimizedServerClient();
   const userId = await getUserIdOrNull(supabase);
   if (!userId) return 0;
@@ -337,7 +337,7 @@ export const getCachedClientesTotal = cache(async (): Promise<number> => {
   return count ?? 0;
 });
 
-export const getCachedLeadsStatsByOrigen = cache(async (): Promise<{ origen: string; count: number }[]> => {
+export const getCachedLeadsStatsByOrigen = instrumentedCache("getCachedLeadsStatsByOrigen", async (): Promise<{ origen: string; count: number }[]> => {
   const supabase = await createOptimizedServerClient();
   const userId = await getUserIdOrNull(supabase);
   if (!userId) return [];
@@ -395,7 +395,7 @@ export type PipelineResult = {
   totalesPorEstado: Record<string, number>;
 };
 
-export const getCachedPipelineClientes = cache(
+export const getCachedPipelineClientes = instrumentedCache("getCachedPipelineClientes",
   async (params?: GetPipelineParams): Promise<PipelineResult> => {
     const supabase = await createOptimizedServerClient();
     const userId = await getUserIdOrNull(supabase);
@@ -528,7 +528,7 @@ export const getCachedPipelineClientes = cache(
 );
 
 /* ========= Proyectos ========= */
-export const getCachedProyectos = cache(async (): Promise<ProyectoCached[]> => {
+export const getCachedProyectos = instrumentedCache("getCachedProyectos", async (): Promise<ProyectoCached[]> => {
   const supabase = await createOptimizedServerClient();
   const userId = await getUserIdOrNull(supabase);
   if (!userId) return [];
@@ -579,7 +579,7 @@ const PROYECTOS_SORT_FIELDS: Record<string, string> = {
 const PROYECTOS_MAX_PAGE_SIZE = 50;
 const PROYECTOS_DEFAULT_PAGE_SIZE = 12;
 
-export const getCachedProyectosPaginados = cache(async (
+export const getCachedProyectosPaginados = instrumentedCache("getCachedProyectosPaginados", async (
   params: GetProyectosParams = {}
 ): Promise<ProyectosPaginadosResult> => {
   const supabase = await createOptimizedServerClient();
@@ -658,7 +658,7 @@ export const getCachedProyectosPaginados = cache(async (
 });
 
 /* ========= Lotes por proyecto ========= */
-export const getCachedLotes = cache(async (proyectoId: string): Promise<LoteCached[]> => {
+export const getCachedLotes = instrumentedCache("getCachedLotes", async (proyectoId: string): Promise<LoteCached[]> => {
   const supabase = await createOptimizedServerClient();
   const userId = await getUserIdOrNull(supabase);
   if (!userId) return [];
@@ -676,7 +676,7 @@ export const getCachedLotes = cache(async (proyectoId: string): Promise<LoteCach
 });
 
 /* ========= Un proyecto ========= */
-export const getCachedProyecto = cache(async (proyectoId: string): Promise<ProyectoCached | null> => {
+export const getCachedProyecto = instrumentedCache("getCachedProyecto", async (proyectoId: string): Promise<ProyectoCached | null> => {
   const supabase = await createOptimizedServerClient();
   const userId = await getUserIdOrNull(supabase);
   if (!userId) return null;
@@ -694,7 +694,7 @@ export const getCachedProyecto = cache(async (proyectoId: string): Promise<Proye
 });
 
 /* ========= Notificaciones ========= */
-export const getCachedNotificacionesNoLeidas = cache(async (): Promise<NotificacionNoLeida[]> => {
+export const getCachedNotificacionesNoLeidas = instrumentedCache("getCachedNotificacionesNoLeidas", async (): Promise<NotificacionNoLeida[]> => {
   const supabase = await createOptimizedServerClient();
   const userId = await getUserIdOrNull(supabase);
   if (!userId) return [];
@@ -720,7 +720,7 @@ export const getCachedNotificacionesNoLeidas = cache(async (): Promise<Notificac
   return (data ?? []) as NotificacionNoLeida[];
 });
 
-export const getCachedNotificacionesCount = cache(async (): Promise<number> => {
+export const getCachedNotificacionesCount = instrumentedCache("getCachedNotificacionesCount", async (): Promise<number> => {
   const supabase = await createOptimizedServerClient();
   const userId = await getUserIdOrNull(supabase);
   if (!userId) return 0;
@@ -745,7 +745,7 @@ export const getCachedNotificacionesCount = cache(async (): Promise<number> => {
 // intentionally NOT part of this funnel's displayed distribution.
 const ESTADOS_FUNNEL = ['por_contactar', 'contactado', 'intermedio', 'potencial', 'desestimado', 'transferido'] as const;
 
-export const getCachedFunnelClientes = cache(async (): Promise<Record<string, number>> => {
+export const getCachedFunnelClientes = instrumentedCache("getCachedFunnelClientes", async (): Promise<Record<string, number>> => {
   const supabase = await createOptimizedServerClient();
   const userId = await getUserIdOrNull(supabase);
   if (!userId) return {};
@@ -807,7 +807,7 @@ export const getCachedFunnelClientes = cache(async (): Promise<Record<string, nu
  * this count and naturally re-enters the funnel/aging metrics — no separate
  * "un-flag" step needed.
  */
-export const getCachedImportadosSinTrabajar = cache(async (): Promise<number> => {
+export const getCachedImportadosSinTrabajar = instrumentedCache("getCachedImportadosSinTrabajar", async (): Promise<number> => {
   const supabase = await createOptimizedServerClient();
   const userId = await getUserIdOrNull(supabase);
   if (!userId) return 0;
@@ -849,7 +849,7 @@ export type SeguimientoHoy = {
   telefono: string | null;
 };
 
-export const getCachedSeguimientosHoy = cache(async (): Promise<SeguimientoHoy[]> => {
+export const getCachedSeguimientosHoy = instrumentedCache("getCachedSeguimientosHoy", async (): Promise<SeguimientoHoy[]> => {
   const supabase = await createOptimizedServerClient();
   const userId = await getUserIdOrNull(supabase);
   if (!userId) return [];
@@ -0,0 +1,130 @@
+import "server-only";
+import { cache } from "react";
+
+// Telemetría de los loaders de cache.server.ts para el harness de benchmarks.
+//
+// React `cache()` memoiza por request (no hay TTL, expulsiones ni
+// stale-while-revalidate): un "hit" es una llamada repetida con los mismos
+// argumentos dentro del mismo render, y un "miss" es una ejecución real del
+// loader. Para distinguir pasos fríos de calientes entre requests se cuenta
+// además la primera ejecución de cada combinación de argumentos en este
+// proceso (`firstRuns`).
+//
+// Solo se activa con CACHE_TELEMETRY=1; sin la variable, `instrumentedCache`
+// es exactamente `cache()`.
+
+export interface CacheFamilyStats {
+  calls: number;
+  hits: number;
+  misses: number;
+  firstRuns: number;
+  errors: number;
+  loaderMs: number;
+  maxLoaderMs: number;
+  bytes: number;
+  maxBytes: number;
+  keys: number;
+}
+
+interface FamilyState extends Omit<CacheFamilyStats, "hits" | "keys"> {
+  seenKeys: Set<string>;
+}
+
+export const cacheTelemetryEnabled = process.env.CACHE_TELEMETRY === "1";
+
+// En globalThis para sobrevivir a las recargas de módulos de `next dev`.
+const store = globalThis as typeof globalThis & { __cacheTelemetry?: Map<string, FamilyState> };
+const families = (store.__cacheTelemetry ??= new Map<string, FamilyState>());
+
+function familyState(family: string): FamilyState {
+  let state = families.get(family);
+  if (!state) {
+    state = {
+      calls: 0,
+      misses: 0,
+      firstRuns: 0,
+      errors: 0,
+      loaderMs: 0,
+      maxLoaderMs: 0,
+      bytes: 0,
+      maxBytes: 0,
+      seenKeys: new Set(),
+    };
+    families.set(family, state);
+  }
+  return state;
+}
+
+function argsKey(args: unknown[]): string {
+  try {
+    return JSON.stringify(args) ?? "";
+  } catch {
+    return String(args.length);
+  }
+}
+
+function payloadBytes(value: unknown): number {
+  try {
+    return JSON.stringify(value)?.length ?? 0;
+  } catch {
+    return 0;
+  }
+}
+
+/**
+ * `cache()` de React con contadores por familia (nombre del loader).
+ */
+export function instrumentedCache<A extends unknown[], R>(
+  family: string,
+  fn: (...args: A) => Promise<R>,
+): (...args: A) => Promise<R> {
+  if (!cacheTelemetryEnabled) return cache(fn);
+
+  const cached = cache(async (...args: A): Promise<R> => {
+    const state = familyState(family);
+    state.misses++;
+    const key = argsKey(args);
+    if (!state.seenKeys.has(key)) {
+      state.seenKeys.add(key);
+      state.firstRuns++;
+    }
+    const start = performance.now();
+    try {
+      const result = await fn(...args);
+      const bytes = payloadBytes(result);
+      state.bytes += bytes;
+      state.maxBytes = Math.max(state.maxBytes, bytes);
+      return result;
+    } catch (error) {
+      state.errors++;
+      throw error;
+    } finally {
+      const ms = performance.now() - start;
+      state.loaderMs += ms;
+      state.maxLoaderMs = Math.max(state.maxLoaderMs, ms);
+    }
+  });
+
+  return (...args: A) => {
+    familyState(family).calls++;
+    return cached(...args);
+  };
+}
+
+export function getCacheTelemetry(): Record<string, CacheFamilyStats> {
+  const snapshot: Record<string, CacheFamilyStats> = {};
+  for (const [family, { seenKeys, ...state }] of families) {
+    snapshot[family] = {
+      ...state,
+      hits: state.calls - state.misses,
+      keys: seenKeys.size,
+      loaderMs: Math.round(state.loaderMs * 10) / 10,
+      maxLoaderMs: Math.round(state.maxLoaderMs * 10) / 10,
+    };
+  }
+  return snapshot;
+}
+
+export function resetCacheTelemetry() {
+  families.clear();
+}
@@ -31,7 +31,11 @@ export class GoogleDriveClient {
     const oauth2Client = new google.auth.OAuth2();
     oauth2Client.setCredentials({ access_token: accessToken });
 
-    this.drive = google.drive({ version: 'v3', auth: oauth2Client });
+    // GOOGLE_DRIVE_API_ROOT_URL permite apuntar a un stand-in local de la API
+    // (benchmarks de testsprite_tests/bench); en producción queda vacío.
+    const rootUrl = process.env.GOOGLE_DRIVE_API_ROOT_URL || undefined;
+
+    this.drive = google.drive({ version: 'v3', auth: oauth2Client, rootUrl });
   }
 
   /**
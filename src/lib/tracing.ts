@@ -0,0 +1,360 @@
+import { AsyncLocalStorage } from "node:async_hooks";
+import { randomBytes } from "node:crypto";
+import http from "node:http";
+import https from "node:https";
+import {
+  ROOT_CONTEXT,
+  SpanKind,
+  SpanStatusCode,
+  TraceFlags,
+  context,
+  propagation,
+  trace,
+  type Attributes,
+  type AttributeValue,
+  type Context,
+  type ContextManager,
+  type Exception,
+  type Link,
+  type Span,
+  type SpanContext,
+  type SpanOptions,
+  type SpanStatus,
+  type TextMapGetter,
+  type TextMapPropagator,
+  type TextMapSetter,
+  type TimeInput,
+  type Tracer,
+  type TracerProvider,
+} from "next/dist/compiled/@opentelemetry/api";
+
+// Trazas OpenTelemetry mínimas para unir los pasos del harness de benchmarks
+// (testsprite_tests/bench, escenario `trace`) con los spans del servidor.
+//
+// Next.js ya crea spans (BaseServer.handleRequest, render, cada `fetch` a
+// Supabase...) con la copia de @opentelemetry/api que trae compilada, pero
+// sin un TracerProvider registrado son no-ops. `registerTracing` registra,
+// sin dependencias nuevas:
+// - un propagador W3C `traceparent`, para que el span raíz de cada request
+//   cuelgue del span que envió el harness;
+// - un ContextManager sobre AsyncLocalStorage, para anidar los spans;
+// - un TracerProvider que exporta por lotes en OTLP/HTTP JSON a
+//   `${OTEL_EXPORTER_OTLP_ENDPOINT}/v1/traces`.
+//
+// Solo se activa desde instrumentation.ts cuando OTEL_EXPORTER_OTLP_ENDPOINT
+// está definida.
+
+const TRACEPARENT = /^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$/;
+const INVALID_TRACE_ID = "0".repeat(32);
+const INVALID_SPAN_ID = "0".repeat(16);
+const BATCH_SIZE = 512;
+const FLUSH_MS = 1000;
+
+export function parseTraceparent(value: string | undefined | null): SpanContext | null {
+  const match = TRACEPARENT.exec((value ?? "").trim().toLowerCase());
+  if (!match || match[1] === INVALID_TRACE_ID || match[2] === INVALID_SPAN_ID) return null;
+  return { traceId: match[1], spanId: match[2], traceFlags: parseInt(match[3], 16), isRemote: true };
+}
+
+export function formatTraceparent(spanContext: SpanContext): string {
+  const flags = (spanContext.traceFlags & 0xff).toString(16).padStart(2, "0");
+  return `00-${spanContext.traceId}-${spanContext.spanId}-${flags}`;
+}
+
+// Nanosegundos desde epoch como string: con `number` se pierde precisión.
+function unixNanos(input?: TimeInput): string {
+  let ms: number;
+  if (input === undefined) {
+    ms = performance.timeOrigin + performance.now();
+  } else if (Array.isArray(input)) {
+    return `${input[0]}${String(input[1]).padStart(9, "0")}`;
+  } else if (input instanceof Date) {
+    ms = input.getTime();
+  } else {
+    // Igual que el SDK: valores menores que timeOrigin son relativos a performance.now().
+    ms = input < performance.timeOrigin ? performance.timeOrigin + input : input;
+  }
+  const whole = Math.floor(ms);
+  return `${whole}${String(Math.round((ms - whole) * 1e6)).padStart(6, "0")}`;
+}
+
+export interface ExportedSpan {
+  traceId: string;
+  spanId: string;
+  parentSpanId?: string;
+  name: string;
+  kind: number;
+  startTimeUnixNano: string;
+  endTimeUnixNano: string;
+  attributes: { key: string; value: Record<string, unknown> }[];
+  events: { name: string; timeUnixNano: string; attributes: { key: string; value: Record<string, unknown> }[] }[];
+  status: { code: number; message?: string };
+  scope: string;
+}
+
+export interface SpanSink {
+  add(span: ExportedSpan): void;
+}
+
+function anyValue(value: AttributeValue): Record<string, unknown> {
+  if (Array.isArray(value)) {
+    return { arrayValue: { values: value.filter((v) => v != null).map((v) => anyValue(v as AttributeValue)) } };
+  }
+  if (typeof value === "boolean") return { boolValue: value };
+  if (typeof value === "number") return Number.isInteger(value) ? { intValue: value } : { doubleValue: value };
+  return { stringValue: String(value) };
+}
+
+function keyValues(attributes: Attributes) {
+  return Object.entries(attributes)
+    .filter((entry): entry is [string, AttributeValue] => entry[1] !== undefined)
+    .map(([key, value]) => ({ key, value: anyValue(value) }));
+}
+
+class RecordingSpan implements Span {
+  private readonly attributes: Attributes = {};
+  private readonly events: ExportedSpan["events"] = [];
+  private status: SpanStatus = { code: SpanStatusCode.UNSET };
+  private readonly startTime: string;
+  private ended = false;
+
+  constructor(
+    private readonly sink: SpanSink,
+    private readonly scope: string,
+    private readonly context: SpanContext,
+    private name: string,
+    private readonly kind: SpanKind,
+    private readonly parentSpanId: string | undefined,
+    options: SpanOptions,
+  ) {
+    this.startTime = unixNanos(options.startTime);
+    if (options.attributes) this.setAttributes(options.attributes);
+  }
+
+  spanContext(): SpanContext {
+    return this.context;
+  }
+
+  setAttribute(key: string, value: AttributeValue): this {
+    if (!this.ended) this.attributes[key] = value;
+    return this;
+  }
+
+  setAttributes(attributes: Attributes): this {
+    for (const [key, value] of Object.entries(attributes)) {
+      if (value !== undefined) this.setAttribute(key, value);
+    }
+    return this;
+  }
+
+  addEvent(name: string, attributesOrTime?: Attributes | TimeInput, time?: TimeInput): this {
+    const isTime = attributesOrTime instanceof Date || typeof attributesOrTime === "number" || Array.isArray(attributesOrTime);
+    this.events.push({
+      name,
+      timeUnixNano: unixNanos(isTime ? (attributesOrTime as TimeInput) : time),
+      attributes: isTime || !attributesOrTime ? [] : keyValues(attributesOrTime as Attributes),
+    });
+    return this;
+  }
+
+  addLink(_link: Link): this {
+    return this;
+  }
+
+  addLinks(_links: Link[]): this {
+    return this;
+  }
+
+  setStatus(status: SpanStatus): this {
+    this.status = status;
+    return this;
+  }
+
+  updateName(name: string): this {
+    this.name = name;
+    return this;
+  }
+
+  end(endTime?: TimeInput): void {
+    if (this.ended) return;
+    this.ended = true;
+    this.sink.add({
+      traceId: this.context.traceId,
+      spanId: this.context.spanId,
+      parentSpanId: this.parentSpanId,
+      name: this.name,
+      // OTLP reserva 0 para SPAN_KIND_UNSPECIFIED.
+      kind: this.kind + 1,
+      startTimeUnixNano: this.startTime,
+      endTimeUnixNano: unixNanos(endTime),
+      attributes: keyValues(this.attributes),
+      events: this.events,
+      status: { code: this.status.code, message: this.status.message },
+      scope: this.scope,
+    });
+  }
+
+  isRecording(): boolean {
+    return !this.ended;
+  }
+
+  recordException(exception: Exception, time?: TimeInput): void {
+    const error = typeof exception === "string" ? { message: exception } : exception;
+    this.addEvent("exception", {
+      "exception.type": ("name" in error && error.name) || "Error",
+      "exception.message": error.message ?? "",
+    }, time);
+  }
+}
+
+class BenchTracer implements Tracer {
+  constructor(private readonly sink: SpanSink, private readonly scope: string) {}
+
+  startSpan(name: string, options: SpanOptions = {}, ctx: Context = context.active()): Span {
+    const parent = options.root ? undefined : trace.getSpanContext(ctx);
+    const validParent = parent && trace.isSpanContextValid(parent) ? parent : undefined;
+    const spanContext: SpanContext = {
+      traceId: validParent?.traceId ?? randomBytes(16).toString("hex"),
+      spanId: randomBytes(8).toString("hex"),
+      traceFlags: TraceFlags.SAMPLED,
+    };
+    return new RecordingSpan(this.sink, this.scope, spanContext, name, options.kind ?? SpanKind.INTERNAL,
+      validParent?.spanId, options);
+  }
+
+  startActiveSpan<F extends (span: Span) => unknown>(name: string, fn: F): ReturnType<F>;
+  startActiveSpan<F extends (span: Span) => unknown>(name: string, options: SpanOptions, fn: F): ReturnType<F>;
+  startActiveSpan<F extends (span: Span) => unknown>(
+    name: string, options: SpanOptions, ctx: Context, fn: F,
+  ): ReturnType<F>;
+  startActiveSpan<F extends (span: Span) => unknown>(
+    name: string, a: F | SpanOptions, b?: F | Context, c?: F,
+  ): ReturnType<F> {
+    const fn = (c ?? (typeof b === "function" ? b : a)) as F;
+    const options = typeof a === "function" ? {} : a;
+    const parent = b === undefined || typeof b === "function" ? context.active() : b;
+    const span = this.startSpan(name, options, parent);
+    return context.with(trace.setSpan(parent, span), fn, undefined, span) as ReturnType<F>;
+  }
+}
+
+class BenchTracerProvider implements TracerProvider {
+  constructor(private readonly sink: SpanSink) {}
+
+  getTracer(name: string): Tracer {
+    return new BenchTracer(this.sink, name);
+  }
+}
+
+class AsyncLocalStorageContextManager implements ContextManager {
+  private readonly storage = new AsyncLocalStorage<Context>();
+
+  active(): Context {
+    return this.storage.getStore() ?? ROOT_CONTEXT;
+  }
+
+  with<A extends unknown[], F extends (...args: A) => ReturnType<F>>(
+    ctx: Context, fn: F, thisArg?: ThisParameterType<F>, ...args: A
+  ): ReturnType<F> {
+    return this.storage.run(ctx, () => fn.apply(thisArg, args));
+  }
+
+  bind<T>(ctx: Context, target: T): T {
+    if (typeof target !== "function") return target;
+    const fn = target as unknown as (...args: unknown[]) => unknown;
+    const run = (thisArg: unknown, args: unknown[]) => this.with(ctx, () => fn.apply(thisArg, args));
+    return function (this: unknown, ...args: unknown[]) {
+      return run(this, args);
+    } as unknown as T;
+  }
+
+  enable(): this {
+    return this;
+  }
+
+  disable(): this {
+    this.storage.disable();
+    return this;
+  }
+}
+
+class TraceContextPropagator implements TextMapPropagator {
+  inject(ctx: Context, carrier: unknown, setter: TextMapSetter): void {
+    const spanContext = trace.getSpanContext(ctx);
+    if (spanContext && trace.isSpanContextValid(spanContext)) {
+      setter.set(carrier, "traceparent", formatTraceparent(spanContext));
+    }
+  }
+
+  extract(ctx: Context, carrier: unknown, getter: TextMapGetter): Context {
+    const raw = getter.get(carrier, "traceparent");
+    const spanContext = parseTraceparent(Array.isArray(raw) ? raw[0] : raw);
+    return spanContext ? trace.setSpanContext(ctx, spanContext) : ctx;
+  }
+
+  fields(): string[] {
+    return ["traceparent"];
+  }
+}
+
+// Exportador por lotes con node:http: el `fetch` global está parcheado por
+// Next y cada exportación generaría a su vez un span.
+class OtlpJsonExporter implements SpanSink {
+  private buffer: ExportedSpan[] = [];
+  private readonly timer: ReturnType<typeof setInterval>;
+
+  constructor(private readonly url: string, private readonly serviceName: string) {
+    this.timer = setInterval(() => this.flush(), FLUSH_MS);
+    this.timer.unref?.();
+  }
+
+  add(span: ExportedSpan): void {
+    this.buffer.push(span);
+    if (this.buffer.length >= BATCH_SIZE) this.flush();
+  }
+
+  flush(): void {
+    if (!this.buffer.length) return;
+    const spans = this.buffer;
+    this.buffer = [];
+    const body = JSON.stringify(toOtlpRequest(spans, this.serviceName));
+    const target = new URL(this.url);
+    const request = (target.protocol === "https:" ? https : http).request(target, {
+      method: "POST",
+      headers: { "Content-Type": "application/json", "Content-Length": Buffer.byteLength(body) },
+    });
+    request.on("error", () => {
+      // Sin colector no hay nada que hacer: las trazas son opcionales.
+    });
+    request.end(body);
+  }
+}
+
+export function toOtlpRequest(spans: ExportedSpan[], serviceName: string) {
+  const scopes = new Map<string, Omit<ExportedSpan, "scope">[]>();
+  for (const { scope, ...span } of spans) {
+    const list = scopes.get(scope) ?? [];
+    list.push(span);
+    scopes.set(scope, list);
+  }
+  return {
+    resourceSpans: [{
+      resource: { attributes: keyValues({ "service.name": serviceName }) },
+      scopeSpans: [...scopes].map(([name, scopeSpans]) => ({ scope: { name }, spans: scopeSpans })),
+    }],
+  };
+}
+
+/** Registra propagador, contexto y provider globales. Sin endpoint no hace nada. */
+export function registerTracing(
+  endpoint = process.env.OTEL_EXPORTER_OTLP_ENDPOINT,
+  sink?: SpanSink,
+): boolean {
+  if (!endpoint && !sink) return false;
+  const serviceName = process.env.OTEL_SERVICE_NAME || "amersurcrm";
+  const target = sink ?? new OtlpJsonExporter(`${endpoint!.replace(/\/$/, "")}/v1/traces`, serviceName);
+  context.setGlobalContextManager(new AsyncLocalStorageContextManager().enable());
+  propagation.setGlobalPropagator(new TraceContextPropagator());
+  trace.setGlobalTracerProvider(new BenchTracerProvider(target));
+  return true;
+}
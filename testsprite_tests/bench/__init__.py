@@ -0,0 +1,11 @@
+"""Scale and performance scenarios built on top of the TestSprite TC flows.
+
+The ``TC0xx_*.py`` scripts next to this package check one functional path
+each. The scenarios here reuse the same login flow and browser settings but
+seed realistic volumes, drive the app concurrently and write latency
+distributions to ``tmp/bench/``.
+
+Run a scenario from the ``testsprite_tests`` directory::
+
+    python -m bench agenda --eventos 20000
+"""
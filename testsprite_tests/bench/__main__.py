@@ -0,0 +1,82 @@
+"""Command line entry point: ``python -m bench <scenario> [options]``."""
+
+import argparse
+import asyncio
+import importlib
+import json
+import sys
+
+from . import config
+from .harness import HARNESS
+from .responses import RESPONSES
+from .results import write_results
+from .vitals import COLLECTOR
+
+SCENARIOS = {
+    "agenda": "Agenda range queries, calendar render and recordatorio dispatch (TC017)",
+    "drive": "Google Drive sync/list/search/download against a local Drive stand-in (TC018)",
+    "permissions": "Propagation latency of a role permission edit to live vendedor sessions (TC014/TC019)",
+    "rbac": "Every role x every dashboard route, allowed/denied access and sidebar visibility (TC014)",
+    "login": "Concurrent login storm: p99 latency, rate limiter and audit writes per attempt (TC001-TC003)",
+    "campaign": "Campaign fan-out (wa.me + Resend stand-in): msgs/sec, latency, retries and memory (TC011)",
+    "cron": "cobranza-alertas / reportes-alertas over 10k-1M cuotas: duration, round-trips, server RSS",
+    "ubigeo": "Cascading ubigeo selector and /api/ubigeo vs /api/ubigeo-v2 per level (TC007)",
+    "cache": "TC020 dashboard/search steps labelled cold or warm from cache.server.ts telemetry",
+    "mobile": "Unmodified TC scripts under phone viewport, CPU and 3G/4G throttling profiles",
+    "coverage": "Per-route JS/CSS executed vs shipped bytes across the TC flows, with byte budgets",
+    "sw": "Service worker cold/warm/offline loads vs HTTP cache only: timing and bytes by source",
+    "soak": "Hours of TC journeys at a steady arrival rate with rolling p95 drift alerts",
+    "shard": "Split the TC plan across nodes by recorded duration (plan / run / merge)",
+    "retry": "TC015 with a flaky export step: retry cost restarting vs resuming from step checkpoints",
+    "flows": "Compile the TC plan onto the action library (cached by content hash) and run the flows in parallel",
+    "visual": "Dashboard/report chart screenshots vs content-addressed baselines (sha256, dHash, then pixel diff)",
+    "pagination": "Client list and fetchAllRows report pages 1-1000 over 10k-1M clientes: offset vs keyset",
+    "realtime": "Notificaciones realtime channel at 50-500 subscribers: delivery latency, memory, reconnect storm (TC016)",
+    "trace": "TC020 as one distributed trace: step spans, traceparent on every request, app and database spans",
+    "seed": "Reproducible Peruvian CRM dataset (clientes, ventas, cuotas, eventos) bulk-loaded into Postgres with COPY",
+    "leak": "Hours-long sidebar loop sampling heap, DOM nodes and listeners per route via CDP",
+}
+
+
+async def _run(args: argparse.Namespace) -> dict:
+    if config.HARNESS_ENABLED:
+        HARNESS.start(config.HARNESS_SAMPLER_HZ)
+    try:
+        return await args.module.run(args)
+    finally:
+        HARNESS.stop()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m bench", description=__doc__)
+    subparsers = parser.add_subparsers(dest="scenario", required=True)
+    for name, help_text in SCENARIOS.items():
+        module = importlib.import_module(f".scenarios.{name}", __package__)
+        sub = subparsers.add_parser(name, help=help_text, description=module.__doc__,
+                                    formatter_class=argparse.RawDescriptionHelpFormatter)
+        module.add_arguments(sub)
+        sub.set_defaults(module=module)
+
+    args = parser.parse_args(argv)
+    if config.HARNESS_ENABLED:
+        HARNESS.install()
+    result = asyncio.run(_run(args))
+    if config.HARNESS_ENABLED:
+        result["harness"] = HARNESS.summary()
+        stacks = HARNESS.write_stacks(args.scenario)
+        if stacks:
+            result["harness"]["stacks"] = str(stacks)
+    if RESPONSES.endpoints:
+        result["responses"] = RESPONSES.summary()
+    if COLLECTOR.visits:
+        result["web_vitals"] = COLLECTOR.summary()
+        if config.VITALS_ENFORCE and result["web_vitals"]["budget_failures"]:
+            result["failed"] = True
+    path = write_results(args.scenario, result)
+    json.dump(result, sys.stdout, indent=2, ensure_ascii=False)
+    print(f"\nResults written to {path}")
+    return 1 if result.get("failed") else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
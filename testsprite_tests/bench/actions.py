@@ -0,0 +1,261 @@
+"""Parameterized browser actions and the rules that map plan steps onto them.
+
+``testsprite_frontend_test_plan.json`` describes each case in plain English
+("Navigate to the login page", "Enter valid email and incorrect password").
+Every entry of :data:`RULES` is a case-insensitive pattern over a step
+description and the action calls it stands for; named groups become
+parameters (``within (?P<seconds>\\d+) seconds``). ``bench.compiler`` turns
+the plan into lists of these calls and :func:`build` makes them runnable.
+
+Actions share per-page scratch state (the duration of the last timed action,
+the status of the last direct API request) so assertion steps such as
+"...within 3 seconds" or "API returns appropriate error" can check what the
+step before them did.
+
+Each action also declares whether a flow may checkpoint right after it
+(``bench.flows``): not when it leaves state a storage snapshot cannot hold
+(the chosen login tab, a half-filled form) or scratch state the next step
+reads. :func:`checkpointable` applies that to a step's calls.
+"""
+
+import re
+import time
+import weakref
+from typing import Awaitable, Callable, Dict, List, Tuple, Union
+
+from playwright.async_api import Page, expect
+
+from . import browser, config
+
+PageAction = Callable[[Page], Awaitable[None]]
+ACTIONS: Dict[str, Callable[..., PageAction]] = {}
+# Action name -> whether a checkpoint after it resumes correctly (a bool, or a test on its parameters).
+CHECKPOINT: Dict[str, Union[bool, Callable[[dict], bool]]] = {}
+_SCRATCH: "weakref.WeakKeyDictionary[Page, dict]" = weakref.WeakKeyDictionary()
+
+SIDEBAR = '[data-sidebar="sidebar"] a[href="{href}"]'
+LOGIN_ERRORS = ("Contraseña incorrecta", "Credenciales inválidas", "Usuario no encontrado")
+ADMIN_ONLY = ("/dashboard/admin/usuarios", "/dashboard/admin/configuracion")
+
+
+def action(name: str, checkpoint: Union[bool, Callable[[dict], bool]] = True):
+    def register(factory: Callable[..., PageAction]) -> Callable[..., PageAction]:
+        ACTIONS[name] = factory
+        CHECKPOINT[name] = checkpoint
+        return factory
+    return register
+
+
+def _scratch(page: Page) -> dict:
+    return _SCRATCH.setdefault(page, {})
+
+
+def _credentials(role: str, password: str) -> Tuple[str, str]:
+    if password == "deactivated":
+        identifier = config.DEACTIVATED_USERNAME if role == "admin" else config.DEACTIVATED_DNI
+        if not identifier:
+            raise AssertionError("deactivated login needs BENCH_DEACTIVATED_USER / BENCH_DEACTIVATED_DNI")
+        return identifier, "bench-password"
+    identifier, valid = ((config.ADMIN_USERNAME, config.ADMIN_PASSWORD) if role == "admin"
+                         else (config.VENDEDOR_DNI, config.VENDEDOR_PASSWORD))
+    return identifier, valid if password == "valid" else "bench-wrong-password"
+
+
+@action("goto", checkpoint=lambda params: not params.get("timed"))
+def goto(path: str, timed: bool = False) -> PageAction:
+    async def run(page: Page) -> None:
+        start = time.perf_counter()
+        await page.goto(path, wait_until="load", timeout=60000)
+        if timed:
+            _scratch(page)["last_ms"] = (time.perf_counter() - start) * 1000
+        await browser.dismiss_novedades(page)
+    return run
+
+
+@action("login")
+def login(role: str = "admin") -> PageAction:
+    async def run(page: Page) -> None:
+        await browser.login(page, role)
+    return run
+
+
+@action("open_login", checkpoint=False)
+def open_login(role: str = "admin") -> PageAction:
+    async def run(page: Page) -> None:
+        await page.goto("/auth/login", wait_until="domcontentloaded", timeout=30000)
+        await page.get_by_role("button", name="Administrador" if role == "admin" else "Vendedor").first.click()
+        _scratch(page)["role"] = role
+    return run
+
+
+@action("fill_credentials", checkpoint=False)
+def fill_credentials(password: str = "valid") -> PageAction:
+    async def run(page: Page) -> None:
+        role = _scratch(page).get("role", "admin")
+        identifier, secret = _credentials(role, password)
+        await page.get_by_placeholder("Ingresa tu usuario" if role == "admin" else "Ingresa tu DNI").fill(identifier)
+        await page.get_by_placeholder("Ingresa tu contraseña").fill(secret)
+    return run
+
+
+@action("submit_login")
+def submit_login() -> PageAction:
+    async def run(page: Page) -> None:
+        await page.locator("form button[type=submit]").first.click()
+    return run
+
+
+@action("expect_url")
+def expect_url(pattern: str) -> PageAction:
+    async def run(page: Page) -> None:
+        await page.wait_for_url(pattern, timeout=30000)
+        await browser.dismiss_novedades(page)
+    return run
+
+
+@action("expect_text")
+def expect_text(texts: List[str], timeout_ms: int = 15000) -> PageAction:
+    pattern = re.compile("|".join(re.escape(t) for t in texts))
+
+    async def run(page: Page) -> None:
+        await expect(page.get_by_text(pattern).first).to_be_visible(timeout=timeout_ms)
+    return run
+
+
+@action("expect_sidebar")
+def expect_sidebar(hrefs: List[str], visible: bool = True) -> PageAction:
+    async def run(page: Page) -> None:
+        await page.wait_for_selector('[data-sidebar="sidebar"] a[href]', timeout=30000)
+        for href in hrefs:
+            shown = await page.locator(SIDEBAR.format(href=href)).count() > 0
+            if shown != visible:
+                raise AssertionError(f"sidebar item {href} {'missing' if visible else 'shown'}")
+    return run
+
+
+@action("sidebar_nav", checkpoint=False)
+def sidebar_nav(href: str) -> PageAction:
+    async def run(page: Page) -> None:
+        start = time.perf_counter()
+        await page.locator(SIDEBAR.format(href=href)).first.click()
+        await page.wait_for_url(f"**{href}", timeout=30000)
+        await page.wait_for_load_state("networkidle", timeout=30000)
+        _scratch(page)["last_ms"] = (time.perf_counter() - start) * 1000
+    return run
+
+
+@action("click_button")
+def click_button(name: str) -> PageAction:
+    async def run(page: Page) -> None:
+        await page.get_by_role("button", name=name).first.click()
+    return run
+
+
+@action("open_first_cliente")
+def open_first_cliente(tab: str = "") -> PageAction:
+    async def run(page: Page) -> None:
+        await page.get_by_role("button", name="Ver Detalles").first.click()
+        await page.locator('[title="Ver perfil completo"]').first.click()
+        await page.wait_for_url(re.compile(r"/dashboard/clientes/[^/?]+"), timeout=30000)
+        if tab:
+            await page.get_by_role("button", name=tab).first.click()
+    return run
+
+
+@action("api_get", checkpoint=False)
+def api_get(path: str) -> PageAction:
+    async def run(page: Page) -> None:
+        response = await page.request.get(path)
+        _scratch(page)["last_status"] = response.status
+    return run
+
+
+@action("expect_status")
+def expect_status(statuses: List[int]) -> PageAction:
+    async def run(page: Page) -> None:
+        status = _scratch(page).get("last_status")
+        if status not in statuses:
+            raise AssertionError(f"expected status in {statuses}, got {status}")
+    return run
+
+
+@action("expect_within")
+def expect_within(ms: float) -> PageAction:
+    async def run(page: Page) -> None:
+        last = _scratch(page).get("last_ms")
+        if last is None:
+            raise AssertionError("no timed action before this assertion")
+        if last > ms:
+            raise AssertionError(f"took {last:.0f} ms, limit {ms:.0f} ms")
+    return run
+
+
+Call = Tuple[str, dict]
+Rule = Tuple[str, Callable[[re.Match], List[Call]]]
+
+
+def _calls(*calls: Call) -> Callable[[re.Match], List[Call]]:
+    return lambda match: list(calls)
+
+
+RULES: List[Rule] = [
+    (r"^navigate to the login page$", _calls(("open_login", {"role": "admin"}))),
+    (r"^enter valid (email|username|credentials) and password$", _calls(("fill_credentials", {"password": "valid"}))),
+    (r"^enter valid \w+ and incorrect password$", _calls(("fill_credentials", {"password": "wrong"}))),
+    (r"^submit the login form$", _calls(("submit_login", {}))),
+    (r"authenticated and redirected to dashboard", _calls(("expect_url", {"pattern": "**/dashboard**"}))),
+    (r"displays options according to user role", _calls(("expect_sidebar", {"hrefs": list(ADMIN_ONLY)}))),
+    (r"rejected with an error message", _calls(("expect_text", {"texts": list(LOGIN_ERRORS)}))),
+    (r"^attempt login with credentials for a deactivated user$", _calls(
+        ("open_login", {"role": "admin"}), ("fill_credentials", {"password": "deactivated"}), ("submit_login", {}))),
+    (r"message indicating account deactivation", _calls(("expect_text", {"texts": ["Usuario inactivo"]}))),
+    (r"^apply various search filters", _calls(
+        ("goto", {"path": "/dashboard/clientes?q=Cliente&estado=por_contactar&sortBy=nombre&sortOrder=asc",
+                  "timed": True}))),
+    (r"^select a client to view interaction timeline$", _calls(("open_first_cliente", {"tab": "Historial"}))),
+    (r"^log in as administrator$", _calls(("login", {"role": "admin"}))),
+    (r"^log in as this user$", _calls(("login", {"role": "vendedor"}))),
+    (r"hides unauthorized options", _calls(("expect_sidebar", {"hrefs": list(ADMIN_ONLY), "visible": False}))),
+    (r"access restricted data endpoints directly", _calls(("api_get", {"path": "/api/admin/roles"}))),
+    (r"access is denied .*returns appropriate error", _calls(("expect_status", {"statuses": [401, 403]}))),
+    (r"^navigate to dashboard and report sections$", _calls(
+        ("goto", {"path": "/dashboard"}), ("sidebar_nav", {"href": "/dashboard/admin/reportes"}))),
+    (r"^export reports to pdf", _calls(
+        ("click_button", {"name": "Exportar"}),
+        ("expect_text", {"texts": ["Reporte PDF generado exitosamente"], "timeout_ms": 60000}))),
+    (r"^perform simple and complex client searches", _calls(
+        ("goto", {"path": "/dashboard/clientes?q=Cliente", "timed": True}),
+        ("goto", {"path": "/dashboard/clientes?q=Cliente&estado=por_contactar&sortBy=nombre&sortOrder=asc&page=2",
+                  "timed": True}))),
+    (r"^search results return within expected time limits$", _calls(("expect_within", {"ms": 3000}))),
+    (r"^load dashboards and map visualizations$", _calls(("goto", {"path": "/dashboard", "timed": True}))),
+    (r"within (?P<seconds>\d+) seconds", lambda m: [("expect_within", {"ms": int(m["seconds"]) * 1000})]),
+]
+
+
+def match(description: str) -> List[Call]:
+    """Action calls for a step description; empty when no rule applies."""
+    for pattern, calls in RULES:
+        found = re.search(pattern, description.strip(), re.IGNORECASE)
+        if found:
+            return calls(found)
+    return []
+
+
+def checkpointable(calls: List[Call]) -> bool:
+    """Whether a flow can resume after a step made of ``calls``."""
+    for name, params in calls:
+        allowed = CHECKPOINT[name]
+        if not (allowed(params) if callable(allowed) else allowed):
+            return False
+    return True
+
+
+def build(calls: List[Call]) -> PageAction:
+    """One page action running ``calls`` in order."""
+    actions = [ACTIONS[name](**params) for name, params in calls]
+
+    async def run(page: Page) -> None:
+        for step in actions:
+            await step(page)
+    return run
@@ -0,0 +1,139 @@
+"""Browser helpers shared by the scenarios.
+
+The login flow is the one the TC scripts click through (role tab, username
+or DNI, password, "Iniciar Sesión", dismiss the "Novedades del CRM" modal),
+but written against labels and placeholders instead of absolute XPaths.
+Authenticated storage state is cached per role so scenarios that need many
+logged-in contexts only pay for the login once.
+"""
+
+import base64
+import json
+import re
+from typing import Optional
+from urllib.parse import unquote, urlsplit
+
+from playwright import async_api
+from playwright.async_api import Browser, BrowserContext, Page, Playwright
+
+from . import config, profiles
+from .responses import RESPONSES
+from .vitals import COLLECTOR
+
+ROLES = ("admin", "vendedor")
+AUTH_DIR = config.RESULTS_DIR / "auth"
+
+
+async def launch(pw: Playwright, headless: bool = True) -> Browser:
+    """Launch Chromium with the same flags as the TC scripts."""
+    return await pw.chromium.launch(headless=headless, args=config.BROWSER_ARGS)
+
+
+async def new_context(browser: Browser, storage_state: Optional[str] = None,
+                      profile: Optional[str] = None, **options) -> BrowserContext:
+    """Context against the app under ``profile`` (default ``BENCH_PROFILE``).
+
+    Extra ``options`` go to Playwright's ``new_context``. Web Vitals are
+    recorded for every page it opens, and ``bench.responses`` samples every
+    document and API response.
+    """
+    emulation = profiles.get(profile or config.PROFILE)
+    context = await browser.new_context(base_url=config.BASE_URL, storage_state=storage_state,
+                                        **emulation.context_options(), **options)
+    context.set_default_timeout(config.DEFAULT_TIMEOUT_MS)
+    profiles.apply(context, emulation)
+    if config.VITALS_ENABLED:
+        await COLLECTOR.attach(context)
+    if config.RESPONSES_ENABLED:
+        RESPONSES.attach(context)
+    return context
+
+
+async def dismiss_novedades(page: Page) -> None:
+    """Close the "Novedades del CRM" modal if it shows up after login."""
+    try:
+        await page.get_by_role("button", name="Entendido").first.click(timeout=3000)
+    except async_api.Error:
+        pass
+
+
+async def login(page: Page, role: str = "admin", identifier: Optional[str] = None,
+                password: Optional[str] = None) -> None:
+    """Log in through ``/auth/login`` and wait for the dashboard."""
+    if role not in ROLES:
+        raise ValueError(f"Unknown role {role!r}, expected one of {ROLES}")
+    if role == "admin":
+        identifier = identifier or config.ADMIN_USERNAME
+        password = password or config.ADMIN_PASSWORD
+    else:
+        identifier = identifier or config.VENDEDOR_DNI
+        password = password or config.VENDEDOR_PASSWORD
+
+    await page.goto("/auth/login", wait_until="domcontentloaded", timeout=30000)
+    tab = "Administrador" if role == "admin" else "Vendedor"
+    await page.get_by_role("button", name=tab).first.click()
+    placeholder = "Ingresa tu usuario" if role == "admin" else "Ingresa tu DNI"
+    await page.get_by_placeholder(placeholder).fill(identifier)
+    await page.get_by_placeholder("Ingresa tu contraseña").fill(password)
+    await page.locator("form button[type=submit]").first.click()
+    await page.wait_for_url("**/dashboard**", timeout=30000)
+    await dismiss_novedades(page)
+
+
+async def storage_state(browser: Browser, role: str = "admin", refresh: bool = False,
+                        identifier: Optional[str] = None, password: Optional[str] = None,
+                        name: Optional[str] = None) -> str:
+    """Return the path of a cached authenticated storage state.
+
+    ``role`` picks the login tab; ``name`` keys the cache when logging in
+    with other credentials than the configured admin/vendedor.
+    """
+    path = AUTH_DIR / f"{name or role}.json"
+    if path.exists() and not refresh:
+        return str(path)
+    AUTH_DIR.mkdir(parents=True, exist_ok=True)
+    context = await new_context(browser, profile="desktop")
+    try:
+        page = await context.new_page()
+        await login(page, role, identifier, password)
+        await context.storage_state(path=str(path))
+    finally:
+        await context.close()
+    return str(path)
+
+
+async def api_context(pw: Playwright, state: Optional[str] = None, **kwargs) -> async_api.APIRequestContext:
+    """HTTP client against the app, optionally carrying a logged-in session."""
+    return await pw.request.new_context(base_url=config.BASE_URL, storage_state=state, **kwargs)
+
+
+def cookie_header(state_path: str) -> str:
+    """``Cookie`` header for raw HTTP clients built from a cached storage state."""
+    host = urlsplit(config.BASE_URL).hostname or ""
+    with open(state_path, encoding="utf-8") as handle:
+        cookies = json.load(handle).get("cookies", [])
+    return "; ".join(
+        f"{c['name']}={c['value']}" for c in cookies
+        if host.endswith(c.get("domain", "").lstrip("."))
+    )
+
+
+def supabase_session(state_path: str) -> dict:
+    """Supabase session (``access_token``, ``user``) stored by ``@supabase/ssr`` in a storage state.
+
+    The ``sb-<ref>-auth-token`` cookie may be split into ``.0``, ``.1``...
+    chunks and is either plain JSON or ``base64-`` prefixed.
+    """
+    with open(state_path, encoding="utf-8") as handle:
+        cookies = json.load(handle).get("cookies", [])
+    chunks = sorted(
+        (int(match.group(1) or 0), c["value"]) for c in cookies
+        for match in [re.fullmatch(r"sb-.+-auth-token(?:\.(\d+))?", c["name"])] if match
+    )
+    if not chunks:
+        raise RuntimeError(f"no Supabase auth cookie in {state_path}")
+    value = unquote("".join(v for _, v in chunks))
+    if value.startswith("base64-"):
+        encoded = value[len("base64-"):]
+        value = base64.urlsafe_b64decode(encoded + "=" * (-len(encoded) % 4)).decode("utf-8")
+    return json.loads(value)
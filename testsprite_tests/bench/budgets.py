@@ -0,0 +1,33 @@
+"""Per-route budgets read from a JSON file.
+
+The file maps ``"default"`` and route patterns (as produced by
+``vitals.normalize_route``) to ``{metric: limit}``; anything missing falls
+back to the caller's defaults::
+
+    {"default": {"lcp": 3000}, "/dashboard/clientes": {"inp": 300}}
+"""
+
+import json
+from pathlib import Path
+from typing import Dict, List
+
+
+def load(path: Path, defaults: Dict[str, float]) -> Dict[str, Dict[str, float]]:
+    budgets: Dict[str, Dict[str, float]] = {"default": dict(defaults)}
+    if path.exists():
+        for route, values in json.loads(path.read_text(encoding="utf-8")).items():
+            budgets.setdefault(route, {}).update(values)
+    return budgets
+
+
+def for_route(budgets: Dict[str, Dict[str, float]], route: str) -> Dict[str, float]:
+    return {**budgets["default"], **budgets.get(route, {})}
+
+
+def exceeded(route: str, values: Dict[str, float], budget: Dict[str, float]) -> List[dict]:
+    """One entry per metric of ``values`` above its limit in ``budget``."""
+    return [
+        {"route": route, "metric": metric, "value": value, "budget": budget[metric]}
+        for metric, value in values.items()
+        if metric in budget and value > budget[metric]
+    ]
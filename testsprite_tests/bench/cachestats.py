@@ -0,0 +1,61 @@
+"""Cold/warm labels for latency samples from ``cache.server.ts`` telemetry.
+
+The app exposes per-loader counters at ``/api/diagnostico?cache=1`` when it
+runs with ``CACHE_TELEMETRY=1`` (see ``src/lib/cache.telemetry.ts``). A step
+is labelled:
+
+* ``cold``: some loader ran for an argument set this server process had never
+  executed before (first query, compile and connection warm-up),
+* ``warm``: every loader that ran had already run with the same arguments,
+* ``unknown``: telemetry disabled or the server restarted mid-step.
+
+``hits`` are React ``cache()`` dedups inside a single request, not
+cross-request reuse.
+"""
+
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Optional
+
+from playwright.async_api import APIRequestContext
+
+COUNTERS = ("calls", "hits", "misses", "firstRuns", "errors", "loaderMs", "bytes")
+
+
+class CacheProbe:
+    def __init__(self, request: APIRequestContext):
+        self.request = request
+        self.enabled: Optional[bool] = None
+
+    async def snapshot(self, reset: bool = False) -> dict:
+        response = await self.request.get("/api/diagnostico", params={"cache": "reset" if reset else "1"})
+        payload = await response.json() if response.ok else {}
+        self.enabled = bool(payload.get("enabled"))
+        return payload
+
+    @staticmethod
+    def delta(before: dict, after: dict) -> Dict[str, dict]:
+        if before.get("pid") != after.get("pid"):
+            return {}
+        old = before.get("families", {})
+        changes = {}
+        for family, stats in after.get("families", {}).items():
+            diff = {k: round(stats.get(k, 0) - old.get(family, {}).get(k, 0), 1) for k in COUNTERS}
+            if diff["calls"]:
+                changes[family] = diff
+        return changes
+
+    @staticmethod
+    def label(before: dict, after: dict, changes: Dict[str, dict]) -> str:
+        if not after.get("enabled") or before.get("pid") != after.get("pid"):
+            return "unknown"
+        return "cold" if any(c["firstRuns"] for c in changes.values()) else "warm"
+
+    @asynccontextmanager
+    async def step(self) -> AsyncIterator[dict]:
+        """``async with probe.step() as cache: ...`` fills ``cache["label"]`` and ``cache["families"]``."""
+        record: dict = {}
+        before = await self.snapshot()
+        yield record
+        after = await self.snapshot()
+        record["families"] = self.delta(before, after)
+        record["label"] = self.label(before, after, record["families"])
@@ -0,0 +1,72 @@
+"""Compile ``testsprite_frontend_test_plan.json`` into cached, runnable flows.
+
+Each case's step list is mapped onto ``bench.actions`` and written to
+``tmp/bench/flows/<case>-<hash>.json``, where the hash covers the case's
+steps and the action library source. Unchanged cases are loaded from that
+cache; editing a case (or the library) recompiles only what changed. Steps
+no rule understands are kept as ``unmapped``: that is the drift between the
+plan and what the harness can execute, and such cases only run with
+``partial=True`` (the unmapped steps are then skipped). A step is only
+checkpointed when all of its actions allow it (``actions.checkpointable``),
+so a retry never resumes on a half-done login or before an assertion whose
+timing or status lives in the page.
+"""
+
+import hashlib
+import json
+from pathlib import Path
+from typing import List, Optional
+
+from . import actions, config, shards
+from .flows import Flow, Step
+
+FLOWS_DIR = config.RESULTS_DIR / "flows"
+LIBRARY_SOURCE = Path(actions.__file__)
+# Actions that leave the page logged in; flows without one start from the admin storage state.
+LOGIN_ACTIONS = {"login", "open_login"}
+
+
+def case_hash(case: dict) -> str:
+    digest = hashlib.sha256()
+    digest.update(json.dumps([(s["type"], s["description"]) for s in case["steps"]]).encode("utf-8"))
+    digest.update(LIBRARY_SOURCE.read_bytes())
+    return digest.hexdigest()[:16]
+
+
+def compile_case(case: dict) -> dict:
+    steps = [{"type": s["type"], "description": s["description"], "calls": actions.match(s["description"])}
+             for s in case["steps"]]
+    uses_login = any(name in LOGIN_ACTIONS for s in steps for name, _ in s["calls"])
+    return {
+        "id": case["id"],
+        "title": case["title"],
+        "role": None if uses_login else "admin",
+        "steps": steps,
+        "unmapped": [s["description"] for s in steps if not s["calls"]],
+    }
+
+
+def compile_plan(cases: Optional[List[dict]] = None, force: bool = False) -> List[dict]:
+    """Compiled flows for every case, each with ``hash`` and ``cached`` set."""
+    FLOWS_DIR.mkdir(parents=True, exist_ok=True)
+    compiled = []
+    for case in cases if cases is not None else shards.load_cases():
+        key = case_hash(case)
+        path = FLOWS_DIR / f"{case['id']}-{key}.json"
+        if path.exists() and not force:
+            flow, cached = json.loads(path.read_text(encoding="utf-8")), True
+        else:
+            flow, cached = compile_case(case), False
+            for stale in FLOWS_DIR.glob(f"{case['id']}-*.json"):
+                stale.unlink()
+            path.write_text(json.dumps(flow, indent=2, ensure_ascii=False), encoding="utf-8")
+        compiled.append({**flow, "hash": key, "cached": cached})
+    return compiled
+
+
+def to_flow(compiled: dict) -> Flow:
+    steps = [
+        Step(f"{n + 1:02d} {s['description'][:60]}", actions.build(s["calls"]), actions.checkpointable(s["calls"]))
+        for n, s in enumerate(compiled["steps"]) if s["calls"]
+    ]
+    return Flow(compiled["id"], steps, compiled["role"])
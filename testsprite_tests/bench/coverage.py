@@ -0,0 +1,218 @@
+"""Chromium JS/CSS coverage per route visit.
+
+Attached to a context, the collector starts V8 block coverage
+(``Profiler.startPreciseCoverage``) and CSS rule usage tracking on every new
+page and cuts a window at each main-frame navigation, hard or client-side.
+A window records, for the route it was on:
+
+* every script and stylesheet present (by URL; inline ones as ``(inline)``)
+  with its size and used bytes: for scripts, the code that executed while
+  the route was shown (V8 counters are reset at each cut); for stylesheets,
+  the rules that have matched since the page opened. ``CSS.takeCoverageDelta``
+  only reports rules on first use, so used ranges are kept per sheet for the
+  page's lifetime; after client-side navigations a route's CSS figures
+  include rules earlier routes of that page used,
+* the encoded bytes of scripts and stylesheets transferred during the window.
+
+:func:`summary` turns the windows into per-route and per-chunk figures and
+checks them against ``BENCH_COVERAGE_BUDGETS`` (p50 over the route's
+visits).
+"""
+
+import asyncio
+from collections import defaultdict
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit
+
+from playwright import async_api
+from playwright.async_api import BrowserContext, Frame, Page
+
+from . import budgets as budget_files
+from . import config
+from .stats import percentile
+from .vitals import normalize_route
+
+DEFAULT_BUDGETS = {
+    "js_kb": 1500,
+    "js_unused_ratio": 0.7,
+    "css_kb": 300,
+    "css_unused_ratio": 0.9,
+    "transferred_kb": 1000,
+}
+TRANSFER_TYPES = {"Script": "js", "Stylesheet": "css"}
+
+
+def _chunk(url: str) -> str:
+    if not url:
+        return "(inline)"
+    parts = urlsplit(url)
+    return parts.path if parts.scheme in ("http", "https") else url
+
+
+def _used_js_bytes(functions: List[dict], length: int) -> int:
+    """Bytes inside blocks with a non-zero count; nested blocks override outer ones."""
+    ranges = sorted((r for f in functions for r in f["ranges"]),
+                    key=lambda r: (r["startOffset"], -r["endOffset"]))
+    length = max([length] + [r["endOffset"] for r in ranges])
+    used = bytearray(length)
+    for r in ranges:
+        start, end = r["startOffset"], r["endOffset"]
+        used[start:end] = (b"\x01" if r["count"] else b"\x00") * (end - start)
+    return sum(used)
+
+
+class _PageCoverage:
+    def __init__(self, page: Page):
+        self.page = page
+        self.cdp = None
+        self.route = ""
+        self.scripts: Dict[str, tuple] = {}
+        self.sheets: Dict[str, tuple] = {}
+        # styleSheetId -> (start, end) of every rule used since the page opened.
+        self.used_css: Dict[str, set] = defaultdict(set)
+        self.requests: Dict[str, str] = {}
+        self.transferred: Dict[str, int] = defaultdict(int)
+        self.lock = asyncio.Lock()
+
+    async def start(self, context: BrowserContext) -> None:
+        self.cdp = cdp = await context.new_cdp_session(self.page)
+        cdp.on("Debugger.scriptParsed", lambda e: self.scripts.__setitem__(
+            e["scriptId"], (e.get("url", ""), e.get("length", 0))))
+        cdp.on("CSS.styleSheetAdded", lambda e: self.sheets.__setitem__(
+            e["header"]["styleSheetId"], (e["header"].get("sourceURL", ""), int(e["header"].get("length", 0)))))
+        cdp.on("CSS.styleSheetRemoved", self._on_sheet_removed)
+        cdp.on("Network.responseReceived", self._on_response)
+        cdp.on("Network.loadingFinished", self._on_finished)
+        for method in ("Network.enable", "Debugger.enable", "Profiler.enable", "DOM.enable", "CSS.enable"):
+            await cdp.send(method)
+        await cdp.send("Profiler.startPreciseCoverage", {"callCount": False, "detailed": True})
+        await cdp.send("CSS.startRuleUsageTracking")
+
+    def _on_sheet_removed(self, event: dict) -> None:
+        self.sheets.pop(event["styleSheetId"], None)
+        self.used_css.pop(event["styleSheetId"], None)
+
+    def _on_response(self, event: dict) -> None:
+        kind = TRANSFER_TYPES.get(event.get("type", ""))
+        if kind:
+            self.requests[event["requestId"]] = kind
+
+    def _on_finished(self, event: dict) -> None:
+        kind = self.requests.pop(event["requestId"], None)
+        if kind:
+            self.transferred[kind] += int(event.get("encodedDataLength", 0))
+
+    async def cut(self) -> Optional[dict]:
+        """Close the current window and start one for the page's current URL."""
+        async with self.lock:
+            try:
+                js = (await self.cdp.send("Profiler.takePreciseCoverage"))["result"]
+                css = (await self.cdp.send("CSS.takeCoverageDelta"))["coverage"]
+            except async_api.Error:
+                return None
+            route, transferred = self.route, dict(self.transferred)
+            self.route = self.page.url
+            self.transferred.clear()
+
+        if urlsplit(route).scheme not in ("http", "https"):
+            return None
+        window: dict = {"route": normalize_route(urlsplit(route).path), "js": {}, "css": {},
+                        "transferred": transferred}
+        for script in js:
+            url, length = self.scripts.get(script["scriptId"], (script.get("url", ""), 0))
+            used = _used_js_bytes(script["functions"], length)
+            size = max(length, used)
+            current = window["js"].get(_chunk(url), (0, 0))
+            window["js"][_chunk(url)] = (max(current[0], size), max(current[1], used))
+
+        for rule in css:
+            if rule["used"]:
+                self.used_css[rule["styleSheetId"]].add((int(rule["startOffset"]), int(rule["endOffset"])))
+        for sheet_id, (url, length) in self.sheets.items():
+            used = sum(end - start for start, end in self.used_css.get(sheet_id, ()))
+            current = window["css"].get(_chunk(url), (0, 0))
+            window["css"][_chunk(url)] = (current[0] + length, current[1] + min(used, length))
+        return window
+
+
+class CoverageCollector:
+    def __init__(self):
+        self.windows: List[dict] = []
+        self.pages: List[_PageCoverage] = []
+
+    def apply(self, context: BrowserContext) -> None:
+        """Cover every page ``context.new_page()`` returns from now on."""
+        new_page = context.new_page
+
+        async def covered_new_page(*args, **kwargs) -> Page:
+            page = await new_page(*args, **kwargs)
+            await self.attach(context, page)
+            return page
+
+        context.new_page = covered_new_page
+
+    async def attach(self, context: BrowserContext, page: Page) -> None:
+        state = _PageCoverage(page)
+        await state.start(context)
+        self.pages.append(state)
+
+        def on_navigated(frame: Frame) -> None:
+            if frame == page.main_frame:
+                asyncio.ensure_future(self._cut(state))
+
+        page.on("framenavigated", on_navigated)
+
+    async def _cut(self, state: _PageCoverage) -> None:
+        window = await state.cut()
+        if window:
+            self.windows.append(window)
+
+    async def flush(self) -> None:
+        """Close the open window of every page; call before the context closes."""
+        for state in self.pages:
+            await self._cut(state)
+        self.pages.clear()
+
+
+def summary(windows: List[dict]) -> dict:
+    """Per-route and per-chunk coverage with budget failures."""
+    per_route: Dict[str, Dict[str, List[float]]] = defaultdict(lambda: defaultdict(list))
+    chunks: Dict[str, dict] = {}
+    for window in windows:
+        figures = {}
+        for kind in ("js", "css"):
+            size = sum(s for s, _ in window[kind].values())
+            used = sum(u for _, u in window[kind].values())
+            figures[f"{kind}_kb"] = size / 1024
+            figures[f"{kind}_unused_ratio"] = 1 - used / size if size else 0.0
+            for chunk, (chunk_size, chunk_used) in window[kind].items():
+                entry = chunks.setdefault(chunk, {"kind": kind, "kb": 0.0, "max_used_ratio": 0.0, "routes": set()})
+                entry["kb"] = max(entry["kb"], chunk_size / 1024)
+                if chunk_size:
+                    entry["max_used_ratio"] = max(entry["max_used_ratio"], chunk_used / chunk_size)
+                entry["routes"].add(window["route"])
+        figures["transferred_kb"] = sum(window["transferred"].values()) / 1024
+        for metric, value in figures.items():
+            per_route[window["route"]][metric].append(value)
+
+    budgets = budget_files.load(config.COVERAGE_BUDGETS_FILE, DEFAULT_BUDGETS)
+    routes, failures = {}, []
+    for route, metrics in sorted(per_route.items()):
+        digits = {metric: 3 if metric.endswith("ratio") else 1 for metric in metrics}
+        p50 = {metric: round(percentile(values, 50), digits[metric]) for metric, values in metrics.items()}
+        budget = budget_files.for_route(budgets, route)
+        routes[route] = {"visits": len(metrics["js_kb"]), **p50,
+                         "max_transferred_kb": round(max(metrics["transferred_kb"]), 1), "budget": budget}
+        failures.extend(budget_files.exceeded(route, p50, budget))
+
+    heaviest = sorted(chunks.items(), key=lambda item: item[1]["kb"] * (1 - item[1]["max_used_ratio"]),
+                      reverse=True)
+    return {
+        "routes": routes,
+        "chunks": {
+            chunk: {"kind": c["kind"], "kb": round(c["kb"], 1), "max_used_ratio": round(c["max_used_ratio"], 3),
+                    "routes": sorted(c["routes"])}
+            for chunk, c in heaviest[:50]
+        },
+        "budget_failures": failures,
+    }
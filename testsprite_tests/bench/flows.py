@@ -0,0 +1,169 @@
+"""Step-based TC flows with checkpoints, run in parallel on one browser.
+
+A :class:`Flow` is a TC case as a list of named async steps over one page.
+After each completed step the runner stores a checkpoint (context storage
+state plus the page URL); when a step fails, the retry opens a new context
+from the last checkpoint, goes back to its URL and continues with the next
+step instead of replaying login, modal dismissal and navigation. Steps that
+leave state a storage snapshot cannot capture (an open modal, a half-filled
+form) set ``checkpoint=False``, so a retry resumes from the step before.
+
+Checkpoints live under ``tmp/bench/checkpoints/<run>/`` and are evicted when
+the run ends.
+
+With an OTLP endpoint (``BENCH_OTLP_ENDPOINT`` or ``tracing=``) each flow is
+one trace: a span per step and, through ``bench.tracing``, a ``traceparent``
+on every same-origin request. Routing disables the browser's HTTP cache, so
+traced timings are not comparable with untraced ones.
+
+With ``BENCH_CACHE_LABELS=1`` (app started with ``CACHE_TELEMETRY=1``) each
+step is also labelled cold, warm or unknown by ``bench.cachestats``, in
+``steps_cache``. The counters are per server process, so with several
+workers a step reads cold when any step running alongside it was a first
+execution; use ``workers=1`` for exact labels.
+"""
+
+import json
+import shutil
+import time
+import uuid
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, NamedTuple, Optional
+
+from playwright import async_api
+from playwright.async_api import Browser, Page
+
+from . import browser, config
+from .cachestats import CacheProbe
+from .harness import HARNESS
+from .load import gather_limited
+from .tracing import FlowTrace
+
+CHECKPOINT_DIR = config.RESULTS_DIR / "checkpoints"
+
+
+class Step(NamedTuple):
+    name: str
+    action: Callable[[Page], Awaitable[None]]
+    checkpoint: bool = True
+
+
+class Flow(NamedTuple):
+    case_id: str
+    steps: List[Step]
+    # Logged-in role to start from; None starts anonymous (login is a step).
+    role: Optional[str] = None
+
+
+class CheckpointStore:
+    """Last good checkpoint per case, as storage-state files plus a small index."""
+
+    def __init__(self, run_id: Optional[str] = None):
+        self.directory = CHECKPOINT_DIR / (run_id or uuid.uuid4().hex[:8])
+
+    def _meta_path(self, case_id: str) -> Path:
+        return self.directory / case_id / "checkpoint.json"
+
+    async def save(self, case_id: str, index: int, step: str, page: Page) -> None:
+        case_dir = self.directory / case_id
+        case_dir.mkdir(parents=True, exist_ok=True)
+        state = case_dir / f"step-{index:02d}.json"
+        await page.context.storage_state(path=str(state))
+        self._meta_path(case_id).write_text(json.dumps({
+            "index": index, "step": step, "url": page.url, "state": str(state), "at": time.time(),
+        }), encoding="utf-8")
+
+    def latest(self, case_id: str) -> Optional[dict]:
+        try:
+            return json.loads(self._meta_path(case_id).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+
+    def evict(self) -> None:
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+
+async def run_flow(chromium: Browser, flow: Flow, store: Optional[CheckpointStore], retries: int = 2,
+                   initial_state: Optional[str] = None, tracing: Optional[str] = None,
+                   cache_labels: Optional[bool] = None) -> dict:
+    """Run ``flow`` with up to ``retries`` retries; resume from checkpoints when ``store`` is given."""
+    endpoint = config.OTLP_ENDPOINT if tracing is None else tracing
+    trace = FlowTrace(flow.case_id, endpoint) if endpoint else None
+    attempts: List[dict] = []
+    steps_ms: Dict[str, float] = {}
+    steps_cache: Dict[str, str] = {}
+    labels = config.CACHE_LABELS if cache_labels is None else cache_labels
+    started = time.perf_counter()
+    for attempt in range(retries + 1):
+        checkpoint = store.latest(flow.case_id) if store else None
+        first = checkpoint["index"] + 1 if checkpoint else 0
+        record: dict = {"resumed_from": checkpoint["step"] if checkpoint else None, "start_ms": 0.0}
+        attempt_start = time.perf_counter()
+        context = await browser.new_context(chromium, checkpoint["state"] if checkpoint else initial_state)
+        try:
+            if trace:
+                await trace.attach(context)
+            page = await context.new_page()
+            if checkpoint:
+                await page.goto(checkpoint["url"], wait_until="domcontentloaded", timeout=60000)
+                await browser.dismiss_novedades(page)
+            record["start_ms"] = round((time.perf_counter() - attempt_start) * 1000, 1)
+            # Shares the context's cookies; before a login step the probe reads "unknown".
+            probe = CacheProbe(page.context.request) if labels else None
+            for index in range(first, len(flow.steps)):
+                step = flow.steps[index]
+                record["step"] = step.name
+                before = await probe.snapshot() if probe else None
+                step_start = time.perf_counter()
+                with HARNESS.step(f"{flow.case_id}/{step.name}"):
+                    if trace:
+                        with trace.step(step.name):
+                            await step.action(page)
+                    else:
+                        await step.action(page)
+                steps_ms[step.name] = round((time.perf_counter() - step_start) * 1000, 1)
+                if probe:
+                    after = await probe.snapshot()
+                    steps_cache[step.name] = probe.label(before, after, probe.delta(before, after))
+                if store and step.checkpoint:
+                    await store.save(flow.case_id, index, step.name, page)
+            record.pop("step", None)
+        except (async_api.Error, AssertionError) as error:
+            record["error"] = str(error).strip().splitlines()[0] if str(error).strip() else type(error).__name__
+        finally:
+            await context.close()
+        record["ms"] = round((time.perf_counter() - attempt_start) * 1000, 1)
+        attempts.append(record)
+        if "error" not in record:
+            break
+
+    result = {
+        "passed": "error" not in attempts[-1],
+        "attempts": attempts,
+        "steps_ms": steps_ms,
+        "wall_s": round(time.perf_counter() - started, 2),
+        "retry_s": round(sum(a["ms"] for a in attempts[1:]) / 1000, 2),
+    }
+    if labels:
+        result["steps_cache"] = steps_cache
+    if trace:
+        result["trace_id"] = trace.trace_id
+        result["trace_exported"] = await trace.finish(result["passed"])
+    return result
+
+
+async def run_flows(chromium: Browser, flows: List[Flow], workers: int = 4, retries: int = 2,
+                    checkpoints: bool = True, keep: bool = False,
+                    tracing: Optional[str] = None) -> Dict[str, dict]:
+    """Run ``flows`` ``workers`` at a time; checkpoints are evicted at the end unless ``keep``."""
+    store = CheckpointStore() if checkpoints else None
+    states = {role: await browser.storage_state(chromium, role) for role in {f.role for f in flows if f.role}}
+    try:
+        results = await gather_limited([
+            lambda flow=flow: run_flow(chromium, flow, store, retries, states.get(flow.role), tracing)
+            for flow in flows
+        ], workers)
+    finally:
+        if store and not keep:
+            store.evict()
+    return {flow.case_id: result for flow, result in zip(flows, results)}
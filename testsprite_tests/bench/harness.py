@@ -0,0 +1,193 @@
+"""Instrumentation of the harness itself, to tell runner overhead from app latency.
+
+:data:`HARNESS` records, for a whole scenario or TC script run:
+
+* Python CPU time of the process (and of finished child processes, i.e. the
+  ``bench.tcrun`` subprocesses) against wall time,
+* event-loop lag: how late a 50 ms ``asyncio.sleep`` wakes up; sustained lag
+  means callbacks (frame parsing, JSON, our own bookkeeping) hog the loop,
+* Playwright protocol round trips per method (``Frame.goto``,
+  ``Locator.click``, ``CDPSession.send``...) with their reply latency. Every
+  Python API call is one or more such round trips to the driver, which
+  issues the CDP commands; counts come from wrapping the private
+  ``Connection._send_message_to_server`` and are left out if it moves,
+* per-step wall time, process CPU time and round trips for code wrapped in
+  :meth:`HarnessStats.step` (``bench.flows`` wraps every flow step).
+
+With ``BENCH_HARNESS_SAMPLER_HZ`` set, a ``SIGPROF`` sampling profiler also
+runs (CPU time only, main thread, Unix) and :meth:`HarnessStats.write_stacks`
+writes collapsed stacks (``a;b;c 12``) for ``flamegraph.pl`` or speedscope.
+"""
+
+import asyncio
+import contextvars
+import resource
+import signal
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+from . import config
+from .stats import keep_sample, summarize
+
+STACKS_DIR = config.RESULTS_DIR / "stacks"
+LAG_INTERVAL_S = 0.05
+_STEP: contextvars.ContextVar = contextvars.ContextVar("bench_harness_step", default=None)
+
+
+def _children_cpu_s() -> float:
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+
+class HarnessStats:
+    def __init__(self):
+        self.calls: Counter = Counter()
+        self.rtt_ms: Dict[str, List[float]] = defaultdict(list)
+        self.lag_ms: List[float] = []
+        self.lag_seen = 0
+        self.steps: Dict[str, List[dict]] = defaultdict(list)
+        self.stacks: Counter = Counter()
+        self.protocol_hook = False
+        self._lag_task: Optional[asyncio.Task] = None
+        self._started: Optional[tuple] = None
+        self._sampling = False
+
+    # -- setup -----------------------------------------------------------------------------------
+
+    def install(self) -> None:
+        """Wrap Playwright's protocol sender; safe to call more than once."""
+        if self.protocol_hook:
+            return
+        try:
+            from playwright._impl._connection import Connection
+            send = Connection._send_message_to_server
+        except (ImportError, AttributeError):
+            return
+        stats = self
+
+        def counted_send(connection, target, method, *args, **kwargs):
+            name = f"{getattr(target, '_type', type(target).__name__)}.{method}"
+            start = time.perf_counter()
+            callback = send(connection, target, method, *args, **kwargs)
+            stats.calls[name] += 1
+            step = _STEP.get()
+            if step is not None:
+                step["calls"] += 1
+            future = getattr(callback, "future", None)
+            if future is not None:
+                seen = stats.calls[name]
+                future.add_done_callback(
+                    lambda _: keep_sample(stats.rtt_ms[name], (time.perf_counter() - start) * 1000, seen))
+            return callback
+
+        Connection._send_message_to_server = counted_send
+        self.protocol_hook = True
+
+    def start(self, sampler_hz: float = 0.0) -> None:
+        """Start the clocks and the lag monitor on the running loop (idempotent)."""
+        if self._started is None:
+            self._started = (time.perf_counter(), time.process_time(), _children_cpu_s())
+        if sampler_hz and not self._sampling and hasattr(signal, "setitimer"):
+            signal.signal(signal.SIGPROF, self._sample)
+            signal.setitimer(signal.ITIMER_PROF, 1 / sampler_hz, 1 / sampler_hz)
+            self._sampling = True
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        if self._lag_task is None or self._lag_task.done():
+            self._lag_task = loop.create_task(self._monitor_lag())
+
+    def stop(self) -> None:
+        if self._lag_task:
+            self._lag_task.cancel()
+            self._lag_task = None
+        if self._sampling:
+            signal.setitimer(signal.ITIMER_PROF, 0, 0)
+            signal.signal(signal.SIGPROF, signal.SIG_DFL)
+            self._sampling = False
+
+    async def _monitor_lag(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            before = loop.time()
+            await asyncio.sleep(LAG_INTERVAL_S)
+            self.lag_seen += 1
+            keep_sample(self.lag_ms, max(0.0, (loop.time() - before - LAG_INTERVAL_S) * 1000), self.lag_seen)
+
+    def _sample(self, _signum, frame) -> None:
+        names = []
+        while frame is not None:
+            names.append(f"{Path(frame.f_code.co_filename).stem}:{frame.f_code.co_name}")
+            frame = frame.f_back
+        self.stacks[";".join(reversed(names))] += 1
+
+    # -- recording -------------------------------------------------------------------------------
+
+    @contextmanager
+    def step(self, name: str) -> Iterator[dict]:
+        """Time a block; round trips made by the current task inside it are attributed to it.
+
+        ``cpu_ms`` is process CPU time, shared with whatever ran concurrently.
+        """
+        record = {"calls": 0}
+        token = _STEP.set(record)
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield record
+        finally:
+            _STEP.reset(token)
+            record["wall_ms"] = (time.perf_counter() - wall) * 1000
+            record["cpu_ms"] = (time.process_time() - cpu) * 1000
+            self.steps[name].append(record)
+
+    # -- output ----------------------------------------------------------------------------------
+
+    def summary(self, top: int = 15) -> dict:
+        if self._started is None:
+            return {}
+        wall0, cpu0, children0 = self._started
+        wall_s = time.perf_counter() - wall0
+        cpu_s = time.process_time() - cpu0
+        result: dict = {
+            "wall_s": round(wall_s, 2),
+            "python_cpu_s": round(cpu_s, 2),
+            "python_cpu_share": round(cpu_s / wall_s, 3) if wall_s else None,
+            "children_cpu_s": round(_children_cpu_s() - children0, 2),
+            "loop_lag_ms": summarize(self.lag_ms),
+            "loop_lag_over_100ms": sum(ms > 100 for ms in self.lag_ms),
+        }
+        if self.protocol_hook:
+            result["round_trips"] = sum(self.calls.values())
+            result["round_trips_by_method"] = {
+                name: {"count": count, "rtt_ms": summarize(self.rtt_ms.get(name, []))}
+                for name, count in self.calls.most_common(top)
+            }
+        if self.steps:
+            result["steps"] = {
+                name: {
+                    "wall_ms": summarize(r["wall_ms"] for r in records),
+                    "cpu_ms": summarize(r["cpu_ms"] for r in records),
+                    "round_trips": round(sum(r["calls"] for r in records) / len(records), 1),
+                }
+                for name, records in self.steps.items()
+            }
+        if self.stacks:
+            result["samples"] = sum(self.stacks.values())
+        return result
+
+    def write_stacks(self, name: str) -> Optional[Path]:
+        """Write ``tmp/bench/stacks/<name>-<timestamp>.collapsed`` if anything was sampled."""
+        if not self.stacks:
+            return None
+        path = STACKS_DIR / f"{name}-{time.strftime('%Y%m%dT%H%M%S')}.collapsed"
+        STACKS_DIR.mkdir(parents=True, exist_ok=True)
+        path.write_text("".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common()),
+                        encoding="utf-8")
+        return path
+
+
+HARNESS = HarnessStats()
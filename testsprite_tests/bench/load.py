@@ -0,0 +1,41 @@
+"""Concurrency helpers for firing timed HTTP requests at the app."""
+
+import asyncio
+import time
+from typing import Awaitable, Callable, Iterable, List, NamedTuple, TypeVar
+
+from playwright.async_api import APIRequestContext
+
+T = TypeVar("T")
+
+
+class Sample(NamedTuple):
+    ms: float
+    status: int
+    size: int
+
+
+async def timed_request(request: APIRequestContext, method: str, url: str, **kwargs) -> Sample:
+    """Issue one request and return its latency (full body read) in ms."""
+    start = time.perf_counter()
+    response = await request.fetch(url, method=method, **kwargs)
+    body = await response.body()
+    return Sample((time.perf_counter() - start) * 1000, response.status, len(body))
+
+
+async def gather_limited(factories: Iterable[Callable[[], Awaitable[T]]], concurrency: int) -> List[T]:
+    """Run coroutine factories with at most ``concurrency`` in flight, keeping order."""
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def guarded(factory: Callable[[], Awaitable[T]]) -> T:
+        async with semaphore:
+            return await factory()
+
+    return await asyncio.gather(*(guarded(factory) for factory in factories))
+
+
+def status_counts(samples: Iterable[Sample]) -> dict:
+    counts: dict = {}
+    for sample in samples:
+        counts[str(sample.status)] = counts.get(str(sample.status), 0) + 1
+    return counts
@@ -0,0 +1,64 @@
+"""Resident-memory sampling for the harness and for the app server process."""
+
+import asyncio
+import resource
+import sys
+from pathlib import Path
+from typing import List, Optional
+
+
+def process_rss_mb(pid: int) -> Optional[float]:
+    """Current RSS of ``pid`` in MB read from ``/proc`` (Linux only)."""
+    try:
+        for line in Path(f"/proc/{pid}/status").read_text().splitlines():
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    except (OSError, ValueError, IndexError):
+        return None
+    return None
+
+
+def peak_rss_mb() -> float:
+    """Peak RSS of the harness itself in MB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS and kilobytes everywhere else.
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+class RssSampler:
+    """Poll a process RSS in the background: ``async with RssSampler(pid) as s``."""
+
+    def __init__(self, pid: Optional[int], interval: float = 0.05):
+        self.pid = pid
+        self.interval = interval
+        self.samples: List[float] = []
+        self._task: Optional[asyncio.Task] = None
+
+    async def _poll(self) -> None:
+        while True:
+            value = process_rss_mb(self.pid)
+            if value is not None:
+                self.samples.append(value)
+            await asyncio.sleep(self.interval)
+
+    def summary(self) -> dict:
+        if not self.samples:
+            return {}
+        return {
+            "start_mb": round(self.samples[0], 1),
+            "peak_mb": round(max(self.samples), 1),
+            "growth_mb": round(max(self.samples) - self.samples[0], 1),
+        }
+
+    async def __aenter__(self) -> "RssSampler":
+        if self.pid:
+            self._task = asyncio.create_task(self._poll())
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
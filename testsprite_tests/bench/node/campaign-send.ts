@@ -0,0 +1,159 @@
+/**
+ * Driver de envío masivo para `python -m bench campaign`.
+ *
+ * Ejecuta el fan-out de una campaña con los mismos módulos que usa la app:
+ *   - whatsapp: renderTemplate + prependMedia + buildWhatsAppUrl (wa.me, sin red)
+ *   - email:    renderTemplate + textoAHtml + enviarEmail (Resend), o
+ *               enviarEmailMasivo tal cual con `mode: "masivo"`
+ *
+ * Lee un JSON de configuración y un JSONL de destinatarios y escribe en `out`
+ * las latencias crudas por mensaje, reintentos y muestras de memoria; los
+ * percentiles los calcula el harness de Python.
+ *
+ * Uso (desde la raíz del repo, con RESEND_BASE_URL apuntando al stand-in):
+ *   npx tsx testsprite_tests/bench/node/campaign-send.ts config.json
+ */
+
+import * as fs from "fs";
+import { performance } from "perf_hooks";
+
+import { renderTemplate, prependMedia, buildWhatsAppUrl } from "@/lib/marketing/whatsapp";
+import { enviarEmail, enviarEmailMasivo, textoAHtml } from "@/lib/services/email";
+
+interface DriverConfig {
+  channel: "whatsapp" | "email";
+  mode: "pool" | "masivo";
+  concurrency: number;
+  retries: number;
+  backoffMs: number;
+  template: { body_texto: string; media_url?: string | null; subject: string };
+  snippets?: Record<string, string>;
+  recipientsFile: string;
+  out: string;
+}
+
+interface Recipient {
+  nombre: string;
+  telefono: string;
+  email: string;
+  [variable: string]: string;
+}
+
+interface Retries {
+  attempts: number;
+  retried: number;
+  overheadMs: number;
+}
+
+const sleep = (ms: number) => new Promise((resolve) => setTimeout(resolve, ms));
+
+function sampleMemory(samples: { rss: number[]; heap: number[] }) {
+  const { rss, heapUsed } = process.memoryUsage();
+  samples.rss.push(rss / 1024 / 1024);
+  samples.heap.push(heapUsed / 1024 / 1024);
+}
+
+async function conReintentos<T>(fn: () => Promise<T>, config: DriverConfig, retries: Retries): Promise<T> {
+  for (let intento = 0; ; intento++) {
+    const inicio = performance.now();
+    retries.attempts++;
+    try {
+      return await fn();
+    } catch (err) {
+      if (intento >= config.retries) throw err;
+      retries.retried++;
+      const espera = config.backoffMs * 2 ** intento;
+      await sleep(espera);
+      retries.overheadMs += performance.now() - inicio;
+    }
+  }
+}
+
+async function enviarUno(destinatario: Recipient, config: DriverConfig, retries: Retries): Promise<void> {
+  const mensaje = renderTemplate(config.template.body_texto, destinatario, { snippets: config.snippets });
+  if (config.channel === "whatsapp") {
+    buildWhatsAppUrl(destinatario.telefono, prependMedia(mensaje, config.template.media_url));
+    return;
+  }
+  const html = textoAHtml(mensaje, destinatario.nombre);
+  await conReintentos(
+    () => enviarEmail({ to: destinatario.email, subject: config.template.subject, html, text: mensaje }),
+    config,
+    retries,
+  );
+}
+
+async function main() {
+  const config: DriverConfig = JSON.parse(fs.readFileSync(process.argv[2], "utf-8"));
+  const destinatarios: Recipient[] = fs
+    .readFileSync(config.recipientsFile, "utf-8")
+    .split("\n")
+    .filter(Boolean)
+    .map((line) => JSON.parse(line));
+
+  const memoria = { rss: [] as number[], heap: [] as number[] };
+  sampleMemory(memoria);
+  const muestreo = setInterval(() => sampleMemory(memoria), 100);
+
+  const latencias: number[] = [];
+  const fallidos: string[] = [];
+  const retries: Retries = { attempts: 0, retried: 0, overheadMs: 0 };
+  const inicio = performance.now();
+
+  if (config.mode === "masivo") {
+    // Camino existente: un solo HTML para todos y 50ms fijos entre envíos.
+    const html = textoAHtml(config.template.body_texto);
+    const { fallidos: errores } = await enviarEmailMasivo(
+      destinatarios.map((d) => d.email),
+      config.template.subject,
+      html,
+    );
+    fallidos.push(...errores.map((e) => e.error));
+    retries.attempts = destinatarios.length;
+  } else {
+    let siguiente = 0;
+    const worker = async () => {
+      while (siguiente < destinatarios.length) {
+        const destinatario = destinatarios[siguiente++];
+        const t0 = performance.now();
+        try {
+          await enviarUno(destinatario, config, retries);
+          latencias.push(performance.now() - t0);
+        } catch (err) {
+          fallidos.push(err instanceof Error ? err.message : String(err));
+        }
+      }
+    };
+    await Promise.all(Array.from({ length: Math.max(1, config.concurrency) }, worker));
+  }
+
+  const elapsedMs = performance.now() - inicio;
+  clearInterval(muestreo);
+  sampleMemory(memoria);
+
+  const errores: Record<string, number> = {};
+  for (const mensaje of fallidos) errores[mensaje] = (errores[mensaje] ?? 0) + 1;
+
+  fs.writeFileSync(
+    config.out,
+    JSON.stringify({
+      recipients: destinatarios.length,
+      sent: destinatarios.length - fallidos.length,
+      failed: fallidos.length,
+      errors: errores,
+      elapsed_ms: elapsedMs,
+      latencies_ms: latencias,
+      attempts: retries.attempts,
+      retried: retries.retried,
+      retry_overhead_ms: retries.overheadMs,
+      rss_mb: memoria.rss,
+      heap_mb: memoria.heap,
+    }),
+    "utf-8",
+  );
+}
+
+main().catch((err) => {
+  console.error(err);
+  process.exit(1);
+});
@@ -0,0 +1,54 @@
+/**
+ * Driver de `python -m bench cron`: clasifica cuotas con computeTier().
+ *
+ * Recibe un JSONL de cuotas ({fecha_vencimiento, estado}) y escribe en el
+ * archivo de salida cuántas caen en cada tier para la fecha de hoy en Lima y
+ * cuánto cuesta la clasificación pura, sin DB. El harness lo usa como valor
+ * esperado de `generadas` del cron de cobranza.
+ *
+ * Uso: npx tsx testsprite_tests/bench/node/cobranza-tiers.ts cuotas.jsonl salida.json
+ */
+
+import * as fs from "fs";
+import { performance } from "perf_hooks";
+
+import { computeTier, limaToday } from "@/lib/cobranza/tiers";
+
+interface CuotaInput {
+  fecha_vencimiento: string;
+  estado: string;
+}
+
+function main() {
+  const [entrada, salida] = process.argv.slice(2);
+  const cuotas: CuotaInput[] = fs
+    .readFileSync(entrada, "utf-8")
+    .split("\n")
+    .filter(Boolean)
+    .map((line) => JSON.parse(line));
+
+  const today = limaToday();
+  const tiers: Record<string, number> = {};
+  const inicio = performance.now();
+  for (const cuota of cuotas) {
+    const tier = computeTier({ fechaVencimiento: cuota.fecha_vencimiento, estado: cuota.estado, today });
+    const clave = tier ?? "sin_alerta";
+    tiers[clave] = (tiers[clave] ?? 0) + 1;
+  }
+  const elapsedMs = performance.now() - inicio;
+
+  fs.writeFileSync(
+    salida,
+    JSON.stringify({
+      today,
+      cuotas: cuotas.length,
+      tiers,
+      alertas: cuotas.length - (tiers.sin_alerta ?? 0),
+      elapsed_ms: elapsedMs,
+      ns_per_cuota: cuotas.length ? (elapsedMs * 1e6) / cuotas.length : 0,
+    }),
+    "utf-8",
+  );
+}
+
+main();
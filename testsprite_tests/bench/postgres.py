@@ -0,0 +1,121 @@
+"""Direct Postgres access through ``psql``: bulk ``COPY`` streams and small queries.
+
+Used where PostgREST is too slow (millions of seed rows). There is no driver
+dependency: rows are written in COPY text format to the stdin of a ``psql``
+process (``BENCH_PSQL``) connected to ``BENCH_PG_URL``, the database behind
+the Supabase project (``supabase start`` exposes it on port 54322).
+
+With ``replica=True`` the session runs with ``session_replication_role =
+replica``: triggers and foreign-key checks are skipped, which bulk loads need
+(``cliente`` alone runs several per-row triggers, and every FK check is a
+lookup per row) and which requires a superuser. The caller is then
+responsible for referential consistency, for the columns those triggers
+would fill and for sequences they would advance (``set_codigo_cliente``
+draws from ``crm.cliente_codigo_seq``).
+"""
+
+import json
+import shlex
+import subprocess
+from typing import Iterable, List, Optional, Sequence
+
+from . import config
+
+_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+BUFFER_BYTES = 1 << 20
+
+
+def _psql(url: str, *commands: str) -> List[str]:
+    argv = [*shlex.split(config.PSQL), url, "-X", "-q", "-v", "ON_ERROR_STOP=1"]
+    for command in commands:
+        argv += ["-c", command]
+    return argv
+
+
+def _escape(text: str) -> str:
+    # Most fields need no escaping; the membership tests are far cheaper than translate().
+    if "\\" in text or "\t" in text or "\n" in text or "\r" in text:
+        return text.translate(_ESCAPES)
+    return text
+
+
+def _field(value) -> str:
+    if value.__class__ is str:
+        return _escape(value)
+    if value is None:
+        return "\\N"
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, (dict, list)):
+        return _escape(json.dumps(value, ensure_ascii=False, separators=(",", ":")))
+    return _escape(str(value))
+
+
+def query(sql: str, url: Optional[str] = None) -> List[List[str]]:
+    """Rows of ``sql`` as lists of strings; raises RuntimeError with psql's message on failure."""
+    process = subprocess.run([*_psql(url or config.PG_URL, sql), "-A", "-t", "-F", "\t"],
+                             capture_output=True, text=True)
+    if process.returncode != 0:
+        raise RuntimeError(f"psql: {process.stderr.strip()}")
+    return [line.split("\t") for line in process.stdout.splitlines() if line]
+
+
+def pg_array(values: Iterable[str]) -> str:
+    """``text[]`` literal for a COPY field (values must not need quoting)."""
+    return "{" + ",".join(values) + "}"
+
+
+class Copy:
+    """``COPY <table> (<columns>) FROM STDIN`` fed row by row: ``with Copy(...) as c: c.write(row)``."""
+
+    def __init__(self, table: str, columns: Sequence[str], url: Optional[str] = None, replica: bool = True):
+        self.table = table
+        self.rows = 0
+        commands = ["SET session_replication_role = replica"] if replica else []
+        commands.append(f"COPY {table} ({', '.join(columns)}) FROM STDIN")
+        self._process = subprocess.Popen(_psql(url or config.PG_URL, *commands), stdin=subprocess.PIPE,
+                                         stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+        self._buffer: List[str] = []
+        self._size = 0
+
+    def write(self, row: Sequence) -> None:
+        line = "\t".join(map(_field, row)) + "\n"
+        self._buffer.append(line)
+        self._size += len(line)
+        self.rows += 1
+        if self._size >= BUFFER_BYTES:
+            self.flush()
+
+    def flush(self) -> None:
+        if self._buffer:
+            try:
+                self._process.stdin.write("".join(self._buffer).encode("utf-8"))
+            except BrokenPipeError:
+                pass  # psql failed; close() reports its error
+            self._buffer, self._size = [], 0
+
+    def close(self) -> int:
+        """Finish the COPY; returns the row count or raises RuntimeError with psql's error."""
+        self.flush()
+        try:
+            self._process.stdin.close()
+        except BrokenPipeError:
+            pass
+        stderr = self._process.stderr.read().decode("utf-8", "replace").strip()
+        if self._process.wait() != 0:
+            raise RuntimeError(f"COPY {self.table}: {stderr.splitlines()[-1] if stderr else 'psql failed'}")
+        return self.rows
+
+    def __enter__(self) -> "Copy":
+        return self
+
+    def abort(self) -> None:
+        """Kill psql without finishing the COPY, so nothing is committed."""
+        self._process.kill()
+        self._process.wait()
+
+    def __exit__(self, exc_type, *exc) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
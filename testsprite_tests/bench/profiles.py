@@ -0,0 +1,105 @@
+"""Named device/network/CPU emulation profiles.
+
+Field vendedores use mid-range Android phones on mobile data, while the TC
+scripts run on an unthrottled 1280x720 desktop. A profile bundles the
+context options of a phone (viewport, DPR, touch, user agent) with the
+throttling Chromium applies per page over CDP: ``Emulation.setCPUThrottlingRate``
+and ``Network.emulateNetworkConditions``. Network figures follow the
+Lighthouse/DevTools presets.
+
+``browser.new_context()`` applies ``BENCH_PROFILE`` to every bench scenario;
+``bench.tcrun`` does the same for the unmodified TC scripts.
+"""
+
+import asyncio
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+from playwright.async_api import BrowserContext, Page
+
+ANDROID_UA = ("Mozilla/5.0 (Linux; Android 13; {model}) AppleWebKit/537.36 (KHTML, like Gecko) "
+              "Chrome/124.0.0.0 Mobile Safari/537.36")
+
+
+@dataclass(frozen=True)
+class Profile:
+    name: str
+    viewport: Optional[Dict[str, int]] = None
+    device_scale_factor: float = 1.0
+    mobile: bool = False
+    user_agent: Optional[str] = None
+    cpu_rate: float = 1.0
+    latency_ms: float = 0.0
+    down_kbps: float = 0.0
+    up_kbps: float = 0.0
+
+    @property
+    def throttled(self) -> bool:
+        return self.cpu_rate > 1 or bool(self.latency_ms or self.down_kbps or self.up_kbps)
+
+    def context_options(self) -> dict:
+        if not self.viewport:
+            return {}
+        options = {"viewport": self.viewport, "device_scale_factor": self.device_scale_factor,
+                   "is_mobile": self.mobile, "has_touch": self.mobile}
+        if self.user_agent:
+            options["user_agent"] = self.user_agent
+        return options
+
+
+PROFILES = {
+    profile.name: profile
+    for profile in (
+        Profile("desktop"),
+        Profile("4g-midrange", viewport={"width": 393, "height": 851}, device_scale_factor=2.75, mobile=True,
+                user_agent=ANDROID_UA.format(model="Pixel 5"),
+                cpu_rate=4, latency_ms=150, down_kbps=1600, up_kbps=750),
+        Profile("3g-midrange", viewport={"width": 360, "height": 800}, device_scale_factor=3, mobile=True,
+                user_agent=ANDROID_UA.format(model="SM-A135M"),
+                cpu_rate=4, latency_ms=300, down_kbps=750, up_kbps=250),
+        Profile("3g-lowend", viewport={"width": 360, "height": 640}, device_scale_factor=2, mobile=True,
+                user_agent=ANDROID_UA.format(model="moto e13"),
+                cpu_rate=6, latency_ms=562.5, down_kbps=1474, up_kbps=675),
+    )
+}
+
+
+def get(name: str) -> Profile:
+    try:
+        return PROFILES[name]
+    except KeyError:
+        raise ValueError(f"Unknown profile {name!r}, expected one of {tuple(PROFILES)}") from None
+
+
+async def throttle(context: BrowserContext, page: Page, profile: Profile) -> None:
+    """Apply the profile's CPU and network throttling to ``page``."""
+    cdp = await context.new_cdp_session(page)
+    await cdp.send("Emulation.setCPUThrottlingRate", {"rate": profile.cpu_rate})
+    await cdp.send("Network.enable")
+    await cdp.send("Network.emulateNetworkConditions", {
+        "offline": False,
+        "latency": profile.latency_ms,
+        # CDP takes bytes per second; -1 disables the limit.
+        "downloadThroughput": profile.down_kbps * 1000 / 8 if profile.down_kbps else -1,
+        "uploadThroughput": profile.up_kbps * 1000 / 8 if profile.up_kbps else -1,
+    })
+
+
+def apply(context: BrowserContext, profile: Profile) -> None:
+    """Throttle every page of ``context``.
+
+    ``new_page()`` is wrapped so the page is throttled before the caller's
+    first ``goto``; other pages (popups, ``target=_blank``) as soon as the
+    context reports them. Throttling a page twice is harmless.
+    """
+    if not profile.throttled:
+        return
+    new_page = context.new_page
+
+    async def throttled_new_page(*args, **kwargs) -> Page:
+        page = await new_page(*args, **kwargs)
+        await throttle(context, page, profile)
+        return page
+
+    context.new_page = throttled_new_page
+    context.on("page", lambda page: asyncio.ensure_future(throttle(context, page, profile)))
@@ -0,0 +1,133 @@
+"""Expected RBAC policy derived from the Next.js sources.
+
+Reads the same definitions the app enforces so the matrix never drifts
+from the code:
+
+* ``src/lib/permissions/constants.ts`` – ``PERMISOS.X.Y`` -> permission code,
+* ``src/config/navigation.tsx`` – sidebar items with ``permisos``/``roles``,
+  evaluated with the rule of ``useCanAccess`` in ``SidebarShadcn.tsx``,
+* ``src/app/dashboard/**/page.tsx`` – server guards (``admin/layout.tsx``,
+  ``soloAdmins*``, ``protegerRuta``, ``esAdmin()``-style checks followed by a
+  redirect). Pages without a recognised guard are open to any session.
+"""
+
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from . import config
+
+REPO_DIR = config.TESTS_DIR.parent
+DASHBOARD_DIR = REPO_DIR / "src" / "app" / "dashboard"
+ADMIN = "ROL_ADMIN"
+
+_BLOCK_RE = re.compile(r"^  ([A-Z_]+): \{(.*?)^  \}", re.S | re.M)
+_ENTRY_RE = re.compile(r"([A-Z_]+): '([^']+)'")
+_HREF_RE = re.compile(r"href: \"([^\"]+)\"")
+_PERMISOS_RE = re.compile(r"permisos: \[([^\]]*)\]")
+_ROLES_RE = re.compile(r"roles: \[([^\]]*)\]")
+_CONST_REF_RE = re.compile(r"PERMISOS\.([A-Z_]+)\.([A-Z_]+)")
+_ROLE_CHECKS = {
+    "esAdmin": ADMIN,
+    "esVendedor": "ROL_VENDEDOR",
+    "esGerente": "ROL_GERENTE",
+    "esCoordinador": "ROL_COORDINADOR_VENTAS",
+}
+_GUARD_HELPERS = {
+    "soloAdmins": [ADMIN],
+    "soloAdminsYGerentes": [ADMIN, "ROL_GERENTE"],
+    "soloAdminsYCoordinadores": [ADMIN, "ROL_COORDINADOR_VENTAS"],
+}
+
+
+@dataclass
+class Rule:
+    """Who may see a sidebar item or open a route."""
+
+    permisos: List[str] = field(default_factory=list)
+    roles: List[str] = field(default_factory=list)
+    source: str = "authenticated"
+
+    def sidebar_allows(self, rol: str, permisos: List[str]) -> bool:
+        """``useCanAccess`` from ``SidebarShadcn.tsx``."""
+        has_rol = not self.roles or rol in self.roles
+        if rol == ADMIN:
+            return has_rol
+        has_permiso = not self.permisos or any(p in permisos for p in self.permisos)
+        if self.permisos and self.roles:
+            return has_permiso or has_rol
+        return has_permiso and has_rol
+
+    def route_allows(self, rol: str, permisos: List[str]) -> bool:
+        """``protegerRuta`` semantics: admins pass permission checks."""
+        if self.roles and rol not in self.roles:
+            return False
+        if self.permisos and rol != ADMIN:
+            return any(p in permisos for p in self.permisos)
+        return True
+
+
+def permission_codes() -> Dict[str, str]:
+    source = (REPO_DIR / "src/lib/permissions/constants.ts").read_text(encoding="utf-8")
+    codes = {}
+    for group, body in _BLOCK_RE.findall(source):
+        for key, code in _ENTRY_RE.findall(body):
+            codes[f"{group}.{key}"] = code
+    return codes
+
+
+def _resolve(refs: str, codes: Dict[str, str]) -> List[str]:
+    return [codes[f"{g}.{k}"] for g, k in _CONST_REF_RE.findall(refs) if f"{g}.{k}" in codes]
+
+
+def sidebar_rules() -> Dict[str, Rule]:
+    """Sidebar ``href`` -> rule, from ``navigation`` and ``adminNavigation``."""
+    codes = permission_codes()
+    source = (REPO_DIR / "src/config/navigation.tsx").read_text(encoding="utf-8")
+    rules = {}
+    for chunk in re.split(r"\n\s*(?=\{\s*name:)", source):
+        href = _HREF_RE.search(chunk)
+        if not chunk.lstrip().startswith("{") or not href:
+            continue
+        permisos = _PERMISOS_RE.search(chunk)
+        roles = _ROLES_RE.search(chunk)
+        rules[href.group(1)] = Rule(
+            permisos=_resolve(permisos.group(1), codes) if permisos else [],
+            roles=re.findall(r"'([A-Z_]+)'", roles.group(1)) if roles else [],
+            source="navigation.tsx",
+        )
+    return rules
+
+
+def _page_rule(route: str, page: Path, codes: Dict[str, str]) -> Rule:
+    if route.startswith("/dashboard/admin"):
+        if route == "/dashboard/admin/usuarios" or route.startswith("/dashboard/admin/usuarios/"):
+            return Rule(roles=[ADMIN, "ROL_GERENTE"], source="admin/layout.tsx")
+        return Rule(roles=[ADMIN], source="admin/layout.tsx")
+    source = page.read_text(encoding="utf-8")
+    for helper, roles in _GUARD_HELPERS.items():
+        if re.search(rf"\b{helper}\(", source):
+            return Rule(roles=list(roles), source=helper)
+    guard = re.search(r"protegerRuta\(\{\s*permisos?:\s*\[?([^}]*)\}", source)
+    if guard:
+        return Rule(permisos=_resolve(guard.group(1), codes), source="protegerRuta")
+    if 'redirect("/dashboard")' in source or "redirect('/dashboard')" in source:
+        roles = [rol for fn, rol in _ROLE_CHECKS.items() if re.search(rf"await {fn}\(\)", source)]
+        if roles:
+            return Rule(roles=roles, source="page role check")
+    return Rule()
+
+
+def dashboard_routes() -> Tuple[Dict[str, Rule], List[str]]:
+    """Static ``/dashboard`` routes with their guard, plus skipped dynamic ones."""
+    codes = permission_codes()
+    routes, skipped = {}, []
+    for page in sorted(DASHBOARD_DIR.rglob("page.tsx")):
+        relative = page.parent.relative_to(DASHBOARD_DIR).as_posix()
+        route = "/dashboard" if relative == "." else f"/dashboard/{relative}"
+        if "[" in route:
+            skipped.append(route)
+            continue
+        routes[route] = _page_rule(route, page, codes)
+    return routes, skipped
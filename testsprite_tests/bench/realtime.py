@@ -0,0 +1,135 @@
+"""Lightweight Supabase Realtime subscribers for the notificaciones channel.
+
+A :class:`Subscriber` does what ``NotificationsDropdown.tsx`` does through
+``realtime-js``, minus the browser: open ``/realtime/v1/websocket``, join
+``realtime:notificaciones:<user id>`` for INSERT/UPDATE/DELETE on
+``crm.notificacion`` without a filter, heartbeat every 25 s, and reconnect
+after a drop with realtime-js' schedule (1 s, 2 s, 5 s, then every 10 s).
+Each delivered row whose ``data`` carries ``bench_sent_at`` (epoch seconds)
+yields a delivery latency.
+"""
+
+import asyncio
+import json
+import random
+import time
+from typing import List, Optional
+
+from . import websocket
+
+RECONNECT_AFTER_MS = (1000, 2000, 5000, 10000)
+HEARTBEAT_S = 25.0
+CHANGES = [{"event": event, "schema": "crm", "table": "notificacion"} for event in ("INSERT", "UPDATE", "DELETE")]
+
+
+def socket_url(base_url: str, apikey: str) -> str:
+    scheme, rest = base_url.rstrip("/").split("://", 1)
+    return f"{'wss' if scheme == 'https' else 'ws'}://{rest}/realtime/v1/websocket?apikey={apikey}&vsn=1.0.0"
+
+
+def delivery_latency_ms(message: dict) -> Optional[float]:
+    """Insert-to-delivery latency of a ``postgres_changes`` message for a bench row."""
+    if message.get("event") != "postgres_changes":
+        return None
+    record = ((message.get("payload") or {}).get("data") or {}).get("record") or {}
+    sent = (record.get("data") or {}).get("bench_sent_at")
+    return (time.time() - float(sent)) * 1000 if sent else None
+
+
+class Subscriber:
+    def __init__(self, url: str, token: str, user_id: str, jitter_ms: float = 0.0):
+        self.url = url
+        self.token = token
+        self.user_id = user_id
+        self.topic = f"realtime:notificaciones:{user_id}"
+        self.jitter_ms = jitter_ms
+        self.joined = asyncio.Event()
+        self.join_ms: List[float] = []
+        self.attempts: List[float] = []
+        self.latencies_ms: List[float] = []
+        self.dropped_at: Optional[float] = None
+        self.rejoin_ms: List[float] = []
+        self._connection: Optional[websocket.Connection] = None
+        self._task: Optional[asyncio.Task] = None
+        self._ref = 0
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        if self._connection:
+            self._connection.close()
+
+    def drop(self) -> None:
+        """Close the socket as a network drop would; the subscriber reconnects on its own."""
+        if self._connection:
+            self._connection.close()
+
+    async def _send(self, topic: str, event: str, payload: dict) -> None:
+        self._ref += 1
+        await self._connection.send(json.dumps({"topic": topic, "event": event, "payload": payload,
+                                                "ref": str(self._ref), "join_ref": str(self._ref)}))
+
+    async def _heartbeat(self) -> None:
+        while True:
+            await asyncio.sleep(HEARTBEAT_S)
+            await self._send("phoenix", "heartbeat", {})
+
+    async def _run(self) -> None:
+        tries = 0
+        while True:
+            if tries:
+                delay = RECONNECT_AFTER_MS[min(tries, len(RECONNECT_AFTER_MS)) - 1]
+                await asyncio.sleep((delay + random.uniform(0, self.jitter_ms)) / 1000)
+            self.attempts.append(time.time())
+            start = time.perf_counter()
+            try:
+                self._connection = await websocket.Connection.open(self.url)
+            # EOFError: asyncio.IncompleteReadError when the server closes during the handshake (a restart).
+            except (OSError, asyncio.TimeoutError, EOFError, websocket.ConnectionClosed):
+                tries += 1
+                continue
+            heartbeat = asyncio.create_task(self._heartbeat())
+            try:
+                await self._send(self.topic, "phx_join", {
+                    "config": {"broadcast": {"ack": False, "self": False}, "presence": {"key": ""},
+                               "postgres_changes": CHANGES, "private": False},
+                    "access_token": self.token,
+                })
+                while True:
+                    text = await self._connection.recv()
+                    if text is None:
+                        break
+                    self._on_message(json.loads(text), start)
+                    if self.joined.is_set():
+                        tries = 0
+            except (OSError, ValueError):
+                pass
+            finally:
+                heartbeat.cancel()
+                self._connection.close()
+            tries += 1
+            if self.joined.is_set():
+                self.joined.clear()
+                self.dropped_at = time.perf_counter()
+
+    def _on_message(self, message: dict, connect_start: float) -> None:
+        event = message.get("event")
+        if event == "phx_reply" and message.get("topic") == self.topic and not self.joined.is_set():
+            if (message.get("payload") or {}).get("status") == "ok":
+                now = time.perf_counter()
+                self.join_ms.append((now - connect_start) * 1000)
+                if self.dropped_at is not None:
+                    self.rejoin_ms.append((now - self.dropped_at) * 1000)
+                    self.dropped_at = None
+                self.joined.set()
+        else:
+            latency = delivery_latency_ms(message)
+            if latency is not None:
+                self.latencies_ms.append(latency)
@@ -0,0 +1,211 @@
+"""Per-endpoint response metadata for every page a scenario opens.
+
+``browser.new_context()`` (and ``bench.tcrun`` for the unmodified TC
+scripts) attaches :data:`RESPONSES` to each context. It only listens to
+Playwright's ``response``, ``requestfinished`` and ``requestfailed`` events;
+the only extra driver call is ``Request.sizes()`` once a response finished.
+For every document, fetch and XHR response it records, under a URL template
+and resource type (``GET /dashboard/clientes (document)`` apart from the RSC
+``GET /dashboard/clientes (fetch)``; other origins keep their host, e.g.
+``GET abc.supabase.co/rest/v1/cliente (fetch)``):
+
+* status code, or a failure when the request never got a response,
+* server wait (``responseStart - requestStart``, the TTFB without DNS,
+  connect and TLS) and total time (``responseEnd``),
+* transferred body size (encoded, so compressed and streamed responses
+  count too), falling back to ``Content-Length`` when the driver cannot
+  tell; only responses with neither count as ``unsized``,
+* every ``Server-Timing`` entry with a ``dur``, by metric name.
+
+Sizes resolve in background tasks; the collector waits for them before the
+context closes.
+
+``python -m bench`` adds :meth:`ResponseCollector.summary` to every results
+file as ``responses``; ``bench.tcrun`` children send their samples back
+through :meth:`ResponseCollector.dump` / :meth:`ResponseCollector.merge`.
+Sample lists are reservoir-capped, so soak runs stay bounded.
+"""
+
+import asyncio
+import re
+from collections import Counter
+from typing import Dict, List, Optional, Set
+from urllib.parse import urlsplit
+
+from playwright import async_api
+from playwright.async_api import BrowserContext, Request, Response
+
+from . import config
+from .stats import keep_sample, summarize
+from .vitals import normalize_route
+
+RESOURCE_TYPES = {"document", "fetch", "xhr"}
+SAMPLES = ("wait_ms", "total_ms", "kb")
+_SERVER_TIMING = re.compile(r"^\s*([^;,\s]+)(.*)$")
+_DURATION = re.compile(r";\s*dur\s*=\s*\"?([0-9.]+)", re.I)
+
+
+def parse_server_timing(header: str) -> Dict[str, float]:
+    """``db;dur=12.5;desc="x", app;dur=3`` -> ``{"db": 12.5, "app": 3.0}`` (entries without ``dur`` are skipped)."""
+    timings: Dict[str, float] = {}
+    for entry in header.split(","):
+        match = _SERVER_TIMING.match(entry)
+        duration = _DURATION.search(match.group(2)) if match else None
+        if duration:
+            try:
+                timings[match.group(1)] = timings.get(match.group(1), 0.0) + float(duration.group(1))
+            except ValueError:
+                continue
+    return timings
+
+
+def url_template(method: str, url: str, resource_type: str) -> str:
+    parts = urlsplit(url)
+    path = normalize_route(parts.path)
+    if f"{parts.scheme}://{parts.netloc}" == config.BASE_URL:
+        return f"{method} {path} ({resource_type})"
+    return f"{method} {parts.netloc}{path} ({resource_type})"
+
+
+class Endpoint:
+    def __init__(self):
+        self.status: Counter = Counter()
+        self.failed = 0
+        self.unsized = 0
+        self.samples: Dict[str, List[float]] = {name: [] for name in SAMPLES}
+        self.server_timing: Dict[str, List[float]] = {}
+        self.seen: Counter = Counter()
+
+    def _keep(self, key: str, samples: List[float], value: float) -> None:
+        self.seen[key] += 1
+        keep_sample(samples, value, self.seen[key])
+
+    def add(self, name: str, value: float) -> None:
+        self._keep(name, self.samples[name], value)
+
+    def add_server_timing(self, metric: str, value: float) -> None:
+        self._keep(f"server-timing:{metric}", self.server_timing.setdefault(metric, []), value)
+
+    def dump(self) -> dict:
+        return {"status": dict(self.status), "failed": self.failed, "unsized": self.unsized,
+                "samples": self.samples, "server_timing": self.server_timing}
+
+    def merge(self, dump: dict) -> None:
+        self.status.update({int(code): count for code, count in dump.get("status", {}).items()})
+        self.failed += dump.get("failed", 0)
+        self.unsized += dump.get("unsized", 0)
+        for name, values in dump.get("samples", {}).items():
+            for value in values:
+                self.add(name, value)
+        for name, values in dump.get("server_timing", {}).items():
+            for value in values:
+                self.add_server_timing(name, value)
+
+    def summary(self) -> dict:
+        result = {
+            "count": sum(self.status.values()) + self.failed,
+            "status": {str(code): count for code, count in sorted(self.status.items())},
+            "wait_ms": summarize(self.samples["wait_ms"]),
+            "total_ms": summarize(self.samples["total_ms"]),
+            "kb": summarize(self.samples["kb"]),
+        }
+        if self.failed:
+            result["failed"] = self.failed
+        if self.unsized:
+            result["unsized"] = self.unsized
+        if self.server_timing:
+            result["server_timing"] = {name: summarize(values) for name, values in sorted(self.server_timing.items())}
+        return result
+
+
+class ResponseCollector:
+    def __init__(self):
+        self.endpoints: Dict[str, Endpoint] = {}
+        # Status and Server-Timing wait in here until the request finishes with its timing.
+        self._pending: Dict[Request, tuple] = {}
+        self._sizing: Set[asyncio.Task] = set()
+
+    def attach(self, context: BrowserContext) -> None:
+        context.on("response", self._on_response)
+        context.on("requestfinished", self._on_finished)
+        context.on("requestfailed", self._on_failed)
+        close = context.close
+
+        async def settled_close(*args, **kwargs) -> None:
+            await self.settle()
+            await close(*args, **kwargs)
+
+        context.close = settled_close
+
+    async def settle(self) -> None:
+        """Wait for the sizes still being read from the driver."""
+        if self._sizing:
+            await asyncio.gather(*self._sizing, return_exceptions=True)
+
+    def _endpoint(self, request: Request) -> Endpoint:
+        key = url_template(request.method, request.url, request.resource_type)
+        endpoint = self.endpoints.get(key)
+        if endpoint is None:
+            endpoint = self.endpoints[key] = Endpoint()
+        return endpoint
+
+    def _on_response(self, response: Response) -> None:
+        request = response.request
+        if request.resource_type not in RESOURCE_TYPES or not request.url.startswith("http"):
+            return
+        headers = response.headers
+        length: Optional[str] = headers.get("content-length")
+        self._pending[request] = (response.status, int(length) if length and length.isdigit() else None,
+                                  parse_server_timing(headers.get("server-timing", "")))
+
+    def _on_finished(self, request: Request) -> None:
+        pending = self._pending.pop(request, None)
+        if pending is None:
+            return
+        status, size, server_timing = pending
+        endpoint = self._endpoint(request)
+        endpoint.status[status] += 1
+        timing = request.timing
+        if timing.get("requestStart", -1) >= 0 and timing.get("responseStart", -1) >= 0:
+            endpoint.add("wait_ms", timing["responseStart"] - timing["requestStart"])
+        if timing.get("responseEnd", -1) >= 0:
+            endpoint.add("total_ms", timing["responseEnd"])
+        for name, duration in server_timing.items():
+            endpoint.add_server_timing(name, duration)
+        task = asyncio.ensure_future(self._record_size(endpoint, request, size))
+        self._sizing.add(task)
+        task.add_done_callback(self._sizing.discard)
+
+    @staticmethod
+    async def _record_size(endpoint: Endpoint, request: Request, content_length: Optional[int]) -> None:
+        try:
+            size = (await request.sizes())["responseBodySize"]
+        except async_api.Error:
+            size = None  # context already closed
+        if size is None or size < 0:
+            size = content_length
+        if size is None:
+            endpoint.unsized += 1
+        else:
+            endpoint.add("kb", size / 1024)
+
+    def _on_failed(self, request: Request) -> None:
+        self._pending.pop(request, None)
+        if request.resource_type in RESOURCE_TYPES and request.url.startswith("http"):
+            self._endpoint(request).failed += 1
+
+    def dump(self) -> dict:
+        return {key: endpoint.dump() for key, endpoint in self.endpoints.items()}
+
+    def merge(self, dump: dict) -> None:
+        for key, data in dump.items():
+            self.endpoints.setdefault(key, Endpoint()).merge(data)
+
+    def summary(self) -> dict:
+        return {
+            "responses": sum(sum(e.status.values()) + e.failed for e in self.endpoints.values()),
+            "endpoints": {key: self.endpoints[key].summary() for key in sorted(self.endpoints)},
+        }
+
+
+RESPONSES = ResponseCollector()
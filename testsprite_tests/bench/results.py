@@ -0,0 +1,28 @@
+"""Persist scenario results as JSON under ``tmp/bench/``."""
+
+import json
+import platform
+from datetime import datetime, timezone
+from pathlib import Path
+
+from . import config
+
+
+def write_results(scenario: str, payload: dict) -> Path:
+    """Write ``payload`` for ``scenario`` and return the file path.
+
+    Every file carries the target URL and the run timestamp so results from
+    different machines can be compared side by side.
+    """
+    now = datetime.now(timezone.utc)
+    document = {
+        "scenario": scenario,
+        "base_url": config.BASE_URL,
+        "started_at": now.isoformat(),
+        "host": platform.node(),
+        **payload,
+    }
+    config.RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+    path = config.RESULTS_DIR / f"{scenario}-{now:%Y%m%dT%H%M%SZ}.json"
+    path.write_text(json.dumps(document, indent=2, ensure_ascii=False), encoding="utf-8")
+    return path
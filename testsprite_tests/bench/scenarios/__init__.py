@@ -0,0 +1 @@
+"""Benchmark scenarios. Each module exposes ``add_arguments`` and ``run``."""
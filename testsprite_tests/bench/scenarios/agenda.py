@@ -0,0 +1,233 @@
+"""Agenda at scale (TC017).
+
+Seeds tens of thousands of ``crm.evento`` rows for the benchmark vendedor and
+measures:
+
+* ``/api/agenda/eventos`` latency for month and week range queries,
+* month/week view render time in ``/dashboard/agenda`` (navigation or view
+  switch until the ``obtenerEventos`` server action answers and the browser
+  paints),
+* ``/api/notifications/send-recordatorios`` throughput when thousands of
+  recordatorios fall due in the same minute. The route drains at most 100
+  rows per invocation, so the scenario calls it until the backlog is empty
+  and reports how long the production 5-minute cron would need.
+
+The dispatch step processes *every* due recordatorio in the target database,
+not only the seeded ones; point it at a disposable Supabase project.
+"""
+
+import argparse
+import math
+import random
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from playwright import async_api
+from playwright.async_api import Page
+
+from .. import browser, config
+from ..load import gather_limited, status_counts, timed_request
+from ..stats import stopwatch, summarize
+from ..supabase import SupabaseRest
+
+EVENTO_TIPOS = ("cita", "llamada", "email", "visita", "seguimiento", "recordatorio", "tarea")
+PRIORIDADES = ("baja", "media", "alta", "urgente")
+RANGES = {"mes": 30, "semana": 7}
+CRON_INTERVAL_MINUTES = 5
+DISPATCH_BATCH = 100  # .limit(100) in send-recordatorios/route.ts
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--eventos", type=int, default=20000, help="eventos seeded for the benchmark vendedor")
+    parser.add_argument("--recordatorios", type=int, default=5000, help="recordatorios due in the same minute")
+    parser.add_argument("--span-days", type=int, default=365, help="window the eventos are spread over")
+    parser.add_argument("--queries", type=int, default=100, help="range queries per view kind")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--renders", type=int, default=5, help="render samples per view")
+    parser.add_argument("--seed", type=int, default=17)
+    parser.add_argument("--skip-dispatch", action="store_true", help="do not call send-recordatorios")
+    parser.add_argument("--keep", action="store_true", help="leave seeded rows in place")
+
+
+def _eventos(vendedor_id: str, count: int, span_days: int, tag: str, rng: random.Random):
+    start = datetime.now(timezone.utc) - timedelta(days=span_days // 2)
+    for n in range(count):
+        inicio = start + timedelta(minutes=rng.randrange(span_days * 24 * 60))
+        duracion = rng.choice((15, 30, 60, 90))
+        yield {
+            "titulo": f"Bench evento {n}",
+            "tipo": rng.choice(EVENTO_TIPOS),
+            "prioridad": rng.choice(PRIORIDADES),
+            "fecha_inicio": inicio.isoformat(),
+            "fecha_fin": (inicio + timedelta(minutes=duracion)).isoformat(),
+            "duracion_minutos": duracion,
+            "vendedor_id": vendedor_id,
+            "created_by": vendedor_id,
+            "etiquetas": [tag],
+        }
+
+
+def _recordatorios(vendedor_id: str, count: int, tag: str):
+    due = datetime.now(timezone.utc).replace(second=0, microsecond=0) - timedelta(minutes=1)
+    for n in range(count):
+        yield {
+            "titulo": f"Bench recordatorio {n}",
+            "tipo": "personalizado",
+            "fecha_recordatorio": due.isoformat(),
+            "vendedor_id": vendedor_id,
+            "created_by": vendedor_id,
+            "notificar_push": False,
+            "etiquetas": [tag],
+            "data": {"bench_run": tag},
+        }
+
+
+async def _range_queries(request, args, rng: random.Random) -> dict:
+    now = datetime.now(timezone.utc)
+    results = {}
+    for vista, days in RANGES.items():
+        windows = []
+        for _ in range(args.queries):
+            inicio = now + timedelta(days=rng.randint(-args.span_days // 2, args.span_days // 2 - days))
+            windows.append((inicio, inicio + timedelta(days=days)))
+        samples = await gather_limited(
+            [
+                lambda w=w: timed_request(
+                    request, "GET", "/api/agenda/eventos",
+                    params={"inicio": w[0].isoformat(), "fin": w[1].isoformat()},
+                )
+                for w in windows
+            ],
+            args.concurrency,
+        )
+        results[vista] = {
+            "latency_ms": summarize(s.ms for s in samples),
+            "bytes": summarize(s.size for s in samples),
+            "status": status_counts(samples),
+        }
+    return results
+
+
+def _is_server_action(response: async_api.Response) -> bool:
+    return response.request.method == "POST" and "next-action" in response.request.headers
+
+
+async def _painted(page: Page) -> None:
+    await page.evaluate("() => new Promise(r => requestAnimationFrame(() => requestAnimationFrame(r)))")
+
+
+async def _render_samples(page: Page, renders: int) -> dict:
+    samples = {"carga_inicial": [], "mes": [], "semana": []}
+    for _ in range(renders):
+        with stopwatch() as t:
+            async with page.expect_response(_is_server_action, timeout=60000):
+                await page.goto("/dashboard/agenda", wait_until="commit", timeout=60000)
+            await _painted(page)
+        samples["carga_inicial"].append(t["ms"])
+        await browser.dismiss_novedades(page)
+
+        for vista, label in (("semana", "Semana"), ("mes", "Mes")):
+            button = page.get_by_role("button", name=label).last
+            with stopwatch() as t:
+                async with page.expect_response(_is_server_action, timeout=60000):
+                    await button.click()
+                await _painted(page)
+            samples[vista].append(t["ms"])
+    return {name: summarize(values) for name, values in samples.items()}
+
+
+async def _dispatch(request, expected: int, already_due: int) -> dict:
+    if not config.CRON_SECRET:
+        raise RuntimeError("send-recordatorios requires CRON_SECRET")
+    headers = {"Authorization": f"Bearer {config.CRON_SECRET}"}
+    calls, processed, failures = [], 0, 0
+    drained = False
+    # The route drains every due recordatorio, DISPATCH_BATCH per call; one extra call sees the empty queue.
+    max_calls = math.ceil((expected + already_due) / DISPATCH_BATCH) + 1
+    with stopwatch() as total:
+        while len(calls) < max_calls:
+            with stopwatch() as t:
+                response = await request.post("/api/notifications/send-recordatorios", headers=headers)
+                if response.status >= 400:
+                    raise RuntimeError(f"send-recordatorios -> {response.status}: {(await response.text())[:300]}")
+                body = await response.json()
+            calls.append(t["ms"])
+            batch = body.get("processed", 0)
+            processed += batch
+            failures += len(body.get("failures", []))
+            if batch == 0:
+                drained = True
+                break
+            if body.get("inApp", 0) == 0:
+                # Nothing was marked enviado (e.g. the notificacion insert failed): the next
+                # call would return the same batch forever.
+                break
+    batches = max(len(calls) - 1, 0)
+    seconds = total["ms"] / 1000
+    return {
+        "seeded": expected,
+        "already_due": already_due,
+        "processed": processed,
+        "failures": failures,
+        "stalled": not drained,
+        "invocations": len(calls),
+        "invocation_ms": summarize(calls),
+        "drain_seconds": round(seconds, 2),
+        "recordatorios_per_second": round(processed / seconds, 1) if seconds else 0.0,
+        "cron_drain_minutes": batches * CRON_INTERVAL_MINUTES,
+    }
+
+
+async def run(args: argparse.Namespace) -> dict:
+    rng = random.Random(args.seed)
+    tag = f"bench-{uuid.uuid4().hex[:8]}"
+    result: dict = {"run_tag": tag, "eventos": args.eventos, "recordatorios": args.recordatorios}
+
+    async with async_api.async_playwright() as pw:
+        rest = await SupabaseRest.open(pw)
+        try:
+            perfiles = await rest.select("usuario_perfil", {"select": "id", "dni": f"eq.{config.VENDEDOR_DNI}"})
+            if not perfiles:
+                raise RuntimeError(f"No usuario_perfil with DNI {config.VENDEDOR_DNI}")
+            vendedor_id = perfiles[0]["id"]
+
+            with stopwatch() as t:
+                await rest.insert("evento", _eventos(vendedor_id, args.eventos, args.span_days, tag, rng))
+            result["seed_eventos_seconds"] = round(t["ms"] / 1000, 2)
+
+            chromium = await browser.launch(pw)
+            try:
+                state = await browser.storage_state(chromium, "vendedor")
+                request = await browser.api_context(pw, state)
+                try:
+                    result["range_queries"] = await _range_queries(request, args, rng)
+                finally:
+                    await request.dispose()
+
+                context = await browser.new_context(chromium, state)
+                try:
+                    result["render_ms"] = await _render_samples(await context.new_page(), args.renders)
+                finally:
+                    await context.close()
+            finally:
+                await chromium.close()
+
+            if not args.skip_dispatch:
+                already_due = await rest.count("recordatorio", {
+                    "completado": "is.false", "enviado": "is.false",
+                    "fecha_recordatorio": f"lte.{datetime.now(timezone.utc).isoformat()}",
+                })
+                await rest.insert("recordatorio", _recordatorios(vendedor_id, args.recordatorios, tag))
+                request = await browser.api_context(pw)
+                try:
+                    result["dispatch"] = await _dispatch(request, args.recordatorios, already_due)
+                    result["failed"] = result["dispatch"]["stalled"]
+                finally:
+                    await request.dispose()
+        finally:
+            if not args.keep:
+                await rest.delete("notificacion", {"data->>bench_run": f"eq.{tag}"})
+                await rest.delete("recordatorio", {"etiquetas": f"cs.{{{tag}}}"})
+                await rest.delete("evento", {"etiquetas": f"cs.{{{tag}}}"})
+            await rest.close()
+    return result
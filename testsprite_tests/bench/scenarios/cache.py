@@ -0,0 +1,71 @@
+"""Dashboard and client-search latency labelled cold or warm (TC020).
+
+Replays TC020's steps (dashboard, clientes list, simple and complex client
+searches, proyectos, pipeline) for ``--rounds`` rounds in one logged-in
+browser page. Each step is wrapped in a ``bench.cachestats`` probe, so every
+sample carries the ``cache.server.ts`` loaders it ran and a cold/warm label.
+
+Start the app with ``CACHE_TELEMETRY=1``; without it every label is
+``unknown``. ``--reset`` clears the server counters first (first-run
+tracking included, so round one is cold again without restarting).
+"""
+
+import argparse
+import time
+from collections import defaultdict
+from typing import Dict, List
+
+from playwright import async_api
+
+from .. import browser
+from ..cachestats import CacheProbe
+from ..stats import summarize
+
+STEPS = (
+    ("dashboard", "/dashboard"),
+    ("clientes", "/dashboard/clientes"),
+    ("busqueda_simple", "/dashboard/clientes?q=Cliente"),
+    ("busqueda_compleja", "/dashboard/clientes?q=Cliente&estado=activo&sortBy=nombre&sortOrder=asc&page=2"),
+    ("proyectos", "/dashboard/proyectos"),
+    ("pipeline", "/dashboard/pipeline"),
+)
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--reset", action="store_true", help="reset server cache telemetry before the run")
+
+
+async def run(args: argparse.Namespace) -> dict:
+    samples: List[dict] = []
+    async with async_api.async_playwright() as pw:
+        chromium = await browser.launch(pw)
+        try:
+            state = await browser.storage_state(chromium, "admin")
+            request = await browser.api_context(pw, state)
+            context = await browser.new_context(chromium, state)
+            try:
+                probe = CacheProbe(request)
+                await probe.snapshot(reset=args.reset)
+                page = await context.new_page()
+                for round_ in range(args.rounds):
+                    for name, url in STEPS:
+                        async with probe.step() as cache:
+                            start = time.perf_counter()
+                            await page.goto(url, wait_until="load", timeout=60000)
+                            ms = (time.perf_counter() - start) * 1000
+                        samples.append({"round": round_, "step": name, "ms": round(ms, 1), "cache": cache})
+            finally:
+                await context.close()
+                await request.dispose()
+        finally:
+            await chromium.close()
+
+    by_label: Dict[str, Dict[str, List[float]]] = defaultdict(lambda: defaultdict(list))
+    for sample in samples:
+        by_label[sample["step"]][sample["cache"]["label"]].append(sample["ms"])
+    return {
+        "telemetry_enabled": probe.enabled,
+        "steps": {step: {label: summarize(v) for label, v in labels.items()} for step, labels in by_label.items()},
+        "samples": samples,
+    }
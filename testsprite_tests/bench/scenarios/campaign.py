@@ -0,0 +1,165 @@
+"""Campaign fan-out throughput against a local Resend stand-in (TC011).
+
+TC011 stops at template validation. This scenario creates the campaign
+templates in ``crm.marketing_template``, builds client segments of 1k to
+200k recipients and dispatches them with the app's own modules through
+``bench/node/campaign-send.ts``:
+
+* ``whatsapp``: ``renderTemplate`` + ``buildWhatsAppUrl`` from
+  ``src/lib/marketing/whatsapp.ts``. Sending is click-to-chat (wa.me) since
+  the Twilio/Meta integration was removed, so this is the CPU cost of
+  preparing each message.
+* ``email``: ``enviarEmail`` from ``src/lib/services/email.ts`` against
+  ``bench.standins.resend`` with a worker pool and exponential-backoff
+  retries (``--mode pool``), or ``enviarEmailMasivo`` unchanged
+  (``--mode masivo``, sequential with a fixed 50 ms pause).
+
+Reported per channel and segment size: messages/sec, per-message latency,
+attempts, retry overhead, provider-side rate limiting and the driver's
+RSS/heap during the send.
+"""
+
+import argparse
+import json
+import random
+import tempfile
+import uuid
+from pathlib import Path
+
+from playwright import async_api
+
+from .. import config
+from ..stats import summarize
+from ..standins.resend import ProviderProfile, ResendStandIn
+from ..supabase import SupabaseRest
+from ..tsx import run_driver
+
+TEMPLATE_BODY = (
+    "Hola {{nombre}}, te escribimos de AMERSUR.{{#proyecto}} Tenemos novedades de {{proyecto}}.{{/proyecto}}"
+    " Tu asesor es {{vendedor}}. Responde este mensaje para agendar una visita."
+)
+NOMBRES = ("Luis", "María", "José", "Rosa", "Carlos", "Ana", "Jorge", "Carmen", "Miguel", "Lucía")
+APELLIDOS = ("Quispe", "Flores", "Sánchez", "Rodríguez", "García", "Mamani", "Huamán", "Torres")
+PROYECTOS = ("Los Álamos", "Villa Sol", "Las Lomas", "")
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--sizes", default="1000,10000,50000,200000", help="segment sizes")
+    parser.add_argument("--channels", default="whatsapp,email")
+    parser.add_argument("--mode", choices=("pool", "masivo"), default="pool", help="email dispatch path")
+    parser.add_argument("--concurrency", type=int, default=32, help="email workers (pool mode)")
+    parser.add_argument("--retries", type=int, default=3)
+    parser.add_argument("--backoff-ms", type=float, default=200.0)
+    parser.add_argument("--latency-ms", type=float, default=40.0, help="stand-in service time per email")
+    parser.add_argument("--jitter-ms", type=float, default=10.0)
+    parser.add_argument("--provider-rps", type=float, help="stand-in rate limit (429 above it)")
+    parser.add_argument("--error-ratio", type=float, default=0.0, help="share of random 500s")
+    parser.add_argument("--port", type=int, default=0)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--keep", action="store_true", help="keep the templates created by the run")
+
+
+def _write_segment(path: Path, size: int, rng: random.Random) -> None:
+    with path.open("w", encoding="utf-8") as segment:
+        for n in range(size):
+            nombre = f"{rng.choice(NOMBRES)} {rng.choice(APELLIDOS)}"
+            segment.write(json.dumps({
+                "nombre": nombre,
+                "telefono": f"+51 9{rng.randrange(10**7, 10**8)}",
+                "email": f"cliente{n}@bench.amersur.test",
+                "proyecto": rng.choice(PROYECTOS),
+                "vendedor": rng.choice(NOMBRES),
+            }, ensure_ascii=False) + "\n")
+
+
+def _memory(series) -> dict:
+    if not series:
+        return {}
+    return {"start_mb": round(series[0], 1), "peak_mb": round(max(series), 1),
+            "growth_mb": round(max(series) - series[0], 1)}
+
+
+async def _drive(workdir: Path, channel: str, segment: Path, template: dict, args, env: dict) -> dict:
+    out = workdir / f"{channel}-{segment.stem}.out.json"
+    driver_config = workdir / f"{channel}-{segment.stem}.json"
+    driver_config.write_text(json.dumps({
+        "channel": channel,
+        "mode": args.mode if channel == "email" else "pool",
+        "concurrency": args.concurrency if channel == "email" else 1,
+        "retries": args.retries,
+        "backoffMs": args.backoff_ms,
+        "template": template,
+        "recipientsFile": str(segment),
+        "out": str(out),
+    }), encoding="utf-8")
+
+    try:
+        await run_driver("campaign-send.ts", str(driver_config), env=env)
+    except RuntimeError as error:
+        return {"error": str(error)}
+
+    raw = json.loads(out.read_text(encoding="utf-8"))
+    seconds = raw["elapsed_ms"] / 1000
+    return {
+        "sent": raw["sent"],
+        "failed": raw["failed"],
+        "errors": raw["errors"],
+        "seconds": round(seconds, 2),
+        "msgs_per_second": round(raw["sent"] / seconds, 1) if seconds else 0.0,
+        "latency_ms": summarize(raw["latencies_ms"]),
+        "attempts": raw["attempts"],
+        "retried": raw["retried"],
+        "retry_overhead_seconds": round(raw["retry_overhead_ms"] / 1000, 2),
+        "rss": _memory(raw["rss_mb"]),
+        "heap": _memory(raw["heap_mb"]),
+    }
+
+
+async def run(args: argparse.Namespace) -> dict:
+    rng = random.Random(args.seed)
+    tag = f"bench-{uuid.uuid4().hex[:8]}"
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    channels = [c.strip() for c in args.channels.split(",") if c.strip()]
+    result: dict = {"run_tag": tag, "mode": args.mode, "concurrency": args.concurrency, "channels": {}}
+
+    profile = ProviderProfile(args.latency_ms, args.jitter_ms, args.provider_rps, args.error_ratio, args.seed)
+    async with async_api.async_playwright() as pw:
+        rest = await SupabaseRest.open(pw)
+        try:
+            perfiles = await rest.select("usuario_perfil", {"select": "id", "username": f"eq.{config.ADMIN_USERNAME}"})
+            creador = perfiles[0]["id"] if perfiles else None
+            rows = await rest.insert("marketing_template", [{
+                "nombre": f"{tag}-{canal}",
+                "categoria": "bench",
+                "body_texto": TEMPLATE_BODY,
+                "variables": ["nombre", "vendedor"],
+                "tags": [tag],
+                "activo": True,
+                "created_by": creador,
+            } for canal in channels], returning="nombre,body_texto,media_url")
+            templates = {row["nombre"].rsplit("-", 1)[1]: row for row in rows}
+
+            with ResendStandIn(profile, port=args.port) as resend, tempfile.TemporaryDirectory() as tmp:
+                workdir = Path(tmp)
+                env = {"RESEND_BASE_URL": resend.url.rstrip("/"), "RESEND_API_KEY": "re_bench"}
+                for size in sizes:
+                    segment = workdir / f"segment-{size}.jsonl"
+                    _write_segment(segment, size, rng)
+                    for channel in channels:
+                        template = {
+                            "body_texto": templates[channel]["body_texto"],
+                            "media_url": templates[channel].get("media_url"),
+                            "subject": f"AMERSUR - {templates[channel]['nombre']}",
+                        }
+                        resend.counters(reset=True)
+                        stats = await _drive(workdir, channel, segment, template, args, env)
+                        if channel == "email":
+                            stats["provider"] = resend.counters()
+                        result["channels"].setdefault(channel, {})[str(size)] = stats
+                result["provider_peak_in_flight"] = resend.peak_in_flight
+        finally:
+            if not args.keep:
+                await rest.delete("marketing_template", {"tags": f"cs.{{{tag}}}"})
+            await rest.close()
+    result["failed"] = any("error" in stats for sizes_ in result["channels"].values() for stats in sizes_.values())
+    return result
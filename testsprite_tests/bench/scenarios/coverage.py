@@ -0,0 +1,48 @@
+"""Per-route JS/CSS coverage of the TC flows, with byte budgets.
+
+Runs the selected ``TC0xx_*.py`` scripts, unmodified, through
+``bench.tcrun --coverage`` and merges every route visit they make: p50 JS and
+CSS kilobytes present, the share of them that never executed / never matched
+while the route was shown, and the kilobytes of scripts and stylesheets
+transferred for it. Chunks are listed heaviest-unused first, with the routes
+that load them.
+
+The run fails when any route's p50 exceeds its budget (defaults in
+``bench.coverage.DEFAULT_BUDGETS``, overrides in ``BENCH_COVERAGE_BUDGETS``).
+Compare against a production build (``next build && next start``); ``next
+dev`` serves unminified chunks plus HMR code.
+"""
+
+import argparse
+import tempfile
+from pathlib import Path
+from typing import List
+
+from .. import coverage
+from ..tcrun import run_tc, tc_scripts
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--tc", default="", help="comma-separated TC ids, e.g. TC005,TC020 (default: all)")
+    parser.add_argument("--timeout", type=float, default=900.0, help="seconds per TC run")
+
+
+async def run(args: argparse.Namespace) -> dict:
+    scripts = tc_scripts(args.tc)
+    if not scripts:
+        raise RuntimeError(f"no TC scripts match {args.tc!r}")
+
+    windows: List[dict] = []
+    tcs = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for script in scripts:
+            outcome = await run_tc(script, Path(tmp) / f"{script.stem}.json", args.timeout, coverage=True)
+            windows.extend(outcome.get("coverage_windows", []))
+            tcs[script.name.split("_")[0]] = {
+                "passed": bool(outcome.get("passed")),
+                "error": outcome.get("error"),
+                "route_visits": len(outcome.get("coverage_windows", [])),
+            }
+
+    report = coverage.summary(windows)
+    return {"tcs": tcs, **report, "failed": bool(report["budget_failures"])}
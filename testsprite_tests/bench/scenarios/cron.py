@@ -0,0 +1,224 @@
+"""Nightly cron scaling: cobranza and reportes alerts over a growing portfolio.
+
+Seeds clientes, ventas and cuotas (10k to 1M cuotas, ``--cuotas-per-venta``
+monthly installments each, due dates spread over ``--span-months``) and, at
+each size, invokes:
+
+* ``/api/cron/cobranza-alertas`` twice: the first run generates alerts for
+  the new cuotas, the second is the steady-state nightly run (dedup only),
+* ``/api/cron/reportes-alertas`` once, with the active rules' cooldown
+  cleared beforehand and their state restored afterwards.
+
+Reported per invocation: duration, response body, peak RSS of the Next.js
+server (``--server-pid``) and, when the app runs with
+``NEXT_PUBLIC_SUPABASE_URL`` pointing at the counting proxy (``--proxy-port``),
+the Supabase round-trips and bytes per table. The expected number of
+alerts comes from running ``src/lib/cobranza/tiers.ts`` over the seeded
+cuotas (``node/cobranza-tiers.ts``); fewer ``generadas`` than expected means
+the route's single cuota read was truncated by PostgREST's row cap.
+
+Meant for a disposable Supabase project: the crons also process whatever
+cuotas and rules already exist there. A warm-up run before seeding drains
+the pre-existing alerts.
+"""
+
+import argparse
+import json
+import random
+import tempfile
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import List, Optional
+
+from playwright import async_api
+
+from .. import browser, config
+from ..memory import RssSampler
+from ..standins.proxy import CountingProxy
+from ..stats import stopwatch
+from ..supabase import SupabaseRest
+from ..tsx import run_driver
+
+COBRANZA = "/api/cron/cobranza-alertas"
+REPORTES = "/api/cron/reportes-alertas"
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--sizes", default="10000,100000,1000000", help="cumulative cuota counts")
+    parser.add_argument("--cuotas-per-venta", type=int, default=12)
+    parser.add_argument("--span-months", type=int, default=36, help="spread of first due dates")
+    parser.add_argument("--paid-ratio", type=float, default=0.7, help="share of past cuotas already paid")
+    parser.add_argument("--server-pid", type=int, help="Next.js server PID to sample RSS from")
+    parser.add_argument("--proxy-port", type=int,
+                        help="run the counting Supabase proxy here (start the app against it)")
+    parser.add_argument("--skip-reportes", action="store_true")
+    parser.add_argument("--seed", type=int, default=32)
+    parser.add_argument("--keep", action="store_true", help="keep the seeded portfolio")
+
+
+def _add_months(day: date, months: int) -> date:
+    month = day.month - 1 + months
+    year, month = day.year + month // 12, month % 12 + 1
+    return date(year, month, min(day.day, 28))
+
+
+class Portfolio:
+    """Seeds clientes/ventas/cuotas in fixed-size ventas, tagged by e-mail and codigo_venta."""
+
+    def __init__(self, rest: SupabaseRest, tag: str, args, created_by: str, vendedor: str, lote_id: str,
+                 cuotas_file: Path):
+        self.rest, self.tag, self.args = rest, tag, args
+        self.created_by, self.vendedor, self.lote_id = created_by, vendedor, lote_id
+        self.cuotas_file = cuotas_file
+        self.rng = random.Random(args.seed)
+        self.ventas = 0
+        self.cuotas = 0
+
+    async def grow_to(self, size: int) -> float:
+        """Seed until ``size`` cuotas exist; returns the seconds it took."""
+        ventas = max(0, -(-(size - self.cuotas) // self.args.cuotas_per_venta))
+        if not ventas:
+            return 0.0
+        today = datetime.now(timezone.utc).date()
+        start = self.ventas
+        ids = [str(uuid.uuid4()) for _ in range(ventas)]
+        with stopwatch() as t:
+            await self.rest.insert("cliente", ({
+                "id": ids[n],
+                "nombre": f"Cliente {self.tag} {start + n}",
+                "email": f"{self.tag}-{start + n}@bench.amersur.test",
+                "created_by": self.created_by,
+                "vendedor_asignado": self.vendedor,
+            } for n in range(ventas)))
+            await self.rest.insert("venta", ({
+                "id": ids[n],
+                "codigo_venta": f"BX{self.tag[-8:]}{start + n:08d}",
+                "cliente_id": ids[n],
+                "lote_id": self.lote_id,
+                "vendedor_username": self.vendedor,
+                "precio_total": 12000 * self.args.cuotas_per_venta,
+                "forma_pago": "financiado",
+                "numero_cuotas": self.args.cuotas_per_venta,
+                "estado": "en_proceso",
+            } for n in range(ventas)))
+            with self.cuotas_file.open("a", encoding="utf-8") as log:
+                await self.rest.insert("cuota", self._cuotas(ids, today, log), batch_size=5000)
+        self.ventas += ventas
+        return t["ms"] / 1000
+
+    def _cuotas(self, venta_ids: List[str], today: date, log):
+        for venta_id in venta_ids:
+            first = _add_months(today, -self.rng.randrange(self.args.span_months))
+            first += timedelta(days=self.rng.randrange(28))
+            for numero in range(1, self.args.cuotas_per_venta + 1):
+                due = _add_months(first, numero - 1)
+                paid = due < today and self.rng.random() < self.args.paid_ratio
+                row = {"fecha_vencimiento": due.isoformat(), "estado": "pagada" if paid else "pendiente"}
+                log.write(json.dumps(row) + "\n")
+                self.cuotas += 1
+                yield {"venta_id": venta_id, "numero_cuota": numero, "monto_programado": 1000,
+                       "monto_pagado": 1000 if paid else 0, **row}
+
+    async def cleanup(self) -> None:
+        # venta, cuota and alerta_cobranza cascade from cliente.
+        await self.rest.delete("cliente", {"email": f"like.{self.tag}-*"})
+
+
+async def _invoke(request, route: str, args, proxy: Optional[CountingProxy]) -> dict:
+    if proxy:
+        proxy.round_trips(reset=True)
+    async with RssSampler(args.server_pid) as rss:
+        with stopwatch() as t:
+            response = await request.get(route, headers={"Authorization": f"Bearer {config.CRON_SECRET}"})
+            body = await response.json()
+    result = {"status": response.status, "seconds": round(t["ms"] / 1000, 2), "body": body,
+              "server_rss": rss.summary()}
+    if proxy:
+        trips = proxy.round_trips()
+        result["round_trips"] = CountingProxy.total_calls(trips)
+        result["round_trips_by_resource"] = trips
+    return result
+
+
+async def _reportes(request, rest: SupabaseRest, args, proxy) -> dict:
+    reglas = await rest.select("reporte_alerta_regla", {
+        "select": "id,ultimo_disparo_at,ultima_eval_at,ultimo_valor", "activo": "eq.true",
+    })
+    since = datetime.now(timezone.utc).isoformat()
+    await rest.update("reporte_alerta_regla", {"activo": "eq.true"}, {"ultimo_disparo_at": None})
+    try:
+        return await _invoke(request, REPORTES, args, proxy)
+    finally:
+        for regla in reglas:
+            await rest.update("reporte_alerta_regla", {"id": f"eq.{regla.pop('id')}"}, regla)
+        await rest.delete("reporte_alerta_disparo", {"fecha_disparo": f"gte.{since}"})
+        await rest.delete("notificacion", {"titulo": "like.Alerta: *", "created_at": f"gte.{since}"})
+
+
+async def run(args: argparse.Namespace) -> dict:
+    if not config.CRON_SECRET:
+        raise RuntimeError("cron routes require CRON_SECRET")
+    tag = f"bench-{uuid.uuid4().hex[:8]}"
+    sizes = sorted(int(s) for s in args.sizes.split(",") if s.strip())
+    since = datetime.now(timezone.utc).isoformat()
+    result: dict = {"run_tag": tag, "cuotas_per_venta": args.cuotas_per_venta, "sizes": {}}
+
+    proxy = CountingProxy(config.SUPABASE_URL, port=args.proxy_port).start() if args.proxy_port else None
+    async with async_api.async_playwright() as pw:
+        rest = await SupabaseRest.open(pw)
+        request = await browser.api_context(pw, timeout=0)
+        portfolio = None
+        try:
+            perfiles = await rest.select("usuario_perfil", {
+                "select": "id,username", "dni": f"eq.{config.VENDEDOR_DNI}",
+            })
+            lotes = await rest.select("lote", {"select": "id", "limit": "1"})
+            if not perfiles or not lotes:
+                raise RuntimeError("seeding needs the bench vendedor profile and at least one lote")
+
+            result["warmup"] = await _invoke(request, COBRANZA, args, proxy)
+            with tempfile.TemporaryDirectory() as tmp:
+                cuotas_file = Path(tmp) / "cuotas.jsonl"
+                portfolio = Portfolio(rest, tag, args, perfiles[0]["id"], perfiles[0]["username"],
+                                      lotes[0]["id"], cuotas_file)
+                previous_alertas = 0
+                for size in sizes:
+                    entry: dict = {"seed_seconds": round(await portfolio.grow_to(size), 2),
+                                   "cuotas": portfolio.cuotas, "ventas": portfolio.ventas}
+                    tiers_out = Path(tmp) / "tiers.json"
+                    await run_driver("cobranza-tiers.ts", str(cuotas_file), str(tiers_out))
+                    expected = json.loads(tiers_out.read_text(encoding="utf-8"))
+                    entry["tiers"] = {k: expected[k] for k in ("tiers", "alertas", "ns_per_cuota")}
+
+                    first = await _invoke(request, COBRANZA, args, proxy)
+                    entry["cobranza_first"] = first
+                    entry["cobranza_steady"] = await _invoke(request, COBRANZA, args, proxy)
+                    # Older cuotas keep the tier they had earlier today, so only
+                    # the ones added at this size should produce new alerts.
+                    nuevas = expected["alertas"] - previous_alertas
+                    previous_alertas = expected["alertas"]
+                    generadas = first["body"].get("generadas", 0)
+                    entry["expected_new_alerts"] = nuevas
+                    entry["alert_coverage"] = round(generadas / nuevas, 3) if nuevas else None
+                    entry["truncated"] = generadas < nuevas
+                    if not args.skip_reportes:
+                        entry["reportes"] = await _reportes(request, rest, args, proxy)
+                    result["sizes"][str(size)] = entry
+        finally:
+            await request.dispose()
+            if not args.keep:
+                await rest.delete("notificacion", {
+                    "titulo": "like.Alerta de cobranza:*", "created_at": f"gte.{since}",
+                })
+                if portfolio:
+                    await portfolio.cleanup()
+            await rest.close()
+            if proxy:
+                proxy.stop()
+    result["failed"] = any(
+        inv.get("status", 200) >= 400
+        for entry in result["sizes"].values()
+        for inv in (entry.get("cobranza_first", {}), entry.get("cobranza_steady", {}), entry.get("reportes", {}))
+    )
+    return result
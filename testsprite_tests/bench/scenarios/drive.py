@@ -0,0 +1,185 @@
+"""Google Drive sync at scale without a Google account (TC018).
+
+Serves a synthetic Drive (10 to 100,000 files in nested folders) from
+``bench.standins.drive`` and measures the app routes that wrap
+``src/lib/google-drive/client.ts``:
+
+* ``POST /api/google-drive/sync`` duration, files persisted and Drive pages
+  requested,
+* ``/files``, ``/folders`` and ``/search`` latency (``source=drive``) with the
+  number of Drive calls behind each request,
+* ``/download/[fileId]`` for large files: TTFB, throughput and, with
+  ``--server-pid``, the growth of the Next.js process RSS while streaming.
+
+The app must be started with ``GOOGLE_DRIVE_API_ROOT_URL=http://127.0.0.1:<port>/``
+(and any non-empty ``GOOGLE_DRIVE_CLIENT_ID/SECRET/REDIRECT_URI``). The
+scenario registers its own active ``google_drive_sync_config`` row for the
+duration of the run.
+"""
+
+import argparse
+import asyncio
+import http.client
+import random
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from urllib.parse import quote, urlsplit
+
+from playwright import async_api
+
+from .. import browser, config
+from ..load import gather_limited, status_counts, timed_request
+from ..memory import RssSampler
+from ..standins.drive import FOLDER_MIME, DriveStandIn, DriveTree
+from ..stats import stopwatch, summarize
+from ..supabase import SupabaseRest
+
+SEARCH_TERMS = ("cliente 1", "Documento 00", "pdf", "contrato", "cliente 42")
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--files", default="10,1000,10000,100000",
+                        help="comma separated Drive sizes to benchmark")
+    parser.add_argument("--depth", type=int, default=4)
+    parser.add_argument("--fanout", type=int, default=6)
+    parser.add_argument("--port", type=int, default=8911, help="port in GOOGLE_DRIVE_API_ROOT_URL")
+    parser.add_argument("--queries", type=int, default=30, help="requests per listing endpoint")
+    parser.add_argument("--concurrency", type=int, default=5)
+    parser.add_argument("--download-mb", default="50,200", help="sizes of the large download files")
+    parser.add_argument("--server-pid", type=int, help="Next.js server PID to sample RSS from")
+    parser.add_argument("--full-sync", action="store_true",
+                        help="use fullSync (deletes every google_drive documento first)")
+    parser.add_argument("--seed", type=int, default=18)
+    parser.add_argument("--keep", action="store_true")
+
+
+async def _endpoint(request, counters, urls, concurrency: int) -> dict:
+    counters(reset=True)
+    samples = await gather_limited(
+        [lambda u=u: timed_request(request, "GET", u) for u in urls], concurrency
+    )
+    drive_calls = counters(reset=True)
+    return {
+        "latency_ms": summarize(s.ms for s in samples),
+        "bytes": summarize(s.size for s in samples),
+        "status": status_counts(samples),
+        "drive_calls_per_request": {
+            k: round(v / len(samples), 2) for k, v in drive_calls.items()
+        } if samples else {},
+    }
+
+
+def _stream_download(path: str, cookie: str) -> dict:
+    """Read the whole body in 64 KiB chunks; returns TTFB and throughput."""
+    target = urlsplit(config.BASE_URL)
+    conn_cls = http.client.HTTPSConnection if target.scheme == "https" else http.client.HTTPConnection
+    conn = conn_cls(target.netloc, timeout=600)
+    start = time.perf_counter()
+    conn.request("GET", path, headers={"Cookie": cookie})
+    response = conn.getresponse()
+    ttfb = time.perf_counter() - start
+    received = 0
+    while True:
+        chunk = response.read(64 * 1024)
+        if not chunk:
+            break
+        received += len(chunk)
+    total = time.perf_counter() - start
+    conn.close()
+    return {
+        "status": response.status,
+        "bytes": received,
+        "ttfb_ms": round(ttfb * 1000, 1),
+        "total_ms": round(total * 1000, 1),
+        "mb_per_second": round(received / 1024 / 1024 / total, 1) if total else 0.0,
+    }
+
+
+async def _size_run(request, state, tree: DriveTree, args, rng: random.Random) -> dict:
+    folders = [m["id"] for m in tree.files.values() if m["mimeType"] == FOLDER_MIME]
+    result: dict = {"files": sum(1 for m in tree.files.values() if m["mimeType"] != FOLDER_MIME),
+                    "folders": len(folders)}
+    with DriveStandIn(tree, port=args.port) as drive:
+        drive.counters(reset=True)
+        with stopwatch() as t:
+            response = await request.post("/api/google-drive/sync", data={"fullSync": args.full_sync})
+            body = await response.json()
+        result["sync"] = {
+            "status": response.status,
+            "ms": round(t["ms"], 1),
+            "stats": body.get("stats"),
+            "drive_calls": drive.counters(reset=True),
+        }
+
+        def pick(n):
+            return [rng.choice(folders) for _ in range(n)] if folders else ["root"] * n
+
+        result["files_endpoint"] = await _endpoint(
+            request, drive.counters,
+            [f"/api/google-drive/files?source=drive&pageSize=100&folderId={f}" for f in pick(args.queries)],
+            args.concurrency,
+        )
+        result["folders_endpoint"] = await _endpoint(
+            request, drive.counters,
+            [f"/api/google-drive/folders?source=drive&parentFolderId={f}" for f in pick(args.queries)],
+            args.concurrency,
+        )
+        result["search_endpoint"] = await _endpoint(
+            request, drive.counters,
+            [f"/api/google-drive/search?q={quote(rng.choice(SEARCH_TERMS))}" for _ in range(args.queries)],
+            args.concurrency,
+        )
+
+        downloads = []
+        cookie = browser.cookie_header(state)
+        for meta in (m for m in list(tree.files.values()) if m["name"].startswith("Plano grande")):
+            async with RssSampler(args.server_pid) as rss:
+                stats = await asyncio.to_thread(
+                    _stream_download, f"/api/google-drive/download/{meta['id']}", cookie
+                )
+            downloads.append({"name": meta["name"], "size": int(meta["size"]), **stats,
+                              "server_rss": rss.summary()})
+        result["downloads"] = downloads
+    return result
+
+
+async def run(args: argparse.Namespace) -> dict:
+    rng = random.Random(args.seed)
+    tag = f"bench-{uuid.uuid4().hex[:8]}"
+    sizes = [int(v) for v in args.files.split(",") if v.strip()]
+    large = [int(v) for v in args.download_mb.split(",") if v.strip()]
+    result: dict = {"run_tag": tag, "stand_in": f"http://127.0.0.1:{args.port}/", "sizes": {}}
+
+    async with async_api.async_playwright() as pw:
+        rest = await SupabaseRest.open(pw)
+        now = datetime.now(timezone.utc)
+        [sync_config] = await rest.insert("google_drive_sync_config", [{
+            "nombre": f"Benchmark {tag}",
+            "access_token": "bench-token",
+            "token_expires_at": (now + timedelta(days=1)).isoformat(),
+            "root_folder_id": "root",
+            "activo": True,
+            "updated_at": now.isoformat(),
+        }], returning="id")
+        try:
+            chromium = await browser.launch(pw)
+            try:
+                state = await browser.storage_state(chromium, "admin")
+            finally:
+                await chromium.close()
+            request = await browser.api_context(pw, state, timeout=600_000)
+            try:
+                for size in sizes:
+                    tree = DriveTree.generate(size, args.depth, args.fanout, args.seed,
+                                              prefix=f"{tag}-{size}", large_files_mb=large)
+                    result["sizes"][str(size)] = await _size_run(request, state, tree, args, rng)
+            finally:
+                await request.dispose()
+        finally:
+            await rest.delete("google_drive_sync_config", {"id": f"eq.{sync_config['id']}"})
+            if not args.keep:
+                await rest.delete("documento", {"google_drive_file_id": f"like.{tag}*"})
+                await rest.delete("carpeta_documento", {"google_drive_folder_id": f"like.{tag}*"})
+            await rest.close()
+    return result
@@ -0,0 +1,56 @@
+"""Compile the TC plan into flows and run them in the shared parallel runner.
+
+``bench.compiler`` maps every case of ``testsprite_frontend_test_plan.json``
+onto the ``bench.actions`` library, reusing cached flows whose step list and
+library are unchanged. Fully mapped cases (or, with ``--partial``, every case
+with at least one mapped step) then run through ``bench.flows`` on one
+browser, ``--workers`` at a time, with step checkpoints and retries.
+
+The report lists, per case, the content hash, whether it was recompiled and
+the plan steps no action covers, so drift between the plan and what is
+actually exercised is visible.
+"""
+
+import argparse
+
+from playwright import async_api
+
+from .. import browser, compiler
+from ..flows import run_flows
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--tc", default="", help="comma-separated TC ids (default: all)")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--retries", type=int, default=1)
+    parser.add_argument("--partial", action="store_true", help="also run cases with unmapped steps, skipping them")
+    parser.add_argument("--recompile", action="store_true", help="ignore the flow cache")
+    parser.add_argument("--compile-only", action="store_true")
+
+
+async def run(args: argparse.Namespace) -> dict:
+    wanted = {tc.strip().upper() for tc in args.tc.split(",") if tc.strip()}
+    compiled = [c for c in compiler.compile_plan(force=args.recompile) if not wanted or c["id"] in wanted]
+    runnable = [c for c in compiled
+                if (not c["unmapped"] or args.partial) and len(c["unmapped"]) < len(c["steps"])]
+    result: dict = {
+        "compiled": {
+            c["id"]: {"hash": c["hash"], "cached": c["cached"], "steps": len(c["steps"]), "unmapped": c["unmapped"]}
+            for c in compiled
+        },
+        "recompiled": sorted(c["id"] for c in compiled if not c["cached"]),
+        "runnable": [c["id"] for c in runnable],
+    }
+    if args.compile_only or not runnable:
+        return result
+
+    async with async_api.async_playwright() as pw:
+        chromium = await browser.launch(pw)
+        try:
+            runs = await run_flows(chromium, [compiler.to_flow(c) for c in runnable],
+                                   workers=args.workers, retries=args.retries)
+        finally:
+            await chromium.close()
+    result["runs"] = runs
+    result["failed"] = any(not r["passed"] for r in runs.values())
+    return result
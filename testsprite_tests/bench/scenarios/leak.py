@@ -0,0 +1,183 @@
+"""Long-session memory soak of the dashboard SPA.
+
+One logged-in page loops through the sidebar the way the TC scripts do
+(Clientes, Proyectos, Agenda, Reportes) for ``--minutes``, never reloading,
+like a vendedor who keeps the CRM open all day. Every ``--sample-every``
+laps, after each route has rendered, the page is garbage-collected and
+sampled over CDP: JS heap in use, DOM nodes, documents, JS event listeners
+and, where Chromium supports ``DOM.getDetachedDomNodes``, detached nodes.
+
+A route is flagged when a metric keeps growing across laps: a positive
+least-squares slope, at least ``--monotonic`` of the lap-to-lap deltas
+increasing, and total growth above a noise floor. For the worst flagged
+route (steepest heap slope) two heap snapshots are written next to the
+results, ``--snapshot-laps`` laps apart, ready for DevTools' comparison view.
+"""
+
+import argparse
+import time
+import uuid
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+from playwright import async_api
+from playwright.async_api import CDPSession, Page
+
+from .. import browser, config
+from ..stats import summarize
+
+SIDEBAR = '[data-sidebar="sidebar"] a[href="{href}"]'
+ROUTES = {
+    "admin": ("/dashboard/clientes", "/dashboard/proyectos", "/dashboard/agenda", "/dashboard/admin/reportes"),
+    "vendedor": ("/dashboard/clientes", "/dashboard/proyectos", "/dashboard/agenda", "/dashboard/vendedor/reportes"),
+}
+METRICS = ("heap_mb", "nodes", "listeners", "detached")
+# Growth below these is GC/render noise, not a leak.
+NOISE_FLOOR = {"heap_mb": 1.0, "nodes": 500, "listeners": 50, "detached": 50}
+
+
+def _positive_int(value: str) -> int:
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be >= 1, got {number}")
+    return number
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--minutes", type=float, default=60.0, help="soak duration")
+    parser.add_argument("--role", choices=browser.ROLES, default="vendedor")
+    parser.add_argument("--routes", help="comma-separated sidebar hrefs (default: the role's four TC routes)")
+    parser.add_argument("--sample-every", type=_positive_int, default=1, help="laps between CDP samples")
+    parser.add_argument("--monotonic", type=float, default=0.8,
+                        help="share of increasing lap-to-lap deltas to call growth monotonic")
+    parser.add_argument("--min-heap-mb", type=float, default=NOISE_FLOOR["heap_mb"])
+    parser.add_argument("--snapshot-laps", type=int, default=5, help="laps between the two heap snapshots")
+    parser.add_argument("--no-snapshots", action="store_true")
+
+
+async def _visit(page: Page, href: str) -> float:
+    start = time.perf_counter()
+    await page.locator(SIDEBAR.format(href=href)).first.click()
+    await page.wait_for_url(f"**{href}", timeout=30000)
+    await page.wait_for_load_state("networkidle", timeout=30000)
+    return (time.perf_counter() - start) * 1000
+
+
+async def _sample(cdp: CDPSession) -> dict:
+    await cdp.send("HeapProfiler.collectGarbage")
+    heap = await cdp.send("Runtime.getHeapUsage")
+    counters = await cdp.send("Memory.getDOMCounters")
+    try:
+        detached: Optional[int] = len((await cdp.send("DOM.getDetachedDomNodes"))["detachedNodes"])
+    except async_api.Error:
+        detached = None
+    return {
+        "heap_mb": round(heap["usedSize"] / 1024 / 1024, 2),
+        "nodes": counters["nodes"],
+        "documents": counters["documents"],
+        "listeners": counters["jsEventListeners"],
+        "detached": detached,
+    }
+
+
+def _trend(values: List[float], floor: float, monotonic: float) -> dict:
+    n = len(values)
+    mean_x, mean_y = (n - 1) / 2, sum(values) / n
+    var_x = sum((x - mean_x) ** 2 for x in range(n))
+    slope = sum((x - mean_x) * (y - mean_y) for x, y in enumerate(values)) / var_x if var_x else 0.0
+    deltas = [b - a for a, b in zip(values, values[1:])]
+    increasing = sum(d > 0 for d in deltas) / len(deltas) if deltas else 0.0
+    growth = values[-1] - values[0]
+    return {
+        "first": values[0],
+        "last": values[-1],
+        "growth": round(growth, 2),
+        "slope_per_sample": round(slope, 3),
+        "increasing_ratio": round(increasing, 2),
+        "leaking": n >= 3 and slope > 0 and increasing >= monotonic and growth >= floor,
+    }
+
+
+async def _heap_snapshot(cdp: CDPSession, path) -> str:
+    chunks: List[str] = []
+
+    def on_chunk(event: dict) -> None:
+        chunks.append(event["chunk"])
+
+    cdp.on("HeapProfiler.addHeapSnapshotChunk", on_chunk)
+    try:
+        await cdp.send("HeapProfiler.collectGarbage")
+        await cdp.send("HeapProfiler.takeHeapSnapshot", {"reportProgress": False})
+    finally:
+        cdp.remove_listener("HeapProfiler.addHeapSnapshotChunk", on_chunk)
+    path.write_text("".join(chunks), encoding="utf-8")
+    return str(path)
+
+
+async def run(args: argparse.Namespace) -> dict:
+    routes = tuple(r.strip() for r in args.routes.split(",")) if args.routes else ROUTES[args.role]
+    floors = {**NOISE_FLOOR, "heap_mb": args.min_heap_mb}
+    samples: Dict[str, List[dict]] = defaultdict(list)
+    nav_ms: Dict[str, List[float]] = defaultdict(list)
+    result: dict = {"role": args.role, "routes": list(routes), "minutes": args.minutes}
+
+    async with async_api.async_playwright() as pw:
+        chromium = await browser.launch(pw)
+        try:
+            state = await browser.storage_state(chromium, args.role)
+            context = await browser.new_context(chromium, state)
+            try:
+                page = await context.new_page()
+                cdp = await context.new_cdp_session(page)
+                await cdp.send("HeapProfiler.enable")
+                await page.goto("/dashboard", wait_until="domcontentloaded", timeout=60000)
+                await browser.dismiss_novedades(page)
+
+                started = time.monotonic()
+                deadline = started + args.minutes * 60
+                lap = 0
+                while time.monotonic() < deadline:
+                    sampling = lap % args.sample_every == 0
+                    for href in routes:
+                        nav_ms[href].append(await _visit(page, href))
+                        if sampling:
+                            sample = await _sample(cdp)
+                            samples[href].append({"lap": lap, "t": round(time.monotonic() - started), **sample})
+                    lap += 1
+                result["laps"] = lap
+
+                trends = {
+                    href: {
+                        metric: _trend([s[metric] for s in series], floors[metric], args.monotonic)
+                        for metric in METRICS if series and series[0][metric] is not None
+                    }
+                    for href, series in samples.items()
+                }
+                flagged = [href for href, t in trends.items() if any(m["leaking"] for m in t.values())]
+                result["flagged"] = flagged
+                result["trends"] = trends
+
+                if flagged and not args.no_snapshots:
+                    worst = max(flagged, key=lambda href: trends[href]["heap_mb"]["slope_per_sample"])
+                    out_dir = config.RESULTS_DIR / f"leak-{uuid.uuid4().hex[:8]}"
+                    out_dir.mkdir(parents=True, exist_ok=True)
+                    name = worst.strip("/").replace("/", "_")
+                    await _visit(page, worst)
+                    before = await _heap_snapshot(cdp, out_dir / f"{name}-1.heapsnapshot")
+                    for _ in range(args.snapshot_laps):
+                        for href in routes:
+                            await _visit(page, href)
+                    await _visit(page, worst)
+                    after = await _heap_snapshot(cdp, out_dir / f"{name}-2.heapsnapshot")
+                    result["worst"] = {"route": worst, "heap_snapshots": [before, after]}
+            finally:
+                await context.close()
+        finally:
+            await chromium.close()
+
+    result["navigation_ms"] = {
+        href: {"first_lap": round(values[0], 1), "all": summarize(values)} for href, values in nav_ms.items()
+    }
+    result["samples"] = samples
+    result["failed"] = bool(result.get("flagged"))
+    return result
@@ -0,0 +1,272 @@
+"""Login storm and audit-write amplification (TC001-TC003).
+
+Fires a mixed open-loop stream of login attempts at ``/api/auth/login-username``
+and ``/api/auth/login-dni`` (valid, wrong password, unknown identifier and
+deactivated account) and reports:
+
+* latency percentiles per endpoint and attempt kind (p99 included),
+* rate-limiter behaviour: 429 share, when the first 429 appeared and how
+  attempts spread over ``--ips`` client addresses (sent as
+  ``X-Forwarded-For``, which ``extractRequestMetadata`` trusts),
+* rows written per attempt in ``crm.login_audit`` (``src/lib/loginAudit.ts``),
+  security notifications created for admins (from the bench IPs) and
+  ``crm.auditoria_usuarios`` rows (``src/lib/auditoria-usuarios.ts``) about
+  the accounts the storm logs in as.
+
+With ``--full-flow`` each attempt also replays what ``_LoginForm.tsx`` does
+after the lookup: ``signInWithPassword`` against Supabase Auth and the
+``/api/auth/login-audit`` report, which is where wrong passwords are caught.
+
+Valid vendedor logins revoke that vendedor's other sessions
+(``login-dni`` calls ``/logout`` on success), so the cached vendedor storage
+state is discarded at the end of the run.
+"""
+
+import argparse
+import asyncio
+import random
+import time
+import uuid
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from playwright import async_api
+
+from .. import browser, config
+from ..stats import summarize
+from ..supabase import SupabaseRest
+
+SECURITY_ALERT_TITLE = "Alerta de seguridad: intentos de login"
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--rate", type=float, default=50.0, help="attempts per second")
+    parser.add_argument("--duration", type=float, default=60.0, help="seconds of arrivals")
+    parser.add_argument("--mix", default="valid=0.6,wrong_password=0.2,unknown=0.1,deactivated=0.1")
+    parser.add_argument("--endpoints", default="username,dni", help="username and/or dni")
+    parser.add_argument("--ips", type=int, default=200, help="distinct client IPs (1 = single NAT)")
+    parser.add_argument("--full-flow", action="store_true",
+                        help="also call Supabase Auth and /api/auth/login-audit like the login form")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--keep", action="store_true", help="keep login_audit rows written by the run")
+
+
+def _identities() -> Dict[str, Dict[str, Optional[tuple]]]:
+    """kind -> endpoint -> (identifier, password); None when unavailable."""
+    return {
+        "valid": {
+            "username": (config.ADMIN_USERNAME, config.ADMIN_PASSWORD),
+            "dni": (config.VENDEDOR_DNI, config.VENDEDOR_PASSWORD),
+        },
+        "wrong_password": {
+            "username": (config.ADMIN_USERNAME, "bench-wrong-password"),
+            "dni": (config.VENDEDOR_DNI, "bench-wrong-password"),
+        },
+        "unknown": {
+            "username": None,  # generated per attempt
+            "dni": None,
+        },
+        "deactivated": {
+            "username": (config.DEACTIVATED_USERNAME, "bench-password") if config.DEACTIVATED_USERNAME else None,
+            "dni": (config.DEACTIVATED_DNI, "bench-password") if config.DEACTIVATED_DNI else None,
+        },
+    }
+
+
+class Attempt:
+    __slots__ = ("kind", "endpoint", "ip", "at", "status", "ms", "auth_ms", "audit_ms", "error")
+
+    def __init__(self, kind: str, endpoint: str, ip: str, at: float):
+        self.kind, self.endpoint, self.ip, self.at = kind, endpoint, ip, at
+        self.status = 0
+        self.ms = self.auth_ms = self.audit_ms = None
+        self.error = None
+
+
+async def _attempt(request, auth, attempt: Attempt, identifier: str, password: str,
+                   user_agent: str, full_flow: bool) -> None:
+    headers = {"X-Forwarded-For": attempt.ip, "User-Agent": user_agent}
+    path, body = (
+        ("/api/auth/login-username", {"username": identifier, "password": password})
+        if attempt.endpoint == "username"
+        else ("/api/auth/login-dni", {"dni": identifier, "password": password})
+    )
+    try:
+        start = time.perf_counter()
+        response = await request.post(path, data=body, headers=headers)
+        attempt.ms = (time.perf_counter() - start) * 1000
+        attempt.status = response.status
+        try:
+            payload = await response.json()
+        except ValueError:
+            # An HTML error or rate-limit page: the attempt counts, its flow stops here.
+            attempt.error = f"non-JSON {response.status} response"
+            return
+        if not full_flow:
+            return
+
+        success, message = False, payload.get("error", "lookup_failed")
+        if response.ok and payload.get("email"):
+            start = time.perf_counter()
+            token = await auth.post("token?grant_type=password",
+                                    data={"email": payload["email"], "password": password})
+            attempt.auth_ms = (time.perf_counter() - start) * 1000
+            success, message = token.ok, None if token.ok else "password_mismatch"
+        start = time.perf_counter()
+        await request.post("/api/auth/login-audit", headers=headers, data={
+            "identifier": identifier,
+            "loginType": "admin" if attempt.endpoint == "username" else "vendedor",
+            "success": success,
+            "errorMessage": message,
+            "stage": "authentication",
+            "metadata": {"source": "login_form"},
+        })
+        attempt.audit_ms = (time.perf_counter() - start) * 1000
+    except async_api.Error as error:
+        attempt.error = str(error).splitlines()[0]
+
+
+def _rate_limiter_report(attempts: List[Attempt], started: float) -> dict:
+    limited = [a for a in attempts if a.status == 429]
+    by_ip: Dict[str, List[int]] = defaultdict(list)
+    for a in attempts:
+        by_ip[a.ip].append(a.status)
+    return {
+        "responses_429": len(limited),
+        "share_429": round(len(limited) / len(attempts), 3) if attempts else 0.0,
+        "first_429_after_s": round(min(a.at for a in limited) - started, 2) if limited else None,
+        "valid_attempts_blocked": sum(1 for a in limited if a.kind == "valid"),
+        "ips_blocked": sum(1 for statuses in by_ip.values() if 429 in statuses),
+        "ips": len(by_ip),
+    }
+
+
+async def _bench_user_ids(rest: SupabaseRest) -> List[str]:
+    """usuario_perfil ids behind the identities the storm logs in as."""
+    usernames = [u for u in (config.ADMIN_USERNAME, config.DEACTIVATED_USERNAME) if u]
+    dnis = [d for d in (config.VENDEDOR_DNI, config.DEACTIVATED_DNI) if d]
+    filters = []
+    if usernames:
+        filters.append(f"username.in.({','.join(usernames)})")
+    if dnis:
+        filters.append(f"dni.in.({','.join(dnis)})")
+    if not filters:
+        return []
+    rows = await rest.select("usuario_perfil", {"select": "id", "or": f"({','.join(filters)})"})
+    return [row["id"] for row in rows]
+
+
+async def _write_volume(rest: SupabaseRest, user_agent: str, since: str, attempts: int) -> dict:
+    audit = {}
+    for stage in ("lookup", "authentication", "security"):
+        for success in ("true", "false"):
+            rows = await rest.count("login_audit", {
+                "user_agent": f"eq.{user_agent}", "stage": f"eq.{stage}", "success": f"is.{success}",
+            })
+            if rows:
+                audit[f"{stage}_{'ok' if success == 'true' else 'fail'}"] = rows
+    total = sum(audit.values())
+    alerts = await rest.count("notificacion", {
+        "titulo": f"eq.{SECURITY_ALERT_TITLE}", "created_at": f"gte.{since}",
+        "data->>ipAddress": "like.10.77.*",
+    })
+    user_ids = await _bench_user_ids(rest)
+    auditoria = await rest.count("auditoria_usuarios", {
+        "usuario_id": f"in.({','.join(user_ids)})", "created_at": f"gte.{since}",
+    }) if user_ids else 0
+    return {
+        "login_audit_rows": total,
+        "login_audit_by_stage": audit,
+        "login_audit_rows_per_attempt": round(total / attempts, 2) if attempts else 0.0,
+        "security_notifications": alerts,
+        "auditoria_usuarios_rows": auditoria,
+        "writes_per_attempt": round((total + alerts + auditoria) / attempts, 2) if attempts else 0.0,
+    }
+
+
+async def run(args: argparse.Namespace) -> dict:
+    rng = random.Random(args.seed)
+    tag = uuid.uuid4().hex[:8]
+    user_agent = f"bench-login/{tag}"
+    endpoints = [e.strip() for e in args.endpoints.split(",") if e.strip()]
+    identities = _identities()
+    mix = {}
+    for part in args.mix.split(","):
+        kind, weight = part.split("=")
+        if any(identities[kind.strip()][e] is not None or kind.strip() == "unknown" for e in endpoints):
+            mix[kind.strip()] = float(weight)
+    skipped = sorted(set(identities) - set(mix))
+    ips = [f"10.77.{n // 250}.{n % 250 + 1}" for n in range(max(1, args.ips))]
+    since = datetime.now(timezone.utc).isoformat()
+    result: dict = {"run_tag": tag, "rate": args.rate, "duration": args.duration, "mix": mix,
+                    "kinds_skipped": skipped, "full_flow": args.full_flow}
+
+    async with async_api.async_playwright() as pw:
+        rest = await SupabaseRest.open(pw)
+        request = await browser.api_context(pw, timeout=60_000)
+        auth = None
+        if args.full_flow:
+            auth = await pw.request.new_context(
+                base_url=f"{config.SUPABASE_URL}/auth/v1/",
+                extra_http_headers={"apikey": config.SUPABASE_ANON_KEY},
+            )
+        attempts: List[Attempt] = []
+        tasks = []
+        try:
+            started = time.monotonic()
+            total = int(args.rate * args.duration)
+            for n in range(total):
+                await asyncio.sleep(max(0.0, started + n / args.rate - time.monotonic()))
+                kind = rng.choices(list(mix), weights=list(mix.values()))[0]
+                options = [e for e in endpoints if kind == "unknown" or identities[kind][e] is not None]
+                endpoint = rng.choice(options)
+                if kind == "unknown":
+                    identifier = (f"bench{rng.randrange(10**6)}" if endpoint == "username"
+                                  else f"{rng.randrange(10**7, 10**8)}")
+                    password = "bench-password"
+                else:
+                    identifier, password = identities[kind][endpoint]
+                attempt = Attempt(kind, endpoint, rng.choice(ips), time.monotonic())
+                attempts.append(attempt)
+                tasks.append(asyncio.create_task(_attempt(
+                    request, auth, attempt, identifier, password, user_agent, args.full_flow)))
+            await asyncio.gather(*tasks)
+            elapsed = time.monotonic() - started
+
+            latency = {}
+            for endpoint in endpoints:
+                for kind in mix:
+                    group = [a for a in attempts if a.endpoint == endpoint and a.kind == kind and a.ms]
+                    if not group:
+                        continue
+                    statuses: Dict[str, int] = defaultdict(int)
+                    for a in group:
+                        statuses[str(a.status)] += 1
+                    entry = {"lookup_ms": summarize(a.ms for a in group), "status": dict(statuses)}
+                    if args.full_flow:
+                        entry["supabase_auth_ms"] = summarize(a.auth_ms for a in group if a.auth_ms)
+                        entry["login_audit_ms"] = summarize(a.audit_ms for a in group if a.audit_ms)
+                    latency[f"{endpoint}/{kind}"] = entry
+            result.update({
+                "attempts": len(attempts),
+                "achieved_rate": round(len(attempts) / elapsed, 1) if elapsed else 0.0,
+                "errors": sum(1 for a in attempts if a.error),
+                "latency": latency,
+                "lookup_ms_all": summarize(a.ms for a in attempts if a.ms),
+                "rate_limiter": _rate_limiter_report(attempts, started),
+                "writes": await _write_volume(rest, user_agent, since, len(attempts)),
+            })
+        finally:
+            await request.dispose()
+            if auth:
+                await auth.dispose()
+            if not args.keep:
+                await rest.delete("login_audit", {"user_agent": f"eq.{user_agent}"})
+                await rest.delete("notificacion", {
+                    "titulo": f"eq.{SECURITY_ALERT_TITLE}", "created_at": f"gte.{since}",
+                    "data->>ipAddress": "like.10.77.*",
+                })
+            await rest.close()
+            (browser.AUTH_DIR / "vendedor.json").unlink(missing_ok=True)
+    return result
@@ -0,0 +1,85 @@
+"""TC scripts under mobile-vendedor emulation profiles.
+
+Runs the selected ``TC0xx_*.py`` scripts, unmodified, once per profile in
+``bench.profiles`` (desktop, 4G and 3G mid-range phones, a 3G low-end one)
+through ``bench.tcrun``, one at a time so CPU throttling is not skewed by
+parallel browsers. Reported per profile and TC: pass/fail, wall time,
+"active" time (wall minus the scripts' fixed sleeps) and its slowdown against
+the first profile, plus document and API request latency and Web Vitals
+across all the TCs.
+
+A failure that only shows up on phone viewports usually means the TC's
+XPaths target the desktop sidebar, which the mobile layout replaces with
+``BottomNav``; the error is kept in the report.
+"""
+
+import argparse
+import tempfile
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List
+
+from .. import profiles
+from ..stats import summarize
+from ..tcrun import run_tc, tc_scripts
+from ..vitals import VitalsCollector
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--tc", default="", help="comma-separated TC ids, e.g. TC001,TC020 (default: all)")
+    parser.add_argument("--profiles", default=",".join(profiles.PROFILES),
+                        help="profiles to run, the first one is the baseline")
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--timeout", type=float, default=900.0, help="seconds per TC run")
+
+
+async def run(args: argparse.Namespace) -> dict:
+    names = [profiles.get(name.strip()).name for name in args.profiles.split(",") if name.strip()]
+    scripts = tc_scripts(args.tc)
+    if not scripts:
+        raise RuntimeError(f"no TC scripts match {args.tc!r}")
+
+    runs: Dict[str, Dict[str, List[dict]]] = {name: defaultdict(list) for name in names}
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in names:
+            for script in scripts:
+                for attempt in range(args.repeat):
+                    out = Path(tmp) / f"{name}-{script.stem}-{attempt}.json"
+                    outcome = await run_tc(script, out, args.timeout, profile=name)
+                    runs[name][script.name.split("_")[0]].append(outcome)
+
+    baseline: Dict[str, float] = {}
+    report: dict = {}
+    for name in names:
+        requests: Dict[str, List[float]] = defaultdict(list)
+        vitals = VitalsCollector()
+        tcs = {}
+        for tc, results in runs[name].items():
+            active = [r["active_s"] for r in results if r.get("passed")]
+            for r in results:
+                for key, values in r.get("requests", {}).items():
+                    requests[key.split(" ")[0]].extend(values)
+                vitals.visits.update((f"{tc}:{v['id']}", v) for v in r.get("vitals_visits", []))
+            entry = {
+                "passed": sum(bool(r.get("passed")) for r in results),
+                "runs": len(results),
+                "wall_s": summarize([r["wall_s"] for r in results if "wall_s" in r]),
+                "active_s": summarize(active),
+                "errors": sorted({r["error"] for r in results if r.get("error")}),
+            }
+            p50 = entry["active_s"].get("p50")
+            if name == names[0] and p50:
+                baseline[tc] = p50
+            # Only the reference profile sets the baseline; without a passing run there, no ratio.
+            entry["slowdown"] = round(p50 / baseline[tc], 2) if p50 and tc in baseline else None
+            tcs[tc] = entry
+        profile = profiles.get(name)
+        report[name] = {
+            "emulation": {"viewport": profile.viewport, "cpu_rate": profile.cpu_rate,
+                          "latency_ms": profile.latency_ms, "down_kbps": profile.down_kbps,
+                          "up_kbps": profile.up_kbps},
+            "tcs": tcs,
+            "requests_ms": {kind: summarize(values) for kind, values in sorted(requests.items())},
+            "web_vitals": vitals.summary(),
+        }
+    return {"baseline": names[0], "scripts": [s.name for s in scripts], "profiles": report}
@@ -0,0 +1,229 @@
+"""Deep pagination over the client list and the report fetchers.
+
+Seeds clientes (10k to 1M, ``fecha_alta``/``updated_at`` spread over two
+years) and, at each size, walks pages ``--pages`` (1, 10, 100, 1000) in
+three ways:
+
+* **app**: ``/dashboard/clientes?page=N`` rendered with an admin session,
+  i.e. ``getCachedClientes``' ``.order(updated_at).range()`` plus its exact
+  count. ``getCachedClientes`` is React ``cache()``, which only dedups
+  within one request, so every request runs the query; the first request
+  per page and the repeats differ only by database and page-cache warmth,
+* **offset**: the same PostgREST reads the app issues, the 20-row list page
+  (``order=updated_at.desc,id.desc``) and the unordered 1000-row page
+  ``fetchAllRows`` (``src/lib/reportes/pagination.ts``) requests from
+  ``cliente`` for the funnel report,
+* **keyset**: the same rows read after a ``(updated_at, id)`` / ``id``
+  cursor taken from the previous page, the mode the list and
+  ``fetchAllRows`` would use with a cursor.
+
+Reported per page: latency (first and repeat requests for the app), and
+per mode the ratio of the deepest page to page 1, which is where offset
+scans degrade.
+Meant for a disposable Supabase project; seeded rows are tagged by e-mail.
+"""
+
+import argparse
+import random
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+
+from playwright import async_api
+
+from .. import browser, config
+from ..stats import stopwatch, summarize
+from ..supabase import SupabaseRest
+
+LIST_COLUMNS = "id,nombre,updated_at"
+LIST_ORDER = "updated_at.desc,id.desc"
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--sizes", default="10000,100000,1000000", help="cumulative cliente counts")
+    parser.add_argument("--pages", default="1,10,100,1000")
+    parser.add_argument("--page-size", type=int, default=20, help="client list page size (as in the app)")
+    parser.add_argument("--report-page-size", type=int, default=1000, help="fetchAllRows page size")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--skip-app", action="store_true", help="only measure PostgREST")
+    parser.add_argument("--seed", type=int, default=45)
+    parser.add_argument("--keep", action="store_true", help="keep the seeded clientes")
+
+
+def _quoted(value: str) -> str:
+    return '"' + value.replace('"', '\\"') + '"'
+
+
+class Clientes:
+    """Seeds tagged clientes with timestamps spread over the last two years."""
+
+    def __init__(self, rest: SupabaseRest, tag: str, created_by: str, vendedor: str, seed: int):
+        self.rest, self.tag = rest, tag
+        self.created_by, self.vendedor = created_by, vendedor
+        self.rng = random.Random(seed)
+        self.count = 0
+
+    async def grow_to(self, size: int) -> float:
+        missing = size - self.count
+        if missing <= 0:
+            return 0.0
+        now = datetime.now(timezone.utc)
+        start = self.count
+
+        def rows():
+            for n in range(start, start + missing):
+                stamp = (now - timedelta(seconds=self.rng.randrange(730 * 86400))).isoformat()
+                yield {
+                    "id": str(uuid.UUID(int=self.rng.getrandbits(128), version=4)),
+                    "nombre": f"Cliente {self.tag} {n}",
+                    "email": f"{self.tag}-{n}@bench.amersur.test",
+                    "created_by": self.created_by,
+                    "vendedor_asignado": self.vendedor,
+                    "fecha_alta": stamp,
+                    "updated_at": stamp,
+                }
+
+        with stopwatch() as t:
+            await self.rest.insert("cliente", rows(), batch_size=5000)
+        self.count = size
+        return t["ms"] / 1000
+
+    async def cleanup(self) -> None:
+        await self.rest.delete("cliente", {"email": f"like.{self.tag}-*"})
+
+
+async def _timed_select(rest: SupabaseRest, params: dict) -> tuple:
+    with stopwatch() as t:
+        rows = await rest.select("cliente", params)
+    return t["ms"], rows
+
+
+async def _list_page(rest: SupabaseRest, page: int, size: int, repeats: int) -> dict:
+    offset_params = {"select": LIST_COLUMNS, "order": LIST_ORDER, "offset": str((page - 1) * size),
+                     "limit": str(size)}
+    offset_ms: List[float] = []
+    for _ in range(repeats):
+        ms, rows = await _timed_select(rest, offset_params)
+        offset_ms.append(ms)
+    entry = {"rows": len(rows), "offset_ms": summarize(offset_ms)}
+
+    cursor: Optional[dict] = None
+    if page > 1:
+        previous = await rest.select("cliente", {**offset_params, "select": "id,updated_at",
+                                                 "offset": str((page - 1) * size - 1), "limit": "1"})
+        cursor = previous[0] if previous else None
+    if page == 1 or cursor:
+        keyset_params = {"select": LIST_COLUMNS, "order": LIST_ORDER, "limit": str(size)}
+        if cursor:
+            at = _quoted(cursor["updated_at"])
+            keyset_params["or"] = f"(updated_at.lt.{at},and(updated_at.eq.{at},id.lt.{cursor['id']}))"
+        keyset_ms = []
+        for _ in range(repeats):
+            ms, keyset_rows = await _timed_select(rest, keyset_params)
+            keyset_ms.append(ms)
+        entry["keyset_ms"] = summarize(keyset_ms)
+        entry["keyset_matches_offset"] = [r["id"] for r in keyset_rows] == [r["id"] for r in rows]
+    return entry
+
+
+async def _report_page(rest: SupabaseRest, page: int, size: int, repeats: int) -> dict:
+    # fetchAllRows' funnel read: unordered .range(offset, offset + 999) over cliente.
+    offset_params = {"select": "id,estado_cliente", "offset": str((page - 1) * size), "limit": str(size)}
+    offset_ms: List[float] = []
+    for _ in range(repeats):
+        ms, rows = await _timed_select(rest, offset_params)
+        offset_ms.append(ms)
+    entry = {"rows": len(rows), "offset_ms": summarize(offset_ms)}
+
+    cursor: Optional[str] = None
+    if page > 1:
+        previous = await rest.select("cliente", {"select": "id", "order": "id.asc",
+                                                 "offset": str((page - 1) * size - 1), "limit": "1"})
+        cursor = previous[0]["id"] if previous else None
+    if page == 1 or cursor:
+        keyset_params = {"select": "id,estado_cliente", "order": "id.asc", "limit": str(size)}
+        if cursor:
+            keyset_params["id"] = f"gt.{cursor}"
+        keyset_ms = []
+        for _ in range(repeats):
+            ms, _rows = await _timed_select(rest, keyset_params)
+            keyset_ms.append(ms)
+        entry["keyset_ms"] = summarize(keyset_ms)
+    return entry
+
+
+async def _app_page(request, page: int, repeats: int) -> dict:
+    samples = []
+    status = 0
+    for _ in range(repeats):
+        with stopwatch() as t:
+            response = await request.get(f"/dashboard/clientes?page={page}")
+            await response.body()
+        samples.append(t["ms"])
+        status = response.status
+    return {"status": status, "first_ms": round(samples[0], 1), "repeat_ms": summarize(samples[1:])}
+
+
+def _depth_ratio(pages: dict, metric: str) -> Optional[float]:
+    measured = [(int(p), e[metric]["p50"]) for p, e in pages.items() if e.get(metric, {}).get("count")]
+    if len(measured) < 2:
+        return None
+    measured.sort()
+    first, last = measured[0][1], measured[-1][1]
+    return round(last / first, 1) if first else None
+
+
+async def run(args: argparse.Namespace) -> dict:
+    tag = f"bench-{uuid.uuid4().hex[:8]}"
+    sizes = sorted(int(s) for s in args.sizes.split(",") if s.strip())
+    pages = sorted(int(p) for p in args.pages.split(",") if p.strip())
+    result: dict = {"run_tag": tag, "page_size": args.page_size, "report_page_size": args.report_page_size,
+                    "sizes": {}}
+
+    async with async_api.async_playwright() as pw:
+        rest = await SupabaseRest.open(pw)
+        chromium = request = clientes = None
+        try:
+            perfiles = await rest.select("usuario_perfil", {
+                "select": "id,username", "dni": f"eq.{config.VENDEDOR_DNI}",
+            })
+            if not perfiles:
+                raise RuntimeError("seeding needs the bench vendedor profile")
+            if not args.skip_app:
+                chromium = await browser.launch(pw)
+                request = await browser.api_context(pw, await browser.storage_state(chromium, "admin"), timeout=0)
+            clientes = Clientes(rest, tag, perfiles[0]["id"], perfiles[0]["username"], args.seed)
+
+            for size in sizes:
+                entry: dict = {"seed_seconds": round(await clientes.grow_to(size), 2)}
+                with stopwatch() as t:
+                    entry["total"] = await rest.count("cliente", {"select": "id"})
+                entry["exact_count_ms"] = round(t["ms"], 1)
+                entry["list"] = {str(p): await _list_page(rest, p, args.page_size, args.repeats) for p in pages}
+                entry["report"] = {str(p): await _report_page(rest, p, args.report_page_size, args.repeats)
+                                   for p in pages}
+                if request:
+                    entry["app"] = {str(p): await _app_page(request, p, args.repeats) for p in pages}
+                entry["depth_ratio"] = {
+                    "list_offset": _depth_ratio(entry["list"], "offset_ms"),
+                    "list_keyset": _depth_ratio(entry["list"], "keyset_ms"),
+                    "report_offset": _depth_ratio(entry["report"], "offset_ms"),
+                    "report_keyset": _depth_ratio(entry["report"], "keyset_ms"),
+                }
+                result["sizes"][str(size)] = entry
+        finally:
+            if request:
+                await request.dispose()
+            if chromium:
+                await chromium.close()
+            if clientes and not args.keep:
+                await clientes.cleanup()
+            await rest.close()
+
+    result["failed"] = any(
+        page["status"] >= 400 for entry in result["sizes"].values() for page in entry.get("app", {}).values()
+    ) or any(
+        page.get("keyset_matches_offset") is False
+        for entry in result["sizes"].values() for page in entry["list"].values()
+    )
+    return result
@@ -0,0 +1,205 @@
+"""Role/permission propagation latency (TC014 + TC019).
+
+An admin edit to a role's ``permisos`` must reach vendedores that are already
+logged in. The scenario keeps many vendedor sessions busy, removes a
+permission from the role (and later restores it), and times how long until:
+
+* ``/api/auth/permissions`` reports the new permission set (API pollers),
+* the sidebar item gated by that permission (``src/config/navigation.tsx``,
+  the items TC014 asserts) appears or disappears in open browser contexts,
+  either navigating client-side through the sidebar or doing full reloads.
+
+``/api/admin/roles`` is read-only in this tree, so the role is looked up
+through it and the edit is written to ``crm.rol.permisos`` directly, which is
+exactly the row a role edit changes. ``stale_ratio`` is the share of reads
+after the edit that still served the previous permissions, i.e. the
+effective hit rate of whatever layer (SSR layout, client context, HTTP
+cache) kept the old value.
+"""
+
+import argparse
+import asyncio
+import time
+from typing import Callable, Dict, List, Optional
+
+from playwright import async_api
+from playwright.async_api import Page
+
+from .. import browser
+from ..stats import summarize
+from ..supabase import SupabaseRest
+
+NAV_TARGETS = ("/dashboard/clientes", "/dashboard/agenda", "/dashboard")
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--rol", default="ROL_VENDEDOR", help="role whose permisos are edited")
+    parser.add_argument("--permisos", default="documentos.ver_todos,documentos.ver_asignados",
+                        help="permission codes removed and then restored")
+    parser.add_argument("--item", default="/dashboard/documentos",
+                        help="sidebar href gated by those permissions")
+    parser.add_argument("--pollers", type=int, default=20, help="API polling sessions")
+    parser.add_argument("--poll-ms", type=int, default=250)
+    parser.add_argument("--contexts", type=int, default=6, help="browser contexts per mode")
+    parser.add_argument("--modes", default="navigate,reload", help="sidebar observation modes")
+    parser.add_argument("--interval-ms", type=int, default=1000, help="pause between UI checks")
+    parser.add_argument("--timeout", type=float, default=120.0, help="seconds to wait per edit")
+
+
+class Observer:
+    """Timestamped boolean readings of 'permission visible?' from one session."""
+
+    def __init__(self, kind: str):
+        self.kind = kind
+        self.readings: List[tuple] = []
+        self.errors = 0
+
+    def record(self, visible: bool) -> None:
+        self.readings.append((time.monotonic(), visible))
+
+    def propagation_ms(self, since: float, expected: bool) -> Optional[float]:
+        for stamp, visible in self.readings:
+            if stamp >= since and visible == expected:
+                return (stamp - since) * 1000
+        return None
+
+    def stale(self, since: float, until: float, expected: bool) -> tuple:
+        window = [v for s, v in self.readings if since <= s < until]
+        return sum(1 for v in window if v != expected), len(window)
+
+
+async def _poll_api(request, codes: List[str], observer: Observer, stop: asyncio.Event, poll_ms: int):
+    while not stop.is_set():
+        try:
+            response = await request.get("/api/auth/permissions")
+            if response.ok:
+                permisos = (await response.json()).get("usuario", {}).get("permisos", [])
+                observer.record(any(code in permisos for code in codes))
+            else:
+                observer.errors += 1
+        except (async_api.Error, ValueError):
+            # A timeout or reset must not end the observer: it would just read as never converged.
+            observer.errors += 1
+        await asyncio.sleep(poll_ms / 1000)
+
+
+async def _watch_sidebar(page: Page, mode: str, item: str, observer: Observer,
+                         stop: asyncio.Event, interval_ms: int):
+    selector = f'[data-sidebar="sidebar"] a[href="{item}"]'
+    step = 0
+    while not stop.is_set():
+        try:
+            if mode == "reload":
+                await page.reload(wait_until="domcontentloaded")
+            else:
+                target = NAV_TARGETS[step % len(NAV_TARGETS)]
+                await page.locator(f'[data-sidebar="sidebar"] a[href="{target}"]').first.click()
+                await page.wait_for_url(f"**{target}", timeout=15000)
+            step += 1
+            await page.wait_for_selector('[data-sidebar="sidebar"]', timeout=15000)
+            observer.record(await page.locator(selector).count() > 0)
+        except async_api.Error:
+            observer.errors += 1
+        await asyncio.sleep(interval_ms / 1000)
+
+
+async def _wait_converged(observers: List[Observer], since: float, expected: bool, timeout: float):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if all(o.propagation_ms(since, expected) is not None for o in observers):
+            return
+        await asyncio.sleep(0.25)
+
+
+def _report(observers: List[Observer], since: float, until: float, expected: bool) -> Dict[str, dict]:
+    report = {}
+    for kind in sorted({o.kind for o in observers}):
+        group = [o for o in observers if o.kind == kind]
+        delays = [d for d in (o.propagation_ms(since, expected) for o in group) if d is not None]
+        stale = [o.stale(since, until, expected) for o in group]
+        stale_reads, reads = sum(s for s, _ in stale), sum(t for _, t in stale)
+        report[kind] = {
+            "sessions": len(group),
+            "propagated": len(delays),
+            "not_propagated": len(group) - len(delays),
+            "propagation_ms": summarize(delays),
+            "reads_after_edit": reads,
+            "stale_reads": stale_reads,
+            "stale_ratio": round(stale_reads / reads, 3) if reads else None,
+            "errors": sum(o.errors for o in group),
+        }
+    return report
+
+
+async def run(args: argparse.Namespace) -> dict:
+    codes = [c.strip() for c in args.permisos.split(",") if c.strip()]
+    modes = [m.strip() for m in args.modes.split(",") if m.strip()]
+    result: dict = {"rol": args.rol, "permisos": codes, "item": args.item}
+
+    async with async_api.async_playwright() as pw:
+        chromium = await browser.launch(pw)
+        rest = await SupabaseRest.open(pw)
+        stop = asyncio.Event()
+        tasks: List[asyncio.Task] = []
+        cleanups: List[Callable] = []
+        original: Optional[list] = None
+        rol_id = None
+        try:
+            admin_state = await browser.storage_state(chromium, "admin")
+            vendedor_state = await browser.storage_state(chromium, "vendedor")
+
+            admin = await browser.api_context(pw, admin_state)
+            cleanups.append(admin.dispose)
+            roles = (await (await admin.get("/api/admin/roles")).json()).get("roles", [])
+            match = next((r for r in roles if r["nombre"] == args.rol), None)
+            if not match:
+                raise RuntimeError(f"{args.rol} not returned by /api/admin/roles")
+            rol_id = match["id"]
+            [row] = await rest.select("rol", {"select": "permisos", "id": f"eq.{rol_id}"})
+            original = list(row["permisos"] or [])
+            if not any(code in original for code in codes):
+                raise RuntimeError(f"{args.rol} has none of {codes}; nothing to revoke")
+
+            observers: List[Observer] = []
+            for _ in range(args.pollers):
+                request = await browser.api_context(pw, vendedor_state)
+                cleanups.append(request.dispose)
+                observer = Observer("api")
+                observers.append(observer)
+                tasks.append(asyncio.create_task(
+                    _poll_api(request, codes, observer, stop, args.poll_ms)))
+            for mode in modes:
+                for _ in range(args.contexts):
+                    context = await browser.new_context(chromium, vendedor_state)
+                    cleanups.append(context.close)
+                    page = await context.new_page()
+                    await page.goto("/dashboard", wait_until="domcontentloaded", timeout=60000)
+                    await browser.dismiss_novedades(page)
+                    observer = Observer(f"sidebar_{mode}")
+                    observers.append(observer)
+                    tasks.append(asyncio.create_task(
+                        _watch_sidebar(page, mode, args.item, observer, stop, args.interval_ms)))
+
+            await asyncio.sleep(3)
+            revoked = [p for p in original if p not in codes]
+            revoke_at = time.monotonic()
+            await rest.update("rol", {"id": f"eq.{rol_id}"}, {"permisos": revoked})
+            await _wait_converged(observers, revoke_at, False, args.timeout)
+
+            restore_at = time.monotonic()
+            await rest.update("rol", {"id": f"eq.{rol_id}"}, {"permisos": original})
+            await _wait_converged(observers, restore_at, True, args.timeout)
+            end = time.monotonic()
+
+            result["revoke"] = _report(observers, revoke_at, restore_at, False)
+            result["restore"] = _report(observers, restore_at, end, True)
+        finally:
+            stop.set()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            if rol_id and original is not None:
+                await rest.update("rol", {"id": f"eq.{rol_id}"}, {"permisos": original})
+            for cleanup in reversed(cleanups):
+                await cleanup()
+            await rest.close()
+            await chromium.close()
+    return result
@@ -0,0 +1,163 @@
+"""Parallel RBAC matrix: every role x every dashboard route (TC014).
+
+Roles come from ``/api/admin/roles``; each one needs a login, either the
+configured admin/vendedor or an entry in ``BENCH_ROLE_CREDENTIALS``. Routes
+are every static ``page.tsx`` under ``src/app/dashboard`` and the expected
+outcome is derived from the guards in the source (see ``bench.rbac``).
+
+For each role the scenario reuses a cached storage state and checks:
+
+* route access over plain HTTP, all pairs concurrently: a 3xx response or a
+  ``NEXT_REDIRECT`` digest in the streamed page means denied,
+* sidebar visibility in one browser page per role against the rule
+  ``SidebarShadcn.tsx`` applies to ``src/config/navigation.tsx``.
+
+Any mismatch marks the run as failed (exit code 1), so the sweep can gate PRs.
+"""
+
+import argparse
+import asyncio
+import json
+import re
+import time
+from typing import Dict, List, Optional
+
+from playwright import async_api
+
+from .. import browser, config, rbac
+from ..load import gather_limited
+from ..stats import summarize
+
+_REDIRECT_RE = re.compile(r"NEXT_REDIRECT;[a-z]+;([^;\"\\]+)")
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--roles", help="comma separated subset of role names")
+    parser.add_argument("--refresh-auth", action="store_true", help="log in again instead of reusing states")
+
+
+def _credentials() -> Dict[str, dict]:
+    logins = {
+        rbac.ADMIN: {"login": "admin", "user": config.ADMIN_USERNAME, "password": config.ADMIN_PASSWORD},
+        "ROL_VENDEDOR": {"login": "vendedor", "user": config.VENDEDOR_DNI, "password": config.VENDEDOR_PASSWORD},
+    }
+    if config.ROLE_CREDENTIALS_FILE.exists():
+        logins.update(json.loads(config.ROLE_CREDENTIALS_FILE.read_text(encoding="utf-8")))
+    return logins
+
+
+async def _check_route(request, route: str) -> dict:
+    start = time.perf_counter()
+    response = await request.get(route, max_redirects=0)
+    location: Optional[str] = response.headers.get("location")
+    if not location and response.status == 200:
+        match = _REDIRECT_RE.search(await response.text())
+        location = match.group(1) if match else None
+    return {
+        "status": response.status,
+        "allowed": response.status < 300 and location is None,
+        "redirect": location,
+        "ms": round((time.perf_counter() - start) * 1000, 1),
+    }
+
+
+async def _visible_sidebar(chromium, state: str) -> List[str]:
+    context = await browser.new_context(chromium, state)
+    try:
+        page = await context.new_page()
+        await page.goto("/dashboard", wait_until="domcontentloaded", timeout=60000)
+        await page.wait_for_selector('[data-sidebar="sidebar"] a[href]', timeout=30000)
+        hrefs = await page.eval_on_selector_all(
+            '[data-sidebar="sidebar"] a[href]', "els => els.map(e => e.getAttribute('href'))"
+        )
+        return sorted({h.split("?")[0] for h in hrefs})
+    finally:
+        await context.close()
+
+
+async def _role_matrix(pw, chromium, rol: str, state: str, routes, sidebar, concurrency) -> dict:
+    request = await browser.api_context(pw, state)
+    try:
+        me = (await (await request.get("/api/auth/permissions")).json()).get("usuario") or {}
+        permisos = me.get("permisos") or []
+        if me.get("rol") != rol:
+            return {"error": f"login resolved to {me.get('rol')!r}, expected {rol}"}
+
+        checks = await gather_limited(
+            [lambda r=r: _check_route(request, r) for r in routes], concurrency
+        )
+    finally:
+        await request.dispose()
+    visible = await _visible_sidebar(chromium, state)
+
+    failures = []
+    matrix = {}
+    for route, check in zip(routes, checks):
+        expected = routes[route].route_allows(rol, permisos)
+        matrix[route] = {**check, "expected": expected, "guard": routes[route].source}
+        if expected != check["allowed"]:
+            failures.append({"kind": "route", "route": route, "expected": expected, **check})
+    for href, rule in sidebar.items():
+        expected = rule.sidebar_allows(rol, permisos)
+        if expected != (href in visible):
+            failures.append({"kind": "sidebar", "route": href, "expected": expected,
+                             "visible": href in visible})
+    return {
+        "permisos": len(permisos),
+        "routes": matrix,
+        "route_ms": summarize(c["ms"] for c in checks),
+        "sidebar_visible": visible,
+        "failures": failures,
+    }
+
+
+async def run(args: argparse.Namespace) -> dict:
+    routes, skipped = rbac.dashboard_routes()
+    sidebar = rbac.sidebar_rules()
+    credentials = _credentials()
+    started = time.perf_counter()
+    result: dict = {"routes": len(routes), "skipped_routes": skipped, "roles": {}}
+
+    async with async_api.async_playwright() as pw:
+        chromium = await browser.launch(pw)
+        try:
+            admin_state = await browser.storage_state(chromium, "admin", args.refresh_auth)
+            admin = await browser.api_context(pw, admin_state)
+            try:
+                payload = await (await admin.get("/api/admin/roles")).json()
+            finally:
+                await admin.dispose()
+            roles = [r["nombre"] for r in payload.get("roles", [])]
+            if args.roles:
+                wanted = {r.strip() for r in args.roles.split(",")}
+                roles = [r for r in roles if r in wanted]
+
+            states = {}
+            for rol in roles:
+                login = credentials.get(rol)
+                if not login:
+                    result["roles"][rol] = {"skipped": "no credentials in BENCH_ROLE_CREDENTIALS"}
+                    continue
+                states[rol] = await browser.storage_state(
+                    chromium, login.get("login", "admin"), args.refresh_auth,
+                    identifier=login["user"], password=login["password"], name=rol,
+                )
+
+            matrices = await asyncio.gather(*(
+                _role_matrix(pw, chromium, rol, state, routes, sidebar, args.concurrency)
+                for rol, state in states.items()
+            ))
+            result["roles"].update(dict(zip(states, matrices)))
+        finally:
+            await chromium.close()
+
+    failures = [
+        {"rol": rol, **failure}
+        for rol, data in result["roles"].items()
+        for failure in data.get("failures", [])
+    ] + [{"rol": rol, "error": data["error"]} for rol, data in result["roles"].items() if "error" in data]
+    result["failures"] = failures
+    result["failed"] = bool(failures)
+    result["sweep_seconds"] = round(time.perf_counter() - started, 2)
+    return result
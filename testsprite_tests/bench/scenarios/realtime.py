@@ -0,0 +1,317 @@
+"""Notificaciones realtime channel under hundreds of subscribers (TC016).
+
+TC016 checks one browser receiving a notification. This scenario grows the
+subscriber count step by step (``--subscribers 50,100,200,500``) on the
+channel ``NotificationsDropdown.tsx`` joins, inserts ``--messages``
+notificaciones at each step and measures:
+
+* connect-and-join time and delivery latency (insert to ``postgres_changes``
+  frame, from ``data.bench_sent_at``),
+* server memory per connection (RSS growth of the stand-in process, or of
+  ``--server-pid`` for a self-hosted Realtime) and, with browser clients, the
+  JS heap of each logged-in page,
+* the per-subscriber authorization checks the unfiltered subscription costs
+  next to the deliveries that actually matter (stand-in only),
+* a reconnect storm after the last step: the stand-in is killed and restarted
+  (``--target standin``) or every socket is dropped at once (``--target
+  supabase``); reported are the time until every subscriber rejoined, the
+  connection attempts per second and whether delivery resumes.
+
+``--clients protocol`` (default) uses ``bench.realtime`` subscribers, cheap
+enough for thousands; ``--clients browser`` opens logged-in ``/dashboard``
+pages against the app's own Supabase project instead (no storm). Inserts go
+to the stand-in's PostgREST-shaped endpoint or through the service role.
+"""
+
+import argparse
+import asyncio
+import base64
+import json
+import random
+import subprocess
+import sys
+import time
+import uuid
+from collections import Counter
+from pathlib import Path
+from typing import Awaitable, Callable, List, Optional
+
+from playwright import async_api
+from playwright.async_api import APIRequestContext, Browser, BrowserContext, Page, WebSocket
+
+from .. import browser, config
+from ..memory import process_rss_mb
+from ..realtime import Subscriber, delivery_latency_ms, socket_url
+from ..stats import summarize
+from ..supabase import SupabaseRest
+
+PACKAGE_ROOT = Path(__file__).resolve().parents[2]
+Publish = Callable[[List[dict]], Awaitable[None]]
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--subscribers", default="50,100,200,500", help="cumulative subscriber counts")
+    parser.add_argument("--clients", choices=("protocol", "browser"), default="protocol")
+    parser.add_argument("--target", choices=("standin", "supabase"), default="standin",
+                        help="Realtime server for protocol clients")
+    parser.add_argument("--users", type=int, default=0,
+                        help="distinct users among stand-in subscribers (default: one per subscriber)")
+    parser.add_argument("--messages", type=int, default=20, help="notificaciones inserted per step")
+    parser.add_argument("--interval-ms", type=float, default=100)
+    parser.add_argument("--delivery-timeout", type=float, default=15, help="seconds to wait for deliveries")
+    parser.add_argument("--connect-concurrency", type=int, default=50)
+    parser.add_argument("--port", type=int, default=8916, help="stand-in port")
+    parser.add_argument("--down-ms", type=float, default=2000, help="stand-in downtime during the restart")
+    parser.add_argument("--jitter-ms", type=float, default=0, help="random extra reconnect delay per client")
+    parser.add_argument("--no-storm", action="store_true")
+    parser.add_argument("--server-pid", type=int, help="self-hosted Realtime PID to sample RSS from")
+
+
+def _fake_token(subject: str) -> str:
+    def encode(value: dict) -> str:
+        return base64.urlsafe_b64encode(json.dumps(value).encode("utf-8")).decode("ascii").rstrip("=")
+    return f"{encode({'alg': 'none'})}.{encode({'sub': subject, 'role': 'authenticated'})}."
+
+
+class StandInProcess:
+    """``bench.standins.realtime`` in its own process, so it can be sampled and killed."""
+
+    def __init__(self, request: APIRequestContext, port: int):
+        self.request = request
+        self.port = port
+        self.url = f"http://127.0.0.1:{port}"
+        self.process: Optional[subprocess.Popen] = None
+
+    async def start(self) -> None:
+        self.process = subprocess.Popen(
+            [sys.executable, "-m", "bench.standins.realtime", "--port", str(self.port)], cwd=PACKAGE_ROOT,
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+        deadline = time.monotonic() + 10
+        while True:
+            try:
+                await self.stats()
+                return
+            except async_api.Error:
+                if time.monotonic() > deadline:
+                    raise RuntimeError(f"realtime stand-in did not start on port {self.port}")
+                await asyncio.sleep(0.1)
+
+    def stop(self) -> None:
+        if self.process:
+            self.process.kill()
+            self.process.wait(timeout=10)
+            self.process = None
+
+    def rss_mb(self) -> Optional[float]:
+        return process_rss_mb(self.process.pid) if self.process else None
+
+    async def stats(self) -> dict:
+        return await (await self.request.get(f"{self.url}/stats")).json()
+
+    async def publish(self, rows: List[dict]) -> None:
+        await self.request.post(f"{self.url}/rest/v1/notificacion", data=json.dumps(rows),
+                                headers={"Content-Type": "application/json"})
+
+
+class PageSubscriber:
+    """A logged-in ``/dashboard`` page, observed through its Realtime WebSocket frames."""
+
+    def __init__(self, context: BrowserContext, page: Page, user_id: str):
+        self.context, self.page, self.user_id = context, page, user_id
+        self.joined = asyncio.Event()
+        self.join_ms: List[float] = []
+        self.latencies_ms: List[float] = []
+        self._opened = time.perf_counter()
+        page.on("websocket", self._on_websocket)
+
+    def _on_websocket(self, ws: WebSocket) -> None:
+        if "/realtime/v1/websocket" in ws.url:
+            ws.on("framereceived", self._on_frame)
+
+    def _on_frame(self, payload) -> None:
+        try:
+            message = json.loads(payload)
+        except (TypeError, ValueError):
+            return
+        if (message.get("event") == "phx_reply" and str(message.get("topic", "")).startswith(
+                "realtime:notificaciones:") and (message.get("payload") or {}).get("status") == "ok"
+                and not self.joined.is_set()):
+            self.join_ms.append((time.perf_counter() - self._opened) * 1000)
+            self.joined.set()
+        latency = delivery_latency_ms(message)
+        if latency is not None:
+            self.latencies_ms.append(latency)
+
+    async def js_heap_mb(self) -> float:
+        cdp = await self.context.new_cdp_session(self.page)
+        try:
+            await cdp.send("Performance.enable")
+            metrics = {m["name"]: m["value"] for m in (await cdp.send("Performance.getMetrics"))["metrics"]}
+        finally:
+            await cdp.detach()
+        return metrics.get("JSHeapUsedSize", 0) / (1024 * 1024)
+
+
+async def _open_page(chromium: Browser, state: str, user_id: str) -> PageSubscriber:
+    context = await browser.new_context(chromium, state)
+    subscriber = PageSubscriber(context, await context.new_page(), user_id)
+    await subscriber.page.goto("/dashboard", wait_until="domcontentloaded", timeout=60000)
+    await browser.dismiss_novedades(subscriber.page)
+    return subscriber
+
+
+async def _wait_joined(subscribers: list, timeout: float) -> int:
+    if subscribers:
+        _, pending = await asyncio.wait([asyncio.create_task(s.joined.wait()) for s in subscribers], timeout=timeout)
+        for task in pending:
+            task.cancel()
+    return sum(s.joined.is_set() for s in subscribers)
+
+
+async def _deliver(subscribers: list, publish: Publish, users: List[str], args, tag: str) -> dict:
+    for subscriber in subscribers:
+        subscriber.latencies_ms.clear()
+    per_user = Counter(s.user_id for s in subscribers)
+    expected = 0
+    for n in range(args.messages):
+        user = random.choice(users)
+        expected += per_user[user]
+        await publish([{"usuario_id": user, "tipo": "sistema", "titulo": f"{tag} {n}", "mensaje": "bench realtime",
+                        "data": {"bench_sent_at": time.time()}}])
+        await asyncio.sleep(args.interval_ms / 1000)
+    deadline = time.monotonic() + args.delivery_timeout
+    while sum(len(s.latencies_ms) for s in subscribers) < expected and time.monotonic() < deadline:
+        await asyncio.sleep(0.05)
+    latencies = [ms for s in subscribers for ms in s.latencies_ms]
+    return {"expected": expected, "delivered": len(latencies), "latency_ms": summarize(latencies)}
+
+
+async def _storm(subscribers: List[Subscriber], standin: Optional[StandInProcess], publish: Publish,
+                 users: List[str], args, tag: str) -> dict:
+    rejoins_before = [len(s.rejoin_ms) for s in subscribers]
+    started_wall, started = time.time(), time.perf_counter()
+    if standin:
+        standin.stop()
+        await asyncio.sleep(args.down_ms / 1000)
+        await standin.start()
+    else:
+        for subscriber in subscribers:
+            subscriber.drop()
+    deadline = time.monotonic() + 120
+    while time.monotonic() < deadline and any(
+            len(s.rejoin_ms) == before for s, before in zip(subscribers, rejoins_before)):
+        await asyncio.sleep(0.1)
+    rejoin_ms = [s.rejoin_ms[-1] for s, before in zip(subscribers, rejoins_before) if len(s.rejoin_ms) > before]
+    attempts = [t for s in subscribers for t in s.attempts if t >= started_wall]
+    per_second = Counter(int(t - started_wall) for t in attempts)
+    result = {
+        "cause": "standin restart" if standin else "socket drop",
+        "rejoined": len(rejoin_ms),
+        "subscribers": len(subscribers),
+        "rejoin_ms": summarize(rejoin_ms),
+        "settled_s": round(time.perf_counter() - started, 2),
+        "attempts": len(attempts),
+        "peak_attempts_per_s": max(per_second.values(), default=0),
+        "attempts_per_s": [per_second.get(n, 0) for n in range(max(per_second, default=-1) + 1)],
+    }
+    if standin:
+        result["server_after"] = await standin.stats()
+    result["delivery_after"] = await _deliver(subscribers, publish, users, args, f"{tag}-storm")
+    return result
+
+
+async def run(args: argparse.Namespace) -> dict:
+    steps = sorted(int(s) for s in args.subscribers.split(",") if s.strip())
+    tag = f"bench-realtime-{uuid.uuid4().hex[:8]}"
+    browser_clients = args.clients == "browser"
+    on_standin = args.target == "standin" and not browser_clients
+    result: dict = {"clients": args.clients, "target": "app" if browser_clients else args.target, "steps": {}}
+
+    async with async_api.async_playwright() as pw:
+        request = await pw.request.new_context()
+        chromium: Optional[Browser] = None
+        rest: Optional[SupabaseRest] = None
+        standin: Optional[StandInProcess] = None
+        subscribers: list = []
+        try:
+            if on_standin:
+                standin = StandInProcess(request, args.port)
+                await standin.start()
+                publish: Publish = standin.publish
+                users = [f"bench-user-{n}" for n in range(args.users or steps[-1])]
+                url = socket_url(standin.url, "bench")
+            else:
+                rest = await SupabaseRest.open(pw)
+
+                async def publish(rows: List[dict]) -> None:
+                    await rest.insert("notificacion", rows)
+                chromium = await browser.launch(pw)
+                state = await browser.storage_state(chromium, "admin")
+                session = browser.supabase_session(state)
+                users = [session["user"]["id"]]
+                url = socket_url(config.SUPABASE_URL, config.SUPABASE_ANON_KEY)
+
+            def server_rss() -> Optional[float]:
+                return standin.rss_mb() if standin else process_rss_mb(args.server_pid) if args.server_pid else None
+
+            for size in steps:
+                rss_before = server_rss()
+                added = []
+                for _ in range(len(subscribers), size):
+                    n = len(subscribers)
+                    if browser_clients:
+                        added.append(await _open_page(chromium, state, users[0]))
+                    else:
+                        token = _fake_token(users[n % len(users)]) if standin else session["access_token"]
+                        subscriber = Subscriber(url, token, users[n % len(users)], args.jitter_ms)
+                        subscriber.start()
+                        added.append(subscriber)
+                    subscribers.append(added[-1])
+                    if len(added) % args.connect_concurrency == 0:
+                        await _wait_joined(added[-args.connect_concurrency:], 30)
+                entry: dict = {"joined": await _wait_joined(subscribers, 30),
+                               "join_ms": summarize(ms for s in added for ms in s.join_ms[:1])}
+                await asyncio.sleep(1)
+                rss_after = server_rss()
+                if rss_before is not None and rss_after is not None and added:
+                    entry["server_rss_mb"] = round(rss_after, 1)
+                    entry["server_kb_per_connection"] = round((rss_after - rss_before) * 1024 / len(added), 1)
+                if browser_clients:
+                    heaps = [await s.js_heap_mb() for s in subscribers]
+                    entry["page_js_heap_mb"] = summarize(heaps)
+
+                stats_before = await standin.stats() if standin else {}
+                entry["delivery"] = await _deliver(subscribers, publish, sorted({s.user_id for s in subscribers}),
+                                                   args, tag)
+                if standin:
+                    stats_after = await standin.stats()
+                    entry["server"] = {k: stats_after.get(k, 0) - stats_before.get(k, 0)
+                                       for k in ("changes", "rls_checks", "delivered")}
+                    entry["server"]["open_connections"] = stats_after["open_connections"]
+                result["steps"][str(size)] = entry
+
+            if not browser_clients and not args.no_storm:
+                result["storm"] = await _storm(subscribers, standin, publish,
+                                               sorted({s.user_id for s in subscribers}), args, tag)
+        finally:
+            for subscriber in subscribers:
+                if browser_clients:
+                    await subscriber.context.close()
+                else:
+                    await subscriber.stop()
+            if standin:
+                standin.stop()
+            if rest:
+                await rest.delete("notificacion", {"titulo": f"like.{tag}*"})
+                await rest.close()
+            if chromium:
+                await chromium.close()
+            await request.dispose()
+
+    deliveries = [e["delivery"] for e in result["steps"].values()]
+    if "storm" in result:
+        deliveries.append(result["storm"]["delivery_after"])
+    result["failed"] = any(d["delivered"] < d["expected"] for d in deliveries) or (
+        "storm" in result and result["storm"]["rejoined"] < result["storm"]["subscribers"])
+    return result
@@ -0,0 +1,113 @@
+"""Retry cost of a late TC015 failure, restarting vs resuming from checkpoints.
+
+TC015 as a ``bench.flows`` flow: log in as admin (modal dismissed), scroll
+the dashboard, open Reportes from the sidebar, export the full PDF report.
+``--fail-at`` injects a failure the first ``--fail-times`` times a step runs,
+the way a flaky export does, and the flow is run ``--runs`` times in each
+mode:
+
+* **restart**: no checkpoints, every retry starts over from the login page,
+* **resume**: checkpoints after each step, a retry reopens the last one.
+
+Reported per mode: total and retry time, the step each retry resumed from,
+and per-step durations.
+"""
+
+import argparse
+from collections import defaultdict
+from typing import Dict, List
+
+from playwright import async_api
+from playwright.async_api import Page, expect
+
+from .. import browser
+from ..flows import CheckpointStore, Flow, Step, run_flow
+from ..stats import summarize
+
+
+async def _login(page: Page) -> None:
+    await browser.login(page, "admin")
+
+
+async def _dashboard(page: Page) -> None:
+    await page.goto("/dashboard", wait_until="domcontentloaded", timeout=60000)
+    await browser.dismiss_novedades(page)
+    await page.mouse.wheel(0, 1200)
+    await page.wait_for_load_state("networkidle", timeout=30000)
+
+
+async def _reportes(page: Page) -> None:
+    await page.locator('[data-sidebar="sidebar"] a[href="/dashboard/admin/reportes"]').first.click()
+    await page.wait_for_url("**/dashboard/admin/reportes", timeout=30000)
+    await page.get_by_role("button", name="Exportar").first.wait_for(timeout=30000)
+
+
+async def _export(page: Page) -> None:
+    await page.get_by_role("button", name="Exportar").first.click()
+    await expect(page.get_by_text("Reporte PDF generado exitosamente").first).to_be_visible(timeout=60000)
+
+
+STEPS = (
+    Step("login", _login),
+    Step("dashboard_scroll", _dashboard),
+    Step("reportes", _reportes),
+    Step("export", _export),
+)
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--fail-at", default="export", choices=[s.name for s in STEPS])
+    parser.add_argument("--fail-times", type=int, default=1, help="injected failures per run")
+    parser.add_argument("--retries", type=int, default=2)
+
+
+def _flaky(step: Step, times: int) -> Step:
+    remaining = {"n": times}
+
+    async def action(page: Page) -> None:
+        if remaining["n"] > 0:
+            remaining["n"] -= 1
+            raise AssertionError(f"injected failure in {step.name}")
+        await step.action(page)
+
+    return step._replace(action=action)
+
+
+async def run(args: argparse.Namespace) -> dict:
+    result: dict = {"fail_at": args.fail_at, "fail_times": args.fail_times, "modes": {}}
+    async with async_api.async_playwright() as pw:
+        chromium = await browser.launch(pw)
+        try:
+            for mode in ("restart", "resume"):
+                runs: List[dict] = []
+                for n in range(args.runs):
+                    steps = [_flaky(s, args.fail_times) if s.name == args.fail_at else s for s in STEPS]
+                    store = CheckpointStore(f"retry-{mode}-{n}") if mode == "resume" else None
+                    try:
+                        runs.append(await run_flow(chromium, Flow("TC015", steps), store, args.retries))
+                    finally:
+                        if store:
+                            store.evict()
+
+                steps_ms: Dict[str, List[float]] = defaultdict(list)
+                for r in runs:
+                    for name, ms in r["steps_ms"].items():
+                        steps_ms[name].append(ms)
+                result["modes"][mode] = {
+                    "passed": sum(r["passed"] for r in runs),
+                    "wall_s": summarize(r["wall_s"] for r in runs),
+                    "retry_s": summarize(r["retry_s"] for r in runs),
+                    "resumed_from": sorted({a["resumed_from"] or "start" for r in runs for a in r["attempts"][1:]}),
+                    "steps_ms": {name: summarize(v) for name, v in steps_ms.items()},
+                    "errors": sorted({a["error"] for r in runs for a in r["attempts"] if "error" in a
+                                      and not a["error"].startswith("injected")}),
+                }
+        finally:
+            await chromium.close()
+
+    restart = result["modes"]["restart"]["retry_s"].get("p50")
+    resume = result["modes"]["resume"]["retry_s"].get("p50")
+    result["retry_speedup"] = round(restart / resume, 1) if restart and resume else None
+    result["failed"] = any(m["passed"] < args.runs for m in result["modes"].values())
+    return result
@@ -0,0 +1,120 @@
+"""Bulk-load a reproducible Peruvian CRM dataset (``bench.seed``) straight into Postgres.
+
+``--clientes`` clients (1M by default) with their proyectos, lotes, ventas,
+cuotas, agenda eventos and notificaciones, generated in chunks by
+``--workers`` processes, each streaming ``COPY`` into its own ``psql``
+(``bench.postgres``, ``BENCH_PG_URL``). The same ``--seed`` and
+``--anchor`` always give the same rows, so runs at different sizes or on
+different machines compare like with like.
+
+Vendedores are the active ``usuario_perfil`` rows (at least one must
+exist); ``codigo_cliente`` continues after the highest ``CLI-`` code and
+``crm.cliente_codigo_seq`` (what ``generar_codigo_cliente()`` draws from) is
+advanced past the seeded codes, so later inserts by the app do not collide.
+``--reset`` first deletes the rows of this seed, ``--drop`` only deletes
+them. Loading runs in replica mode, which needs a superuser connection
+and a disposable database: triggers and foreign keys are not checked.
+
+Reported: rows per table, load time, rows/s and the chunk/worker layout.
+"""
+
+import argparse
+import asyncio
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+
+from .. import postgres
+from ..seed import TABLES, Dataset, delete_sql, load_chunk
+from ..stats import stopwatch
+
+MAX_CODIGO = ("SELECT COALESCE(MAX(SUBSTRING(codigo_cliente FROM 'CLI-(\\d+)')::int), 0) "
+              "FROM crm.cliente WHERE codigo_cliente ~ '^CLI-\\d+$'")
+# GREATEST keeps the sequence where it is if the app already went past the seeded codes.
+SET_SEQUENCE = ("SELECT setval('crm.cliente_codigo_seq', "
+                "GREATEST((SELECT last_value FROM crm.cliente_codigo_seq), {last}))")
+VENDEDORES = ("SELECT id, username FROM crm.usuario_perfil "
+              "WHERE activo AND username IS NOT NULL ORDER BY username")
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--clientes", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--anchor", default="", help="ISO date the dataset is relative to (default: today)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 4)
+    parser.add_argument("--proyectos", type=int, default=40)
+    parser.add_argument("--buyer-ratio", type=float, default=0.1, help="share of clientes with a venta")
+    parser.add_argument("--eventos-per-cliente", type=float, default=1.5)
+    parser.add_argument("--notificaciones-per-cliente", type=float, default=0.5)
+    parser.add_argument("--reset", action="store_true", help="delete this seed's rows before loading")
+    parser.add_argument("--drop", action="store_true", help="only delete this seed's rows")
+    parser.add_argument("--no-analyze", action="store_true", help="skip ANALYZE after loading")
+
+
+def _delete(seed: int) -> dict:
+    with stopwatch() as timing:
+        for statement in delete_sql(seed):
+            postgres.query(statement)
+    return {"ms": round(timing["ms"], 1)}
+
+
+async def run(args: argparse.Namespace) -> dict:
+    result: dict = {"tag": f"seed{args.seed}"}
+    if args.reset or args.drop:
+        result["deleted"] = await asyncio.to_thread(_delete, args.seed)
+        if args.drop:
+            return result
+
+    vendedores = [(row[0], row[1]) for row in await asyncio.to_thread(postgres.query, VENDEDORES)]
+    if not vendedores:
+        result["error"] = "no active usuario_perfil with a username to assign clientes to"
+        result["failed"] = True
+        return result
+    max_codigo = int((await asyncio.to_thread(postgres.query, MAX_CODIGO))[0][0])
+
+    dataset = Dataset(
+        seed=args.seed,
+        clientes=args.clientes,
+        anchor=date.fromisoformat(args.anchor) if args.anchor else date.today(),
+        vendedores=vendedores,
+        proyectos=args.proyectos,
+        buyer_ratio=args.buyer_ratio,
+        eventos_per_cliente=args.eventos_per_cliente,
+        notificaciones_per_cliente=args.notificaciones_per_cliente,
+        codigo_start=max_codigo + 1,
+    )
+    jobs = dataset.chunks()
+    rows = dict.fromkeys(TABLES, 0)
+    loop = asyncio.get_running_loop()
+    try:
+        with stopwatch() as timing:
+            with ProcessPoolExecutor(max_workers=max(1, args.workers)) as pool:
+                # Proyectos first so a partial load still reads sensibly; nothing depends on the order.
+                counts = [await loop.run_in_executor(pool, load_chunk, dataset, jobs[0])]
+                counts += await asyncio.gather(*(loop.run_in_executor(pool, load_chunk, dataset, job)
+                                                 for job in jobs[1:]))
+    finally:
+        # Also after a failed load: the chunks that did commit hold codes up to the last one.
+        await asyncio.to_thread(postgres.query, SET_SEQUENCE.format(last=max_codigo + args.clientes))
+    for count in counts:
+        for table, n in count.items():
+            rows[table] += n
+    total = sum(rows.values())
+
+    if not args.no_analyze:
+        with stopwatch() as analyze:
+            await asyncio.to_thread(postgres.query, f"ANALYZE {', '.join(TABLES)}")
+        result["analyze_ms"] = round(analyze["ms"], 1)
+
+    result.update({
+        "anchor": dataset.anchor.isoformat(),
+        "vendedores": len(vendedores),
+        "codigo_cliente": [f"CLI-{dataset.codigo_start:06d}", f"CLI-{max_codigo + args.clientes:06d}"],
+        "rows": rows,
+        "total_rows": total,
+        "load_s": round(timing["ms"] / 1000, 2),
+        "rows_per_s": round(total / (timing["ms"] / 1000)) if timing["ms"] else None,
+        "chunks": len(jobs),
+        "workers": args.workers,
+    })
+    return result
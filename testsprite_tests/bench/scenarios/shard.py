@@ -0,0 +1,90 @@
+"""Shard the TC test plan across CI nodes (plan, run, merge).
+
+``plan`` prints (and writes to ``--dir``) the longest-first assignment of
+the cases in ``testsprite_frontend_test_plan.json`` to ``--shards`` nodes,
+using the recorded per-case durations (``BENCH_SHARD_HISTORY``).
+
+``run --shard K`` runs node K's cases through ``bench.tcrun`` (``--workers``
+at a time) and writes ``partial-KofN.json`` to ``--dir``; it uses
+``--dir/plan.json`` when present so every node follows the same plan, and
+otherwise computes it.
+
+``merge`` combines the partials into one report (missing shards, failed
+cases, per-shard wall time, imbalance, speedup over a serial run) and folds
+the new durations into the history for the next plan.
+"""
+
+import argparse
+import json
+import tempfile
+import time
+from pathlib import Path
+
+from .. import config, shards
+from ..load import gather_limited
+from ..tcrun import run_tc
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("action", choices=("plan", "run", "merge"))
+    parser.add_argument("--shards", type=int, help="number of nodes (default 2; merge infers it)")
+    parser.add_argument("--shard", type=int, help="1-based node index for run")
+    parser.add_argument("--dir", type=Path, default=config.RESULTS_DIR / "shards",
+                        help="where the plan and partial results live (shared between nodes)")
+    parser.add_argument("--workers", type=int, default=1, help="cases in parallel on this node")
+    parser.add_argument("--timeout", type=float, default=900.0, help="seconds per case")
+    parser.add_argument("--no-history", action="store_true", help="merge without updating durations")
+
+
+def _plan(args: argparse.Namespace) -> dict:
+    plan_file = args.dir / "plan.json"
+    if args.action == "run" and plan_file.exists():
+        existing = json.loads(plan_file.read_text(encoding="utf-8"))
+        if existing["shards"] == args.shards:
+            return existing
+    return shards.plan(shards.load_cases(), shards.load_history(), args.shards)
+
+
+async def _run_shard(args: argparse.Namespace, assignment: dict) -> dict:
+    if not args.shard or not 1 <= args.shard <= args.shards:
+        raise ValueError(f"--shard must be between 1 and {args.shards}")
+    scripts = {c["id"]: c["script"] for c in shards.load_cases() if c["script"]}
+    case_ids = assignment["assignment"][str(args.shard)]
+    started = time.monotonic()
+    with tempfile.TemporaryDirectory() as tmp:
+        outcomes = await gather_limited([
+            lambda case_id=case_id: run_tc(scripts[case_id], Path(tmp) / f"{case_id}.json", args.timeout)
+            for case_id in case_ids
+        ], args.workers)
+    partial = {
+        "shard": args.shard,
+        "shards": args.shards,
+        "wall_s": round(time.monotonic() - started, 1),
+        "predicted_s": assignment["predicted_seconds"][str(args.shard)],
+        "cases": {
+            case_id: {key: outcome.get(key) for key in ("passed", "error", "wall_s", "active_s")}
+            for case_id, outcome in zip(case_ids, outcomes)
+        },
+    }
+    args.dir.mkdir(parents=True, exist_ok=True)
+    shards.partial_path(args.dir, args.shard, args.shards).write_text(
+        json.dumps(partial, indent=2, ensure_ascii=False), encoding="utf-8")
+    return partial
+
+
+async def run(args: argparse.Namespace) -> dict:
+    if args.action == "merge":
+        report = shards.merge_partials(args.dir, args.shards, update_history=not args.no_history)
+        return {"action": "merge", **report,
+                "failed": bool(report["failed_cases"] or report["missing_shards"] or not report["partials"])}
+
+    args.shards = args.shards or 2
+    assignment = _plan(args)
+    if args.action == "plan":
+        args.dir.mkdir(parents=True, exist_ok=True)
+        (args.dir / "plan.json").write_text(json.dumps(assignment, indent=2), encoding="utf-8")
+        return {"action": "plan", **assignment}
+
+    partial = await _run_shard(args, assignment)
+    return {"action": "run", **partial,
+            "failed": any(not case["passed"] for case in partial["cases"].values())}
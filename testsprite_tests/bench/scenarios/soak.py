@@ -0,0 +1,216 @@
+"""Endurance run: TC journeys at a steady arrival rate with p95 drift alerts.
+
+Journeys start on a fixed schedule (``--rate`` per minute, open loop: a slow
+app does not slow the arrivals down) for ``--hours``, picked from ``--mix``:
+
+* ``login``: ``POST /api/auth/login-username`` (TC001),
+* ``dashboard``, ``clientes``, ``proyectos``, ``agenda``, ``reportes``:
+  page loads in a pool of ``--contexts`` logged-in browser pages, the routes
+  TC005/TC007/TC015/TC017/TC020 walk through (``clientes`` also runs a
+  search).
+
+Each journey records its service time and its response time measured from
+the scheduled start, so waiting for a free page (or a saturated server)
+shows up instead of being hidden. Every ``--step-minutes`` a monitor
+computes, per journey, the p95 of the last ``--window-minutes`` and compares
+it with the first full window after ``--warmup-minutes``; a ratio above
+``1 + --drift`` is an alert, printed as it happens and kept in the results
+(and the run fails). Errors per window and, with ``--server-pid``, the Next.js
+server's RSS are reported alongside, which is where connection pool
+exhaustion, cache growth or realtime channel buildup tend to show first.
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+import time
+from collections import defaultdict
+from typing import Dict, List, NamedTuple, Optional
+
+from playwright import async_api
+
+from .. import browser, config
+from ..memory import process_rss_mb
+from ..stats import percentile, summarize
+
+PAGE_JOURNEYS = {
+    "dashboard": ("/dashboard",),
+    "clientes": ("/dashboard/clientes", "/dashboard/clientes?q=Cliente"),
+    "proyectos": ("/dashboard/proyectos",),
+    "agenda": ("/dashboard/agenda",),
+    "reportes": ("/dashboard/admin/reportes",),
+}
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--hours", type=float, default=4.0)
+    parser.add_argument("--rate", type=float, default=30.0, help="journey arrivals per minute")
+    parser.add_argument("--mix", default="login=1,dashboard=3,clientes=3,proyectos=1,agenda=1,reportes=1")
+    parser.add_argument("--contexts", type=int, default=4, help="logged-in browser pages in the pool")
+    parser.add_argument("--window-minutes", type=float, default=15.0, help="rolling p95 window")
+    parser.add_argument("--step-minutes", type=float, default=5.0, help="how often the window is evaluated")
+    parser.add_argument("--warmup-minutes", type=float, default=5.0, help="excluded from the baseline window")
+    parser.add_argument("--drift", type=float, default=0.5, help="alert when p95 exceeds baseline by this share")
+    parser.add_argument("--min-samples", type=int, default=20, help="per journey and window")
+    parser.add_argument("--server-pid", type=int, help="Next.js server PID to sample RSS from")
+    parser.add_argument("--seed", type=int, default=40)
+
+
+class Sample(NamedTuple):
+    at: float          # seconds since start, when the journey finished
+    journey: str
+    response_ms: float  # from the scheduled start
+    service_ms: float   # from the moment it actually ran
+    ok: bool
+
+
+class DriftMonitor:
+    """Rolling p95 per journey against the first full window after warm-up."""
+
+    def __init__(self, args: argparse.Namespace):
+        self.window = args.window_minutes * 60
+        self.warmup = args.warmup_minutes * 60
+        self.drift = args.drift
+        self.min_samples = args.min_samples
+        self.samples: List[Sample] = []
+        self.baseline: Dict[str, float] = {}
+        self.windows: List[dict] = []
+        self.alerts: List[dict] = []
+
+    def evaluate(self, now: float, rss_mb: Optional[float]) -> None:
+        start = now - self.window
+        if start < self.warmup:
+            return
+        by_journey: Dict[str, List[Sample]] = defaultdict(list)
+        for sample in self.samples:
+            if start <= sample.at < now:
+                by_journey[sample.journey].append(sample)
+
+        entry = {"end_min": round(now / 60, 1), "server_rss_mb": round(rss_mb, 1) if rss_mb else None,
+                 "journeys": {}}
+        for journey, samples in sorted(by_journey.items()):
+            times = [s.response_ms for s in samples if s.ok]
+            stats = {"count": len(samples), "errors": sum(not s.ok for s in samples)}
+            if len(times) >= self.min_samples:
+                p95 = percentile(times, 95)
+                base = self.baseline.setdefault(journey, p95)
+                stats.update(p95_ms=round(p95, 1), drift=round(p95 / base, 2) if base else None)
+                if base and p95 > base * (1 + self.drift):
+                    alert = {"end_min": entry["end_min"], "journey": journey, "p95_ms": round(p95, 1),
+                             "baseline_p95_ms": round(base, 1), "drift": stats["drift"]}
+                    self.alerts.append(alert)
+                    print(f"[soak] p95 drift {journey}: {alert['p95_ms']} ms vs {alert['baseline_p95_ms']} ms "
+                          f"baseline ({alert['drift']}x) at {alert['end_min']} min", file=sys.stderr)
+            entry["journeys"][journey] = stats
+        self.windows.append(entry)
+
+
+async def _page_journey(page, urls) -> None:
+    for url in urls:
+        response = await page.goto(url, wait_until="load", timeout=60000)
+        if response is None or response.status >= 400:
+            raise RuntimeError(f"{url}: {response.status if response else 'no response'}")
+
+
+async def _login_journey(request) -> None:
+    response = await request.post("/api/auth/login-username", data={
+        "username": config.ADMIN_USERNAME, "password": config.ADMIN_PASSWORD,
+    })
+    await response.body()
+    if not response.ok:
+        raise RuntimeError(f"login-username: {response.status}")
+
+
+async def run(args: argparse.Namespace) -> dict:
+    rng = random.Random(args.seed)
+    mix = {kind.strip(): float(weight) for kind, weight in (part.split("=") for part in args.mix.split(","))}
+    unknown = set(mix) - set(PAGE_JOURNEYS) - {"login"}
+    if unknown:
+        raise ValueError(f"Unknown journeys {sorted(unknown)}")
+    monitor = DriftMonitor(args)
+    errors: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+
+    async with async_api.async_playwright() as pw:
+        chromium = await browser.launch(pw)
+        contexts = []
+        try:
+            state = await browser.storage_state(chromium, "admin")
+            request = await browser.api_context(pw, timeout=60_000)
+            pool: asyncio.Queue = asyncio.Queue()
+            for _ in range(args.contexts):
+                context = await browser.new_context(chromium, state)
+                contexts.append(context)
+                pool.put_nowait(await context.new_page())
+
+            started = time.monotonic()
+
+            async def journey(kind: str, scheduled: float) -> None:
+                page = None
+                try:
+                    if kind != "login":
+                        page = await pool.get()
+                    begun = time.monotonic()
+                    ok = True
+                    try:
+                        if page:
+                            await _page_journey(page, PAGE_JOURNEYS[kind])
+                        else:
+                            await _login_journey(request)
+                    except (async_api.Error, RuntimeError) as error:
+                        ok = False
+                        errors[kind][str(error).splitlines()[0][:120]] += 1
+                finally:
+                    if page:
+                        pool.put_nowait(page)
+                done = time.monotonic()
+                monitor.samples.append(Sample(done - started, kind, (done - scheduled) * 1000,
+                                              (done - begun) * 1000, ok))
+
+            async def watch() -> None:
+                step = args.step_minutes * 60
+                while True:
+                    await asyncio.sleep(step)
+                    rss = process_rss_mb(args.server_pid) if args.server_pid else None
+                    monitor.evaluate(time.monotonic() - started, rss)
+
+            watcher = asyncio.create_task(watch())
+            tasks = []
+            try:
+                total = int(args.rate * args.hours * 60)
+                interval = 60 / args.rate
+                for n in range(total):
+                    scheduled = started + n * interval
+                    await asyncio.sleep(max(0.0, scheduled - time.monotonic()))
+                    kind = rng.choices(list(mix), weights=list(mix.values()))[0]
+                    tasks.append(asyncio.create_task(journey(kind, scheduled)))
+                    tasks = [t for t in tasks if not t.done()]
+                await asyncio.gather(*tasks)
+            finally:
+                watcher.cancel()
+                await request.dispose()
+        finally:
+            for context in contexts:
+                await context.close()
+            await chromium.close()
+
+    by_journey: Dict[str, List[Sample]] = defaultdict(list)
+    for sample in monitor.samples:
+        by_journey[sample.journey].append(sample)
+    return {
+        "hours": args.hours,
+        "rate_per_minute": args.rate,
+        "mix": mix,
+        "journeys": {
+            kind: {
+                "response_ms": summarize(s.response_ms for s in samples if s.ok),
+                "service_ms": summarize(s.service_ms for s in samples if s.ok),
+                "errors": dict(errors[kind]),
+            }
+            for kind, samples in sorted(by_journey.items())
+        },
+        "baseline_p95_ms": {k: round(v, 1) for k, v in monitor.baseline.items()},
+        "windows": monitor.windows,
+        "alerts": monitor.alerts,
+        "failed": bool(monitor.alerts),
+    }
@@ -0,0 +1,193 @@
+"""Service worker cold vs warm start and offline reload (``src/app/sw.ts``).
+
+For each route and round, four loads:
+
+* **cold**: fresh context, no service worker, empty HTTP cache. After the
+  load the scenario waits for ``navigator.serviceWorker.ready`` (Serwist
+  installs and precaches on the first visit) and reports how long it took.
+* **warm_sw**: a new page in that same context, now controlled by the SW.
+* **warm_http**: a second load in a context with service workers blocked,
+  i.e. what a returning vendedor would get from the HTTP cache alone. The
+  difference with ``warm_sw`` is what the SW is actually worth.
+* **offline**: the context goes offline and the route is opened again.
+  ``sw.ts`` only falls back to ``/offline`` for public documents; dashboard
+  routes are ``NetworkOnly`` and are expected to fail with the browser error.
+
+Timing comes from the navigation entry (TTFB, DOMContentLoaded, load) plus
+wall time; bytes and request counts are split by where Chromium says each
+response came from (network, HTTP cache, SW cache storage, SW network).
+
+Serwist is disabled under ``next dev``: run against ``next build && next
+start``, otherwise ``sw_active`` is false and warm_sw equals warm_http.
+"""
+
+import argparse
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+from playwright import async_api
+from playwright.async_api import BrowserContext
+
+from .. import browser
+from ..stats import summarize
+
+CASES = ("cold", "warm_sw", "warm_http", "offline")
+NAV_TIMING_JS = """() => {
+  const nav = performance.getEntriesByType("navigation")[0];
+  if (!nav) return null;
+  return { ttfb: nav.responseStart, dcl: nav.domContentLoadedEventEnd, load: nav.loadEventEnd,
+           worker_start: nav.workerStart };
+}"""
+SW_READY_JS = """(timeout) => !("serviceWorker" in navigator) ? false : Promise.race([
+  navigator.serviceWorker.ready.then(() => true),
+  new Promise((resolve) => setTimeout(() => resolve(false), timeout)),
+])"""
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--routes", default="/,/auth/login,/dashboard,/dashboard/clientes")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--sw-timeout-ms", type=int, default=30000, help="wait for SW activation")
+
+
+class Traffic:
+    """Per-page CDP tally of responses and encoded bytes by source."""
+
+    def __init__(self):
+        self.source: Dict[str, str] = {}
+        self.bytes: Dict[str, int] = defaultdict(int)
+        self.requests: Dict[str, int] = defaultdict(int)
+
+    async def attach(self, context: BrowserContext, page) -> None:
+        cdp = await context.new_cdp_session(page)
+        await cdp.send("Network.enable")
+        cdp.on("Network.responseReceived", self._on_response)
+        cdp.on("Network.loadingFinished", self._on_finished)
+
+    def _on_response(self, event: dict) -> None:
+        response = event["response"]
+        if response.get("fromServiceWorker"):
+            source = "sw_" + response.get("serviceWorkerResponseSource", "unknown").replace("-", "_")
+        elif response.get("fromDiskCache") or response.get("fromPrefetchCache"):
+            source = "http_cache"
+        else:
+            source = "network"
+        self.source[event["requestId"]] = source
+        self.requests[source] += 1
+
+    def _on_finished(self, event: dict) -> None:
+        source = self.source.get(event["requestId"])
+        if source:
+            self.bytes[source] += int(event.get("encodedDataLength", 0))
+
+
+async def _load(context: BrowserContext, route: str) -> dict:
+    page = await context.new_page()
+    traffic = Traffic()
+    await traffic.attach(context, page)
+    entry: dict = {}
+    start = time.perf_counter()
+    try:
+        response = await page.goto(route, wait_until="load", timeout=60000)
+        entry["status"] = response.status if response else None
+        entry["offline_fallback"] = await page.get_by_role("heading", name="Sin conexión").count() > 0
+        entry["timing"] = await page.evaluate(NAV_TIMING_JS)
+    except async_api.Error as exc:
+        entry["error"] = str(exc).splitlines()[0]
+    entry["wall_ms"] = round((time.perf_counter() - start) * 1000, 1)
+    entry["bytes"] = dict(traffic.bytes)
+    entry["requests"] = dict(traffic.requests)
+    entry["page"] = page
+    return entry
+
+
+def _outcome(entry: dict) -> str:
+    if "error" in entry:
+        return "error"
+    return "offline_fallback" if entry["offline_fallback"] else f"status_{entry['status']}"
+
+
+def _report(entries: List[dict]) -> dict:
+    def metric(name: str) -> dict:
+        return summarize(e["timing"][name] for e in entries if e.get("timing"))
+
+    bytes_by_source: Dict[str, List[int]] = defaultdict(list)
+    requests_by_source: Dict[str, int] = defaultdict(int)
+    outcomes: Dict[str, int] = defaultdict(int)
+    for e in entries:
+        for source, value in e["bytes"].items():
+            bytes_by_source[source].append(value)
+        for source, count in e["requests"].items():
+            requests_by_source[source] += count
+        outcomes[_outcome(e)] += 1
+    return {
+        "wall_ms": summarize(e["wall_ms"] for e in entries),
+        "ttfb_ms": metric("ttfb"),
+        "dcl_ms": metric("dcl"),
+        "load_ms": metric("load"),
+        "bytes_per_load": {s: round(sum(v) / len(entries)) for s, v in sorted(bytes_by_source.items())},
+        "requests_per_load": {s: round(n / len(entries), 1) for s, n in sorted(requests_by_source.items())},
+        "outcomes": dict(outcomes),
+    }
+
+
+async def _round(chromium, route: str, state: Optional[str], sw_timeout_ms: int) -> dict:
+    loads: dict = {}
+    context = await browser.new_context(chromium, state, service_workers="allow")
+    try:
+        loads["cold"] = await _load(context, route)
+        start = time.perf_counter()
+        active = False
+        if "error" not in loads["cold"]:
+            active = await loads["cold"]["page"].evaluate(SW_READY_JS, sw_timeout_ms)
+        sw_ready_ms = (time.perf_counter() - start) * 1000
+        loads["warm_sw"] = await _load(context, route)
+        await context.set_offline(True)
+        loads["offline"] = await _load(context, route)
+    finally:
+        await context.close()
+
+    context = await browser.new_context(chromium, state, service_workers="block")
+    try:
+        await (await _load(context, route))["page"].close()
+        loads["warm_http"] = await _load(context, route)
+    finally:
+        await context.close()
+    return {"loads": loads, "sw_active": active, "sw_ready_ms": round(sw_ready_ms, 1) if active else None}
+
+
+async def run(args: argparse.Namespace) -> dict:
+    routes = [r.strip() for r in args.routes.split(",") if r.strip()]
+    result: dict = {"rounds": args.rounds, "routes": {}}
+
+    async with async_api.async_playwright() as pw:
+        chromium = await browser.launch(pw)
+        try:
+            state = await browser.storage_state(chromium, "admin")
+            for route in routes:
+                cases: Dict[str, List[dict]] = defaultdict(list)
+                ready: List[float] = []
+                active = False
+                for _ in range(args.rounds):
+                    outcome = await _round(chromium, route, state if route.startswith("/dashboard") else None,
+                                           args.sw_timeout_ms)
+                    active = active or outcome["sw_active"]
+                    if outcome["sw_ready_ms"] is not None:
+                        ready.append(outcome["sw_ready_ms"])
+                    for case, entry in outcome["loads"].items():
+                        entry.pop("page", None)
+                        cases[case].append(entry)
+
+                report = {case: _report(cases[case]) for case in CASES}
+                sw_load = report["warm_sw"]["load_ms"].get("p50")
+                http_load = report["warm_http"]["load_ms"].get("p50")
+                result["routes"][route] = {
+                    "sw_active": active,
+                    "sw_ready_after_cold_ms": summarize(ready),
+                    "warm_sw_vs_http_load_ratio": round(sw_load / http_load, 2) if sw_load and http_load else None,
+                    **report,
+                }
+        finally:
+            await chromium.close()
+    return result
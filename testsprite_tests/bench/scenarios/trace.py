@@ -0,0 +1,129 @@
+"""One distributed trace per TC flow: steps, browser requests, app spans and database calls.
+
+Runs compiled TC flows (``bench.compiler``, default TC020) with tracing on:
+a root span per case, a span per step and a client span with ``traceparent``
+per same-origin request. Start the app with
+``OTEL_EXPORTER_OTLP_ENDPOINT=http://127.0.0.1:<port>`` so ``src/lib/tracing.ts``
+parents Next's request, render and ``fetch`` spans on those client spans;
+``fetch`` spans to ``/rest/v1/`` are the Supabase (PostgREST) queries.
+
+Spans go to an in-process ``bench.standins.otlp`` collector on ``--port``
+(or to ``--collector``, any server with the stand-in's query API). After
+``--settle`` seconds for the app's batch exporter, the report gives per
+case and step the browser time, server time, database time and call count,
+the slowest request and the whole tree as text. ``server_linked`` is false
+when no app span joined the trace (app started without the endpoint).
+"""
+
+import argparse
+import asyncio
+import json
+import urllib.request
+from typing import Dict, List
+
+from playwright import async_api
+
+from .. import browser, compiler
+from ..flows import run_flows
+from ..standins.otlp import OtlpStandIn
+from ..tracing import CLIENT, SERVICE_NAME, render_tree
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--tc", default="TC020", help="comma-separated TC ids (default: TC020)")
+    parser.add_argument("--collector", default="", help="external collector URL instead of the in-process one")
+    parser.add_argument("--port", type=int, default=4318, help="port of the in-process collector")
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--retries", type=int, default=0)
+    parser.add_argument("--settle", type=float, default=2.0, help="seconds to wait for the app's span export")
+    parser.add_argument("--partial", action="store_true", help="also run cases with unmapped steps, skipping them")
+
+
+def _fetch_spans(collector: str, trace_id: str) -> List[dict]:
+    with urllib.request.urlopen(f"{collector}/v1/traces?trace_id={trace_id}", timeout=10) as response:
+        return json.loads(response.read())["spans"]
+
+
+def _is_db_call(span: dict) -> bool:
+    url = str(span["attributes"].get("http.url") or span["attributes"].get("url.full") or span["name"])
+    return "/rest/v1/" in url or "/rpc/" in url
+
+
+def breakdown(spans: List[dict]) -> Dict[str, dict]:
+    """Per step: browser, server and database time of the requests it made."""
+    children: Dict[str, List[dict]] = {}
+    for span in spans:
+        children.setdefault(span["parent_id"], []).append(span)
+
+    def descendants(span_id: str) -> List[dict]:
+        found = []
+        for child in children.get(span_id, []):
+            found.append(child)
+            found.extend(descendants(child["span_id"]))
+        return found
+
+    root = next((s for s in spans if s["service"] == SERVICE_NAME and not s["parent_id"]), None)
+    steps: Dict[str, dict] = {}
+    for step in sorted(children.get(root["span_id"], []) if root else [], key=lambda s: s["start_ns"]):
+        requests = [s for s in children.get(step["span_id"], []) if s["kind"] == CLIENT]
+        server = [s for r in requests for s in children.get(r["span_id"], []) if s["service"] != SERVICE_NAME]
+        db = [s for r in requests for s in descendants(r["span_id"])
+              if s["service"] != SERVICE_NAME and _is_db_call(s)]
+        slowest = max(requests, key=lambda s: s["ms"], default=None)
+        steps[step["name"]] = {
+            "ms": step["ms"],
+            "requests": len(requests),
+            "browser_ms": round(sum(r["ms"] for r in requests), 1),
+            "server_ms": round(sum(s["ms"] for s in server), 1),
+            "db_ms": round(sum(s["ms"] for s in db), 1),
+            "db_calls": len(db),
+            "slowest": {"name": slowest["name"], "ms": slowest["ms"]} if slowest else None,
+        }
+    return steps
+
+
+async def run(args: argparse.Namespace) -> dict:
+    wanted = {tc.strip().upper() for tc in args.tc.split(",") if tc.strip()}
+    compiled = [c for c in compiler.compile_plan() if not wanted or c["id"] in wanted]
+    runnable = [c for c in compiled
+                if (not c["unmapped"] or args.partial) and len(c["unmapped"]) < len(c["steps"])]
+    result: dict = {"runnable": [c["id"] for c in runnable]}
+    if not runnable:
+        result["failed"] = True
+        return result
+
+    standin = None if args.collector else OtlpStandIn(port=args.port).start()
+    collector = args.collector.rstrip("/") if args.collector else standin.url.rstrip("/")
+    try:
+        async with async_api.async_playwright() as pw:
+            chromium = await browser.launch(pw)
+            try:
+                runs = await run_flows(chromium, [compiler.to_flow(c) for c in runnable],
+                                       workers=args.workers, retries=args.retries, tracing=collector)
+            finally:
+                await chromium.close()
+        await asyncio.sleep(args.settle)
+
+        cases: Dict[str, dict] = {}
+        for case_id, flow_run in runs.items():
+            spans = await asyncio.to_thread(_fetch_spans, collector, flow_run["trace_id"])
+            server = [s for s in spans if s["service"] != SERVICE_NAME]
+            client_ids = {s["span_id"] for s in spans if s["service"] == SERVICE_NAME and s["kind"] == CLIENT}
+            cases[case_id] = {
+                "passed": flow_run["passed"],
+                "trace_id": flow_run["trace_id"],
+                "exported": flow_run["trace_exported"],
+                "spans": len(spans),
+                "server_spans": len(server),
+                "server_linked": any(s["parent_id"] in client_ids for s in server),
+                "steps": breakdown(spans),
+                "tree": render_tree(spans),
+            }
+    finally:
+        if standin:
+            standin.stop()
+
+    result["collector"] = collector
+    result["cases"] = cases
+    result["failed"] = any(not r["passed"] for r in runs.values())
+    return result
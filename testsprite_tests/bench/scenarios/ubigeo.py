@@ -0,0 +1,232 @@
+"""Cascading ubigeo selector: ``/api/ubigeo`` (CSV) vs ``/api/ubigeo-v2`` (crm tables) (TC007).
+
+Lookups follow a skewed, realistic distribution: departamentos by a fixed
+popularity order (Lima first), then the capital province/district of each
+level far more often than the rest (Zipf over the INEI codes). Two phases:
+
+* **api**: the same cascades against both families. v1 is what
+  ``UbicacionSelector`` does (three full lists, filtered in the browser); v2
+  asks per level (``?dep=``, ``?prov=``). Reported per level: latency,
+  payload bytes, ``Cache-Control``/``ETag``/Next cache headers, cold (first
+  request for a key) vs warm latency, ``304`` answers to ``If-None-Match``
+  and whether v2 returns the same items as the CSV files.
+* **ui**: the selector inside "Agregar Nuevo Proyecto" on
+  ``/dashboard/proyectos``: time until its data is loaded, then per level the
+  time to filter by a typed prefix and apply the selection. Every cascade
+  reloads the page in the same context, so the report also shows how many
+  ubigeo requests Chromium served from its HTTP cache.
+"""
+
+import argparse
+import random
+import time
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+from playwright import async_api
+from playwright.async_api import Page
+
+from .. import browser
+from ..load import gather_limited
+from ..stats import summarize
+from ..ubigeo import Ubigeo
+
+HEADERS = ("cache-control", "etag", "last-modified", "age", "x-nextjs-cache", "x-vercel-cache")
+
+INPUT = 'input[aria-controls$="-{level}"]'
+OPTION = '[id$="-{level}"] [role="option"]'
+LEVELS = ("departamentos", "provincias", "distritos")
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--lookups", type=int, default=300, help="cascades per family in the api phase")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--zipf", type=float, default=1.2, help="skew within each level")
+    parser.add_argument("--ui-cascades", type=int, default=10)
+    parser.add_argument("--skip-ui", action="store_true")
+    parser.add_argument("--seed", type=int, default=7)
+
+
+class LevelStats:
+    def __init__(self):
+        self.cold: List[float] = []
+        self.warm: List[float] = []
+        self.bytes: List[int] = []
+        self.status: Dict[str, int] = defaultdict(int)
+        self.headers: Dict[str, str] = {}
+        self.revalidated_304 = 0
+        self.mismatches: List[str] = []
+        self.seen: set = set()
+
+    def report(self) -> dict:
+        return {
+            "cold_ms": summarize(self.cold),
+            "warm_ms": summarize(self.warm),
+            "payload_bytes": summarize(self.bytes),
+            "status": dict(self.status),
+            "cache_headers": self.headers,
+            "revalidated_304": self.revalidated_304,
+            "mismatches": self.mismatches[:20],
+        }
+
+
+async def _fetch(request, stats: LevelStats, url: str, expected=None) -> None:
+    start = time.perf_counter()
+    response = await request.get(url)
+    body = await response.body()
+    ms = (time.perf_counter() - start) * 1000
+    (stats.warm if url in stats.seen else stats.cold).append(ms)
+    stats.seen.add(url)
+    stats.bytes.append(len(body))
+    stats.status[str(response.status)] += 1
+    stats.headers = {h: response.headers[h] for h in HEADERS if h in response.headers}
+
+    etag = response.headers.get("etag")
+    if etag:
+        again = await request.get(url, headers={"If-None-Match": etag})
+        stats.revalidated_304 += again.status == 304
+    if expected is not None and response.ok:
+        got = sorted((item["code"], item.get("nombre") or item.get("name")) for item in await response.json())
+        if got != sorted(expected) and url not in stats.mismatches:
+            stats.mismatches.append(url)
+
+
+async def _api_phase(request, tree: Ubigeo, cascades, concurrency: int) -> dict:
+    v1 = {level: LevelStats() for level in LEVELS}
+    v2 = {level: LevelStats() for level in LEVELS}
+
+    def v1_cascade():
+        # The selector fetches the three complete lists on every mount.
+        return [lambda level=level: _fetch(request, v1[level], f"/api/ubigeo/{level}") for level in LEVELS]
+
+    def v2_cascade(dep, prov):
+        return [
+            lambda: _fetch(request, v2["departamentos"], "/api/ubigeo-v2/departamentos",
+                           list(tree.departamentos.items())),
+            lambda: _fetch(request, v2["provincias"], f"/api/ubigeo-v2/provincias?dep={dep}",
+                           tree.provincias[dep]),
+            lambda: _fetch(request, v2["distritos"], f"/api/ubigeo-v2/distritos?prov={prov}",
+                           tree.distritos[prov]),
+        ]
+
+    async def run_family(build) -> float:
+        async def cascade(args):
+            for step in build(*args):
+                await step()
+
+        start = time.perf_counter()
+        await gather_limited([lambda c=c: cascade(c) for c in cascades], concurrency)
+        return time.perf_counter() - start
+
+    v1_seconds = await run_family(lambda dep, prov, dist: v1_cascade())
+    v2_seconds = await run_family(lambda dep, prov, dist: v2_cascade(dep, prov))
+
+    def family(levels: Dict[str, LevelStats], seconds: float) -> dict:
+        per_cascade = sum(sum(s.bytes) for s in levels.values()) / max(1, len(cascades))
+        return {
+            "levels": {name: s.report() for name, s in levels.items()},
+            "cascades_per_second": round(len(cascades) / seconds, 1) if seconds else 0.0,
+            "bytes_per_cascade": round(per_cascade),
+        }
+
+    return {"v1": family(v1, v1_seconds), "v2": family(v2, v2_seconds)}
+
+
+async def _pick(page: Page, level: str, name: str) -> Tuple[float, float]:
+    """Type a prefix and click the option; returns (filter_ms, apply_ms)."""
+    field = page.locator(INPUT.format(level=level))
+    option = page.locator(OPTION.format(level=level)).filter(has_text=name).first
+    start = time.perf_counter()
+    await field.click()
+    await field.fill(name[:3])
+    await option.wait_for(state="visible", timeout=15000)
+    filtered = time.perf_counter()
+    await option.click()
+    await page.wait_for_function(
+        "([sel, name]) => document.querySelector(sel)?.value === name",
+        arg=[INPUT.format(level=level), name], timeout=15000,
+    )
+    return (filtered - start) * 1000, (time.perf_counter() - filtered) * 1000
+
+
+async def _ui_phase(chromium, state: str, tree: Ubigeo, cascades) -> dict:
+    context = await browser.new_context(chromium, state)
+    page = await context.new_page()
+    cdp = await context.new_cdp_session(page)
+    await cdp.send("Network.enable")
+    urls: Dict[str, str] = {}
+    from_cache: Dict[str, int] = defaultdict(int)
+    requests_seen: Dict[str, int] = defaultdict(int)
+
+    def on_request_sent(event: dict) -> None:
+        urls[event["requestId"]] = event["request"]["url"]
+
+    def on_served_from_cache(event: dict) -> None:
+        url = urls.get(event["requestId"], "")
+        if "/api/ubigeo" in url:
+            from_cache[url.split("/api/")[1]] += 1
+
+    def on_request(req) -> None:
+        if "/api/ubigeo" in req.url:
+            requests_seen[req.url.split("/api/")[1]] += 1
+
+    cdp.on("Network.requestWillBeSent", on_request_sent)
+    cdp.on("Network.requestServedFromCache", on_served_from_cache)
+    page.on("request", on_request)
+
+    loaded: List[float] = []
+    timings = {level: {"filter": [], "apply": []} for level in LEVELS}
+    try:
+        for dep, prov, dist in cascades:
+            await page.goto("/dashboard/proyectos", wait_until="domcontentloaded", timeout=60000)
+            await browser.dismiss_novedades(page)
+            start = time.perf_counter()
+            async with page.expect_response(lambda r: r.url.endswith("/api/ubigeo/distritos"), timeout=60000):
+                await page.get_by_text("Agregar Nuevo Proyecto").click()
+            await page.locator(INPUT.format(level="departamentos")).wait_for(timeout=30000)
+            loaded.append((time.perf_counter() - start) * 1000)
+
+            names = {
+                "departamentos": tree.departamentos[dep],
+                "provincias": dict(tree.provincias[dep])[prov],
+                "distritos": dict(tree.distritos[prov])[dist],
+            }
+            for level in LEVELS:
+                filter_ms, apply_ms = await _pick(page, level, names[level])
+                timings[level]["filter"].append(filter_ms)
+                timings[level]["apply"].append(apply_ms)
+    finally:
+        await context.close()
+
+    return {
+        "data_loaded_ms": summarize(loaded),
+        "levels": {level: {k: summarize(v) for k, v in t.items()} for level, t in timings.items()},
+        "requests": dict(requests_seen),
+        "served_from_http_cache": dict(from_cache),
+    }
+
+
+async def run(args: argparse.Namespace) -> dict:
+    rng = random.Random(args.seed)
+    tree = Ubigeo()
+    cascades = [tree.sample(rng, args.zipf) for _ in range(args.lookups)]
+    result: dict = {
+        "lookups": args.lookups,
+        "distinct_provincias": len({c[1] for c in cascades}),
+        "distinct_distritos": len({c[2] for c in cascades}),
+    }
+
+    async with async_api.async_playwright() as pw:
+        chromium = await browser.launch(pw)
+        try:
+            state = await browser.storage_state(chromium, "admin")
+            request = await browser.api_context(pw, state)
+            try:
+                result["api"] = await _api_phase(request, tree, cascades, args.concurrency)
+            finally:
+                await request.dispose()
+            if not args.skip_ui:
+                result["ui"] = await _ui_phase(chromium, state, tree, cascades[:args.ui_cascades])
+        finally:
+            await chromium.close()
+    return result
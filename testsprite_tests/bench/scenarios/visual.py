@@ -0,0 +1,135 @@
+"""Visual regression of the dashboard and report charts (TC015/TC020).
+
+The TC scripts only assert texts such as "Dashboard" or "Analizar reportes",
+so an empty chart or a blank map passes. This scenario logs in as admin,
+opens each check page and screenshots its regions (every Recharts wrapper,
+the project map with ``--proyecto``), waiting until two consecutive
+captures are byte-identical so chart animations have settled.
+
+Captures are compared by ``bench.visual`` in a pool of ``--workers``
+comparison pages while the next page is being captured: sha256 first, then
+a 64-bit dHash, and a full pixel diff only when the hash moved by more than
+``--threshold`` bits. Baselines are content-addressed under
+``BENCH_VISUAL_DIR``; the first run (or ``--update``) records them.
+"""
+
+import argparse
+import asyncio
+import time
+from typing import Dict, List, NamedTuple
+
+from playwright import async_api
+from playwright.async_api import Locator, Page
+
+from .. import browser, config
+from ..stats import summarize
+from ..visual import ComparePool, Store
+
+
+class Check(NamedTuple):
+    name: str
+    path: str
+    regions: Dict[str, str]
+
+
+CHECKS = (
+    Check("dashboard", "/dashboard", {"chart": ".recharts-wrapper"}),
+    Check("reportes", "/dashboard/admin/reportes", {"chart": ".recharts-wrapper"}),
+)
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--workers", type=int, default=4, help="comparison pages")
+    parser.add_argument("--threshold", type=int, default=0, help="dHash bits allowed before a pixel diff")
+    parser.add_argument("--tolerance", type=int, default=16, help="per-channel difference ignored by the pixel diff")
+    parser.add_argument("--max-ratio", type=float, default=0.001, help="share of changed pixels that fails a region")
+    parser.add_argument("--proyecto", default="", help="proyecto id whose map is also checked")
+    parser.add_argument("--mask", action="append", default=[], help="selector painted over before capture")
+    parser.add_argument("--update", action="store_true", help="record the current captures as baselines")
+    parser.add_argument("--prune", action="store_true", help="delete objects no baseline points to")
+
+
+async def _stable_screenshot(locator: Locator, masks: List[Locator], tries: int = 6) -> bytes:
+    previous = b""
+    for _ in range(tries):
+        png = await locator.screenshot(animations="disabled", caret="hide", mask=masks, timeout=15000)
+        if png == previous:
+            break
+        previous = png
+        await asyncio.sleep(0.25)
+    return previous
+
+
+async def _capture(page: Page, check: Check, pool: ComparePool, masks: List[str]) -> Dict[str, float]:
+    await page.goto(check.path, wait_until="load", timeout=60000)
+    await browser.dismiss_novedades(page)
+    await page.wait_for_load_state("networkidle", timeout=30000)
+    timings: Dict[str, float] = {}
+    for region, selector in check.regions.items():
+        try:
+            await page.locator(selector).first.wait_for(timeout=30000)
+        except async_api.Error:
+            pool.outcomes.append({"key": f"{check.name}/{region}@{config.PROFILE}", "status": "missing",
+                                  "selector": selector})
+            continue
+        locators = await page.locator(selector).all()
+        for n, locator in enumerate(locators):
+            key = f"{check.name}/{region}-{n}@{config.PROFILE}"
+            start = time.perf_counter()
+            await locator.scroll_into_view_if_needed()
+            png = await _stable_screenshot(locator, [page.locator(m) for m in masks])
+            timings[key] = round((time.perf_counter() - start) * 1000, 1)
+            pool.submit(key, png)
+    return timings
+
+
+async def run(args: argparse.Namespace) -> dict:
+    checks = list(CHECKS)
+    if args.proyecto:
+        checks.append(Check("proyecto-mapa", f"/dashboard/proyectos/{args.proyecto}", {"map": ".gm-style"}))
+
+    store = Store()
+    stamp = time.strftime("%Y%m%dT%H%M%S")
+    capture_ms: Dict[str, float] = {}
+    async with async_api.async_playwright() as pw:
+        chromium = await browser.launch(pw)
+        try:
+            pool = ComparePool(chromium, store, config.RESULTS_DIR / "visual-diffs" / stamp, args.workers,
+                               args.threshold, args.tolerance, args.max_ratio, args.update)
+            await pool.start()
+            state = await browser.storage_state(chromium, "admin")
+            context = await browser.new_context(chromium, state)
+            started = time.perf_counter()
+            try:
+                page = await context.new_page()
+                for check in checks:
+                    capture_ms.update(await _capture(page, check, pool, args.mask))
+            finally:
+                await context.close()
+                captured = time.perf_counter()
+                outcomes = await pool.drain()
+            drain_ms = (time.perf_counter() - captured) * 1000
+        finally:
+            await chromium.close()
+
+    levels: Dict[str, int] = {}
+    statuses: Dict[str, int] = {}
+    for outcome in outcomes:
+        statuses[outcome["status"]] = statuses.get(outcome["status"], 0) + 1
+        if "level" in outcome:
+            levels[outcome["level"]] = levels.get(outcome["level"], 0) + 1
+    result = {
+        "profile": config.PROFILE,
+        "regions": {o["key"]: {k: v for k, v in o.items() if k != "key"} for o in outcomes},
+        "statuses": statuses,
+        "decided_at": levels,
+        "capture_ms": summarize(capture_ms.values()),
+        "compare_ms": summarize(o["compare_ms"] for o in outcomes if "compare_ms" in o),
+        "wall_s": round(captured - started, 2),
+        # Comparison time left once capturing was done: what the pool adds to the run.
+        "drain_ms": round(drain_ms, 1),
+    }
+    if args.prune:
+        result["pruned_objects"] = store.prune()
+    result["failed"] = any(o["status"] in ("changed", "missing", "error") for o in outcomes)
+    return result
@@ -0,0 +1,375 @@
+"""Reproducible Peruvian CRM datasets for the scale scenarios.
+
+:class:`Dataset` describes ``clientes`` clients and everything hanging off
+them: ``proyectos`` with their ``lote`` rows, a ``venta`` (with its
+``cuota`` schedule) for every ``1 / buyer_ratio``-th client, ``evento`` rows
+on the vendedores' agendas and ``notificacion`` rows for the assignments.
+Values follow what the app stores:
+
+* DNI: 8 digits, RUC: 11 digits with the SUNAT check digit (``20`` for
+  companies, ``10`` + DNI for personas with a business). Both come from a
+  bijection of the row index, so they are unique without bookkeeping,
+* phones as ``+51 9XX XXX XXX`` plus ``telefono_e164``,
+* ``direccion`` with INEI ubigeo codes and names (``bench.ubigeo``, skewed
+  towards Lima and provincial capitals),
+* ``codigo_cliente`` continuing the ``CLI-NNNNNN`` sequence, lote
+  ``estado`` and cliente ``estado_cliente`` / ``saldo_pendiente`` matching
+  the ventas and cuotas, since the triggers that maintain them are skipped.
+
+Rows are generated in fixed-size chunks, each from its own ``Random(seed,
+table, chunk)`` and with ids derived from ``(seed, table, index)``, so the
+same seed and ``anchor`` date give the same rows whatever the number of
+worker processes. Every row carries the dataset tag (``seed<N>``) in an
+e-mail, code, name, tag array or ``data`` key, and :func:`delete_sql`
+removes exactly those rows.
+"""
+
+import hashlib
+import math
+import random
+import uuid
+from dataclasses import dataclass, field
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+
+from .postgres import Copy, pg_array
+from .ubigeo import Ubigeo
+
+CHUNK = 20000
+
+NOMBRES = (
+    "José", "Luis", "Carlos", "Juan", "Jorge", "Miguel", "César", "Víctor", "Manuel", "Pedro", "Ricardo", "Raúl",
+    "Alberto", "Javier", "Fernando", "Eduardo", "Diego", "Renzo", "Paolo", "Christian",
+    "María", "Rosa", "Carmen", "Ana", "Julia", "Elena", "Luz", "Milagros", "Patricia", "Gladys", "Sonia", "Ruth",
+    "Flor", "Yolanda", "Karina", "Lucía", "Andrea", "Fiorella", "Katherine", "Rocío",
+)
+APELLIDOS = (
+    "Quispe", "Flores", "Sánchez", "Rodríguez", "García", "Rojas", "Mamani", "Huamán", "Chávez", "Ramírez",
+    "Torres", "Vásquez", "Mendoza", "Díaz", "Castillo", "Ramos", "López", "Gutiérrez", "Espinoza", "Pérez",
+    "Vargas", "Condori", "Romero", "Castro", "Cruz", "Gonzales", "Salazar", "Reyes", "Ccori", "Paredes",
+    "Huanca", "Silva", "Córdova", "Cárdenas", "Morales", "Fernández", "Herrera", "Medina", "Aguilar", "Ticona",
+)
+RUBROS = ("Inversiones", "Constructora", "Inmobiliaria", "Corporación", "Negociaciones", "Agroindustrial",
+          "Servicios Generales", "Comercial", "Transportes", "Consultora")
+RAZONES = ("Andina", "del Sur", "Pacífico", "Los Andes", "Norte Chico", "Amazonía", "Santa Rosa", "El Sol",
+           "San Martín", "Kallpa", "Inti", "Los Olivos", "Chavín", "Wari", "Qhapaq")
+VIAS = ("Av.", "Jr.", "Calle", "Psje.", "Mz.")
+CALLES = ("Los Próceres", "Grau", "Arequipa", "Túpac Amaru", "Huáscar", "San Martín", "Bolognesi",
+          "Los Álamos", "Las Flores", "Próceres de la Independencia", "La Marina", "Universitaria")
+PROYECTO_TIPOS = ("Residencial", "Condominio", "Urbanización", "Villa", "Eco Lotes")
+ESTADOS_CLIENTE = (("por_contactar", 35), ("contactado", 25), ("intermedio", 12), ("potencial", 12),
+                   ("desestimado", 10), ("transferido", 6))
+ORIGENES = ("web", "recomendacion", "feria", "campaña_facebook", "facebook_ads", "whatsapp_web",
+            "redes_sociales", "referido", "publicidad", "otro")
+INTERESES = ("lotes", "lotes", "lotes", "casas", "terrenos", "departamentos")
+FORMAS_PAGO = ("contado", "financiacion", "credito_bancario", "mixto")
+EVENTO_TIPOS = ("cita", "llamada", "email", "visita", "seguimiento", "recordatorio", "tarea")
+PRIORIDADES = ("baja", "media", "alta", "urgente")
+PLAZOS = (12, 24, 36, 48, 60)
+PRECIO_M2 = (180, 250, 320, 450, 600)
+
+COLUMNS = {
+    "crm.proyecto": ("id", "nombre", "tipo", "estado", "ubicacion", "descripcion", "created_by", "created_at",
+                     "updated_at"),
+    "crm.lote": ("id", "proyecto_id", "codigo", "sup_m2", "precio", "moneda", "estado", "created_by",
+                 "created_at", "updated_at"),
+    "crm.cliente": ("id", "codigo_cliente", "nombre", "tipo_cliente", "tipo_documento", "documento_identidad",
+                    "email", "telefono", "telefono_whatsapp", "telefono_e164", "direccion", "estado_cliente",
+                    "origen_lead", "interes_principal", "capacidad_compra_estimada", "forma_pago_preferida",
+                    "propiedades_compradas", "saldo_pendiente", "vendedor_asignado", "created_by", "fecha_alta",
+                    "created_at", "updated_at"),
+    "crm.venta": ("id", "codigo_venta", "cliente_id", "lote_id", "vendedor_username", "precio_total", "moneda",
+                  "forma_pago", "numero_cuotas", "fecha_venta", "estado", "created_at", "updated_at"),
+    "crm.cuota": ("id", "venta_id", "numero_cuota", "tipo", "monto_programado", "monto_pagado", "moneda",
+                  "fecha_vencimiento", "fecha_pago", "estado", "created_at", "updated_at"),
+    "crm.evento": ("id", "titulo", "tipo", "estado", "prioridad", "fecha_inicio", "fecha_fin", "duracion_minutos",
+                   "vendedor_id", "cliente_id", "created_by", "etiquetas", "created_at", "updated_at"),
+    "crm.notificacion": ("id", "usuario_id", "tipo", "titulo", "mensaje", "leida", "data", "created_at",
+                         "updated_at"),
+}
+# Load order only matters for readers of a half-loaded dataset; constraints are not checked.
+TABLES = tuple(COLUMNS)
+
+_RUC_WEIGHTS = (5, 4, 3, 2, 7, 6, 5, 4, 3, 2)
+_DNI_STEP = 48271  # coprime with the 70M DNI range, so index -> DNI is a bijection
+_UBIGEO: Optional[Ubigeo] = None
+
+
+def ruc_check_digit(first_ten: str) -> str:
+    """SUNAT modulo-11 check digit for the first 10 RUC digits."""
+    digit = 11 - sum(int(d) * w for d, w in zip(first_ten, _RUC_WEIGHTS)) % 11
+    return str(digit - 10 if digit >= 10 else digit)
+
+
+def ruc(prefix: str, body: int) -> str:
+    first_ten = f"{prefix}{body:08d}"
+    return first_ten + ruc_check_digit(first_ten)
+
+
+def phone(rng: random.Random) -> Tuple[str, str]:
+    """Mobile number as typed in the app (``+51 9XX XXX XXX``) and in E.164."""
+    digits = f"9{rng.randrange(10 ** 8):08d}"
+    return f"+51 {digits[:3]} {digits[3:6]} {digits[6:]}", f"+51{digits}"
+
+
+def _months_later(day: date, months: int) -> date:
+    month = day.month - 1 + months
+    return date(day.year + month // 12, month % 12 + 1, min(day.day, 28))
+
+
+def _ubigeo() -> Ubigeo:
+    global _UBIGEO
+    if _UBIGEO is None:
+        _UBIGEO = Ubigeo()
+    return _UBIGEO
+
+
+@dataclass
+class Dataset:
+    seed: int
+    clientes: int
+    anchor: date
+    vendedores: List[Tuple[str, str]]  # (user id, username)
+    proyectos: int = 40
+    buyer_ratio: float = 0.1
+    sold_ratio: float = 0.7
+    eventos_per_cliente: float = 1.5
+    notificaciones_per_cliente: float = 0.5
+    span_days: int = 720
+    paid_ratio: float = 0.85
+    zipf: float = 1.2
+    codigo_start: int = 1
+    _prefixes: Dict[str, int] = field(default_factory=dict, repr=False)
+
+    @property
+    def tag(self) -> str:
+        return f"seed{self.seed}"
+
+    @property
+    def stride(self) -> int:
+        return max(1, round(1 / self.buyer_ratio)) if self.buyer_ratio > 0 else 0
+
+    @property
+    def ventas(self) -> int:
+        return math.ceil(self.clientes / self.stride) if self.stride else 0
+
+    @property
+    def lotes(self) -> int:
+        return max(self.proyectos, math.ceil(self.ventas / self.sold_ratio))
+
+    # -- identities ------------------------------------------------------------------------------
+
+    def row_id(self, table: str, index: int) -> str:
+        """Stable UUID for row ``index`` of ``table`` in this dataset."""
+        prefix = self._prefixes.get(table)
+        if prefix is None:
+            digest = hashlib.sha256(f"{self.seed}:{table}".encode()).digest()
+            prefix = self._prefixes[table] = int.from_bytes(digest[:8], "big")
+        return str(uuid.UUID(int=(prefix << 64) | index, version=4))
+
+    def rng(self, table: str, chunk: int) -> random.Random:
+        return random.Random(f"{self.seed}:{table}:{chunk}")
+
+    def dni(self, index: int) -> str:
+        return str(10_000_000 + (index * _DNI_STEP + self.seed) % 70_000_000)
+
+    def _moment(self, rng: random.Random, days_back: int) -> datetime:
+        start = datetime.combine(self.anchor, time(8), timezone.utc)
+        return start - timedelta(seconds=rng.randrange(max(1, days_back) * 86400))
+
+    def _vendedor(self, index: int) -> Tuple[str, str]:
+        return self.vendedores[index % len(self.vendedores)]
+
+    # -- chunks ----------------------------------------------------------------------------------
+
+    def chunks(self) -> List[Tuple[str, int]]:
+        """Independent jobs: ``("proyectos", 0)``, ``("clientes", k)`` and ``("lotes", k)`` for unsold lotes."""
+        jobs = [("proyectos", 0)]
+        jobs += [("clientes", k) for k in range(math.ceil(self.clientes / CHUNK))]
+        jobs += [("lotes", k) for k in range(math.ceil((self.lotes - self.ventas) / CHUNK))]
+        return jobs
+
+    def proyecto_rows(self):
+        rng = self.rng("proyecto", 0)
+        tree = _ubigeo()
+        for k in range(self.proyectos):
+            dep, prov, dist = tree.sample(rng, self.zipf)
+            created = self._moment(rng, self.span_days * 2)
+            names = tree.names[dist].title(), tree.names[prov].title(), tree.names[dep].title()
+            yield (self.row_id("proyecto", k), f"{PROYECTO_TIPOS[k % len(PROYECTO_TIPOS)]} {names[0]} {k + 1} "
+                   f"[{self.tag}]", "propio", "activo" if rng.random() < 0.9 else "pausado", ", ".join(names),
+                   f"Ubigeo {dist}", self.vendedores[0][0], created, created)
+
+    def _lote(self, index: int, rng: random.Random, estado: str, created: datetime) -> tuple:
+        proyecto = index % self.proyectos
+        position = index // self.proyectos
+        manzana = ""
+        block = position // 40
+        while True:
+            manzana = chr(65 + block % 26) + manzana
+            block = block // 26 - 1
+            if block < 0:
+                break
+        area = rng.randrange(90, 300)
+        precio = area * PRECIO_M2[proyecto % len(PRECIO_M2)]
+        return (self.row_id("lote", index), self.row_id("proyecto", proyecto), f"{manzana}-{position % 40 + 1}", area,
+                precio, "PEN", estado, self.vendedores[0][0], created, created)
+
+    def lote_rows(self, chunk: int):
+        """Unsold lotes (indexes past the ventas)."""
+        rng = self.rng("lote", chunk)
+        first = self.ventas + chunk * CHUNK
+        for index in range(first, min(self.lotes, first + CHUNK)):
+            estado = "reservado" if rng.random() < 0.1 else "disponible"
+            yield self._lote(index, rng, estado, self._moment(rng, self.span_days * 2))
+
+    def write_clientes(self, chunk: int, copies: Dict[str, Copy]) -> None:
+        """Clientes of ``chunk`` and their sold lotes, ventas, cuotas, eventos and notificaciones."""
+        rng = self.rng("cliente", chunk)
+        tree = _ubigeo()
+        tag, anchor = self.tag, self.anchor
+        estados = [e for e, _ in ESTADOS_CLIENTE]
+        estado_weights = [w for _, w in ESTADOS_CLIENTE]
+        cliente, lote, venta = copies["crm.cliente"], copies["crm.lote"], copies["crm.venta"]
+        cuota, evento, notificacion = copies["crm.cuota"], copies["crm.evento"], copies["crm.notificacion"]
+        # Agendas reach a month past the anchor date.
+        horizon = datetime.combine(anchor + timedelta(days=30), time(18), timezone.utc)
+        first = chunk * CHUNK
+        for i in range(first, min(self.clientes, first + CHUNK)):
+            cliente_id = self.row_id("cliente", i)
+            vendedor_id, vendedor = self._vendedor(i)
+            created = self._moment(rng, self.span_days)
+            dep, prov, dist = tree.sample(rng, self.zipf)
+            if rng.random() < 0.15:
+                nombre = f"{rng.choice(RUBROS)} {rng.choice(RAZONES)} {rng.choice(('S.A.C.', 'S.A.', 'E.I.R.L.'))}"
+                tipo, tipo_documento, documento = "empresa", "ruc", ruc("20", (i * _DNI_STEP + self.seed) % 10 ** 8)
+            else:
+                nombre = f"{rng.choice(NOMBRES)} {rng.choice(APELLIDOS)} {rng.choice(APELLIDOS)}"
+                tipo, tipo_documento, documento = "persona", "dni", self.dni(i)
+                if rng.random() < 0.05:
+                    tipo_documento, documento = "ruc", ruc("10", int(documento))
+            telefono, e164 = phone(rng)
+            direccion = {
+                "calle": f"{rng.choice(VIAS)} {rng.choice(CALLES)}", "numero": str(rng.randrange(1, 2500)),
+                "barrio": "", "ciudad": tree.names[prov].title(), "distrito": tree.names[dist].title(),
+                "provincia": tree.names[prov].title(), "departamento": tree.names[dep].title(), "pais": "Perú",
+                "ubigeo": dist,
+            }
+            buyer = self.stride and i % self.stride == 0
+            saldo = 0
+            if buyer:
+                saldo = self._write_venta(i // self.stride, i, cliente_id, vendedor, created, rng, lote, venta, cuota)
+                estado = "propietario"
+            else:
+                estado = rng.choices(estados, weights=estado_weights)[0]
+            cliente.write((
+                cliente_id, f"CLI-{self.codigo_start + i:06d}", nombre, tipo, tipo_documento, documento,
+                f"{tag}-{i}@bench.amersur.test", telefono, telefono, e164, direccion, estado, rng.choice(ORIGENES),
+                rng.choice(INTERESES), rng.randrange(40, 600) * 1000, rng.choice(FORMAS_PAGO), 1 if buyer else 0,
+                saldo, vendedor, vendedor_id, created, created, created,
+            ))
+
+            eventos = min(63, int(self.eventos_per_cliente) + (rng.random() < self.eventos_per_cliente % 1))
+            window = max(1, int((horizon - created).total_seconds() // 60))
+            for n in range(eventos):
+                inicio = created + timedelta(minutes=rng.randrange(window))
+                duracion = rng.choice((15, 30, 60, 90))
+                tipo_evento = rng.choice(EVENTO_TIPOS)
+                past = inicio.date() < anchor
+                evento.write((
+                    self.row_id("evento", i * 64 + n), f"{tipo_evento.capitalize()} con {nombre}", tipo_evento,
+                    ("completado" if rng.random() < 0.8 else "cancelado") if past else "pendiente",
+                    rng.choice(PRIORIDADES), inicio, inicio + timedelta(minutes=duracion), duracion,
+                    vendedor_id, cliente_id, vendedor_id, pg_array([tag]), created, created,
+                ))
+
+            if rng.random() < self.notificaciones_per_cliente:
+                notificacion.write((
+                    self.row_id("notificacion", i), vendedor_id, "cliente", "Nuevo cliente asignado",
+                    f"Se te asignó el cliente {nombre}", (anchor - created.date()).days > 7,
+                    {"cliente_id": cliente_id, "bench_run": tag}, created, created,
+                ))
+
+    def _write_venta(self, v: int, i: int, cliente_id: str, vendedor: str, created: datetime,
+                     rng: random.Random, lote: Copy, venta: Copy, cuota: Copy) -> int:
+        """Sold lote ``v``, its venta and cuota schedule; returns the client's pending balance."""
+        fecha = min(created + timedelta(days=rng.randrange(1, 60)),
+                    datetime.combine(self.anchor, time(8), timezone.utc))
+        lote_row = self._lote(v, rng, "vendido", created)
+        lote.write(lote_row)
+        precio = lote_row[4]
+        contado = rng.random() < 0.2
+        plazo = 1 if contado else rng.choice(PLAZOS)
+        venta_id = self.row_id("venta", v)
+        venta.write((venta_id, f"SD{self.seed}-{v:09d}", cliente_id, lote_row[0], vendedor, precio, "PEN",
+                     "contado" if contado else "financiado", plazo, fecha,
+                     "finalizada" if contado else "en_proceso", fecha, fecha))
+
+        inicial = precio if contado else round(precio * rng.choice((0.1, 0.15, 0.2)))
+        saldo_cuota = 0 if contado else round((precio - inicial) / (plazo - 1), 2) if plazo > 1 else 0
+        pendiente = 0.0
+        first_due = fecha.date()
+        for numero in range(1, plazo + 1):
+            due = _months_later(first_due, numero - 1)
+            monto = inicial if numero == 1 else saldo_cuota
+            paid = due < self.anchor and (numero == 1 or rng.random() < self.paid_ratio)
+            estado = "pagada" if paid else "vencida" if due < self.anchor else "pendiente"
+            if not paid:
+                pendiente += monto
+            cuota.write((self.row_id("cuota", v * 64 + numero), venta_id, numero,
+                         "cuota_inicial" if numero == 1 else "cuota_saldo", monto, monto if paid else 0, "PEN",
+                         due, due - timedelta(days=rng.randrange(0, 5)) if paid else None, estado, fecha, fecha))
+        return round(pendiente, 2)
+
+
+def load_chunk(dataset: Dataset, job: Tuple[str, int], url: Optional[str] = None) -> Dict[str, int]:
+    """Generate and COPY one job of :meth:`Dataset.chunks`; returns rows per table."""
+    kind, chunk = job
+    if kind == "proyectos":
+        with Copy("crm.proyecto", COLUMNS["crm.proyecto"], url) as copy:
+            for row in dataset.proyecto_rows():
+                copy.write(row)
+        return {"crm.proyecto": copy.rows}
+    if kind == "lotes":
+        with Copy("crm.lote", COLUMNS["crm.lote"], url) as copy:
+            for row in dataset.lote_rows(chunk):
+                copy.write(row)
+        return {"crm.lote": copy.rows}
+    copies: Dict[str, Copy] = {}
+    try:
+        for table in TABLES:
+            if table != "crm.proyecto":
+                copies[table] = Copy(table, COLUMNS[table], url)
+        dataset.write_clientes(chunk, copies)
+    except BaseException:
+        for copy in copies.values():
+            copy.abort()
+        raise
+    # Each COPY commits on close; once one fails, kill the rest so psql does not commit
+    # them on EOF when the worker exits. Tables closed before it stay (--reset removes them).
+    items = list(copies.items())
+    rows: Dict[str, int] = {}
+    for index, (table, copy) in enumerate(items):
+        try:
+            rows[table] = copy.close()
+        except BaseException:
+            for _, remaining in items[index:]:
+                remaining.abort()
+            raise
+    return rows
+
+
+def delete_sql(seed: int) -> List[str]:
+    """Statements removing the dataset of ``seed``, children first (cascades still fire for rows the app added)."""
+    tag = f"seed{seed}"
+    ventas = f"SELECT id FROM crm.venta WHERE codigo_venta LIKE 'SD{seed}-%'"
+    proyectos = f"SELECT id FROM crm.proyecto WHERE nombre LIKE '%[{tag}]'"
+    return [
+        f"DELETE FROM crm.cuota WHERE venta_id IN ({ventas})",
+        f"DELETE FROM crm.venta WHERE id IN ({ventas})",
+        f"DELETE FROM crm.evento WHERE etiquetas @> ARRAY['{tag}']::text[]",
+        f"DELETE FROM crm.notificacion WHERE data->>'bench_run' = '{tag}'",
+        f"DELETE FROM crm.cliente WHERE email LIKE '{tag}-%@bench.amersur.test'",
+        f"DELETE FROM crm.lote WHERE proyecto_id IN ({proyectos})",
+        f"DELETE FROM crm.proyecto WHERE id IN ({proyectos})",
+    ]
@@ -0,0 +1,118 @@
+"""Split ``testsprite_frontend_test_plan.json`` across nodes by recorded duration.
+
+Cases are packed greedily, longest first, onto the shard with the least
+predicted work (LPT). Durations come from the history file that
+``merge_partials`` updates after every run (an exponentially weighted mean
+per case); cases never timed are estimated from their step count and the
+mean seconds per step of the timed ones. Plans are deterministic for a given
+history, so every node can compute its own slice.
+"""
+
+import heapq
+import json
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from . import config
+
+PLAN_FILE = config.TESTS_DIR / "testsprite_frontend_test_plan.json"
+DEFAULT_SECONDS_PER_STEP = 15.0
+# Weight of the newest duration in the history average.
+HISTORY_ALPHA = 0.3
+
+
+def load_cases() -> List[dict]:
+    """Plan entries with the TC script that implements each one (``None`` if absent)."""
+    scripts = {path.name.split("_")[0]: path for path in config.TESTS_DIR.glob("TC0*.py")}
+    cases = json.loads(PLAN_FILE.read_text(encoding="utf-8"))
+    return [{**case, "script": scripts.get(case["id"])} for case in cases]
+
+
+def load_history() -> Dict[str, dict]:
+    try:
+        return json.loads(config.SHARD_HISTORY_FILE.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def estimate(cases: List[dict], history: Dict[str, dict]) -> Dict[str, float]:
+    """Predicted seconds per case id."""
+    timed = [(history[c["id"]]["seconds"], len(c["steps"])) for c in cases if c["id"] in history]
+    steps = sum(n for _, n in timed)
+    per_step = sum(s for s, _ in timed) / steps if steps else DEFAULT_SECONDS_PER_STEP
+    return {
+        c["id"]: history[c["id"]]["seconds"] if c["id"] in history else max(1, len(c["steps"])) * per_step
+        for c in cases
+    }
+
+
+def plan(cases: List[dict], history: Dict[str, dict], shards: int) -> dict:
+    """Longest-processing-time-first assignment of runnable cases to ``shards`` bins."""
+    runnable = [c for c in cases if c["script"]]
+    seconds = estimate(runnable, history)
+    bins = [(0.0, index) for index in range(shards)]
+    assignment: List[List[str]] = [[] for _ in range(shards)]
+    for case in sorted(runnable, key=lambda c: (-seconds[c["id"]], c["id"])):
+        load, index = heapq.heappop(bins)
+        assignment[index].append(case["id"])
+        heapq.heappush(bins, (load + seconds[case["id"]], index))
+
+    loads = [sum(seconds[i] for i in ids) for ids in assignment]
+    total = sum(loads)
+    makespan = max(loads) if loads else 0.0
+    return {
+        "shards": shards,
+        "assignment": {str(index + 1): ids for index, ids in enumerate(assignment)},
+        "predicted_seconds": {str(index + 1): round(load, 1) for index, load in enumerate(loads)},
+        "predicted_makespan_s": round(makespan, 1),
+        "predicted_speedup": round(total / makespan, 2) if makespan else None,
+        "estimated": sorted(c["id"] for c in runnable if c["id"] not in history),
+        "without_script": sorted(c["id"] for c in cases if not c["script"]),
+    }
+
+
+def partial_path(directory: Path, shard: int, shards: int) -> Path:
+    return directory / f"partial-{shard}of{shards}.json"
+
+
+def merge_partials(directory: Path, shards: Optional[int] = None, update_history: bool = True) -> dict:
+    """Combine every ``partial-*.json`` in ``directory`` into one report; ``partials`` is 0 when none matched."""
+    partials = [json.loads(p.read_text(encoding="utf-8")) for p in sorted(directory.glob("partial-*of*.json"))]
+    if shards is None:
+        shards = max((p["shards"] for p in partials), default=0)
+    partials = [p for p in partials if p["shards"] == shards]
+    present = {p["shard"] for p in partials}
+
+    cases: Dict[str, dict] = {}
+    wall = {}
+    for partial in partials:
+        wall[str(partial["shard"])] = partial["wall_s"]
+        for case_id, outcome in partial["cases"].items():
+            cases[case_id] = {**outcome, "shard": partial["shard"]}
+
+    if update_history:
+        history = load_history()
+        for case_id, outcome in cases.items():
+            if outcome.get("passed") and outcome.get("wall_s"):
+                previous = history.get(case_id, {}).get("seconds")
+                seconds = outcome["wall_s"] if previous is None else (
+                    HISTORY_ALPHA * outcome["wall_s"] + (1 - HISTORY_ALPHA) * previous)
+                runs = history.get(case_id, {}).get("runs", 0) + 1
+                history[case_id] = {"seconds": round(seconds, 2), "runs": runs}
+        config.SHARD_HISTORY_FILE.parent.mkdir(parents=True, exist_ok=True)
+        config.SHARD_HISTORY_FILE.write_text(json.dumps(history, indent=2, sort_keys=True), encoding="utf-8")
+
+    serial = sum(c.get("wall_s", 0) for c in cases.values())
+    makespan = max(wall.values(), default=0.0)
+    return {
+        "shards": shards,
+        "partials": len(partials),
+        "missing_shards": sorted(set(range(1, shards + 1)) - present),
+        "cases": dict(sorted(cases.items())),
+        "passed": sum(bool(c.get("passed")) for c in cases.values()),
+        "failed_cases": sorted(case_id for case_id, c in cases.items() if not c.get("passed")),
+        "shard_wall_s": wall,
+        "makespan_s": round(makespan, 1),
+        "imbalance": round(makespan / (sum(wall.values()) / len(wall)), 2) if wall else None,
+        "speedup": round(serial / makespan, 2) if makespan else None,
+    }
@@ -0,0 +1,6 @@
+"""Local stand-ins for third-party APIs the app talks to.
+
+They are plain ``http.server`` services running in a background thread, so a
+scenario can start one, point the app at it through an environment variable
+and read back how many calls it received.
+"""
@@ -0,0 +1,219 @@
+"""Google Drive v3 stand-in.
+
+Implements the subset of ``files`` endpoints used by
+``src/lib/google-drive/client.ts`` (list with the ``q`` expressions the client
+builds, get, ``alt=media`` download, create and delete) over a synthetic
+folder tree. Start the app with ``GOOGLE_DRIVE_API_ROOT_URL`` pointing at
+``DriveStandIn.url`` and an active ``crm.google_drive_sync_config`` row.
+
+Downloads are generated on the fly, so multi-hundred-MB files cost nothing
+to host.
+"""
+
+import random
+import re
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional
+
+from .server import StandIn, StandInHandler, StandInHTTPServer
+
+FOLDER_MIME = "application/vnd.google-apps.folder"
+FILE_MIMES = (
+    ("pdf", "application/pdf"),
+    ("docx", "application/vnd.openxmlformats-officedocument.wordprocessingml.document"),
+    ("xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+    ("jpg", "image/jpeg"),
+    ("png", "image/png"),
+)
+MAX_PAGE_SIZE = 1000
+CHUNK = 64 * 1024
+
+_PARENT_RE = re.compile(r"'([^']+)' in parents")
+_MIME_RE = re.compile(r"mimeType\s*(!?=)\s*'([^']+)'")
+_NAME_RE = re.compile(r"name contains '([^']*)'")
+
+
+class DriveTree:
+    """In-memory Drive: ``files`` by id plus a parent -> children index."""
+
+    def __init__(self, prefix: str = "bench"):
+        self.prefix = prefix
+        self.files: Dict[str, dict] = {}
+        self.children: Dict[str, List[str]] = {}
+        self._next = 0
+
+    def add(self, name: str, mime: str, parent: str = "root", size: Optional[int] = None,
+            modified: Optional[datetime] = None) -> dict:
+        self._next += 1
+        file_id = f"{self.prefix}-{self._next}"
+        stamp = (modified or datetime.now(timezone.utc)).isoformat().replace("+00:00", "Z")
+        meta = {
+            "id": file_id,
+            "name": name,
+            "mimeType": mime,
+            "createdTime": stamp,
+            "modifiedTime": stamp,
+            "parents": [parent],
+            "webViewLink": f"https://drive.local/{file_id}/view",
+        }
+        if mime != FOLDER_MIME:
+            meta["size"] = str(size or 0)
+            meta["webContentLink"] = f"https://drive.local/{file_id}/download"
+        self.files[file_id] = meta
+        self.children.setdefault(parent, []).append(file_id)
+        return meta
+
+    def remove(self, file_id: str) -> bool:
+        meta = self.files.pop(file_id, None)
+        if not meta:
+            return False
+        for parent in meta["parents"]:
+            siblings = self.children.get(parent, [])
+            if file_id in siblings:
+                siblings.remove(file_id)
+        return True
+
+    def query(self, q: str) -> Iterable[dict]:
+        parent = _PARENT_RE.search(q or "")
+        candidates = (
+            (self.files[i] for i in self.children.get(parent.group(1), ()))
+            if parent else self.files.values()
+        )
+        mime = _MIME_RE.search(q or "")
+        name = _NAME_RE.search(q or "")
+        for meta in candidates:
+            if mime:
+                equal = meta["mimeType"] == mime.group(2)
+                if equal != (mime.group(1) == "="):
+                    continue
+            if name and name.group(1).lower() not in meta["name"].lower():
+                continue
+            yield meta
+
+    @classmethod
+    def generate(cls, files: int, depth: int = 4, fanout: int = 6, seed: int = 18,
+                 prefix: str = "bench", large_files_mb: Iterable[int] = ()) -> "DriveTree":
+        """Nested folders ``depth`` levels deep with ``files`` spread across them."""
+        rng = random.Random(seed)
+        tree = cls(prefix)
+        base = datetime(2025, 1, 1, tzinfo=timezone.utc)
+        folders = ["root"]
+        level = ["root"]
+        for d in range(depth):
+            next_level = []
+            for parent in level:
+                for n in range(fanout):
+                    meta = tree.add(f"Carpeta {d}-{n}", FOLDER_MIME, parent, modified=base)
+                    next_level.append(meta["id"])
+            folders.extend(next_level)
+            level = next_level
+        for n in range(files):
+            ext, mime = rng.choice(FILE_MIMES)
+            tree.add(
+                f"Documento {n:06d} cliente {rng.randint(1000, 99999)}.{ext}", mime,
+                rng.choice(folders), size=rng.randint(20_000, 5_000_000),
+                modified=base + timedelta(minutes=rng.randrange(525_600)),
+            )
+        for mb in large_files_mb:
+            tree.add(f"Plano grande {mb}MB.pdf", "application/pdf", "root", size=mb * 1024 * 1024)
+        return tree
+
+
+class DriveHTTPServer(StandInHTTPServer):
+    def __init__(self, address, handler):
+        super().__init__(address, handler)
+        self.tree = DriveTree()
+
+
+class DriveHandler(StandInHandler):
+    server: DriveHTTPServer
+
+    _FILE_PATH = re.compile(r"^/drive/v3/files/([^/]+)$")
+
+    def do_GET(self):
+        if self.route == "/drive/v3/files":
+            return self._list()
+        match = self._FILE_PATH.match(self.route)
+        if not match:
+            return self._error(404, "Not found")
+        with self.server.lock:
+            meta = self.server.tree.files.get(match.group(1))
+        if not meta:
+            return self._error(404, f"File not found: {match.group(1)}")
+        if self.query.get("alt") == "media":
+            return self._media(meta)
+        self.count("files.get")
+        self.send_json(200, meta)
+
+    def do_POST(self):
+        if self.route not in ("/drive/v3/files", "/upload/drive/v3/files"):
+            return self._error(404, "Not found")
+        self.count("files.create")
+        body = self.read_body()
+        if self.route == "/drive/v3/files":
+            payload = self.read_json(body)
+            with self.server.lock:
+                meta = self.server.tree.add(
+                    payload.get("name", "Sin nombre"), payload.get("mimeType", FOLDER_MIME),
+                    (payload.get("parents") or ["root"])[0],
+                )
+        else:
+            with self.server.lock:
+                meta = self.server.tree.add("upload.bin", "application/octet-stream", size=len(body))
+        self.send_json(200, meta)
+
+    def do_DELETE(self):
+        match = self._FILE_PATH.match(self.route)
+        self.count("files.delete")
+        with self.server.lock:
+            removed = bool(match) and self.server.tree.remove(match.group(1))
+        if not removed:
+            return self._error(404, "File not found")
+        self.send_response(204)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def _list(self) -> None:
+        params = self.query
+        page_size = min(int(params.get("pageSize", 100)), MAX_PAGE_SIZE)
+        offset = int(params.get("pageToken", 0))
+        with self.server.lock:
+            matches = list(self.server.tree.query(params.get("q", "")))
+        order = params.get("orderBy", "")
+        if order.startswith("modifiedTime"):
+            matches.sort(key=lambda m: m["modifiedTime"], reverse=order.endswith("desc"))
+        elif order.startswith("name"):
+            matches.sort(key=lambda m: m["name"])
+        page = matches[offset:offset + page_size]
+        self.count("files.list")
+        self.count("files.list.items", len(page))
+        payload = {"kind": "drive#fileList", "files": page}
+        if offset + page_size < len(matches):
+            payload["nextPageToken"] = str(offset + page_size)
+        self.send_json(200, payload)
+
+    def _media(self, meta: dict) -> None:
+        self.count("files.media")
+        size = int(meta.get("size", 0))
+        self.send_response(200)
+        self.send_header("Content-Type", meta["mimeType"])
+        self.send_header("Content-Length", str(size))
+        self.end_headers()
+        chunk = (meta["id"].encode() * (CHUNK // len(meta["id"]) + 1))[:CHUNK]
+        remaining = size
+        while remaining > 0:
+            part = chunk[:remaining]
+            self.wfile.write(part)
+            remaining -= len(part)
+        self.count("files.media.bytes", size)
+
+    def _error(self, status: int, message: str) -> None:
+        self.send_json(status, {"error": {"code": status, "message": message}})
+
+
+class DriveStandIn(StandIn):
+    server_class = DriveHTTPServer
+
+    def __init__(self, tree: DriveTree, host: str = "127.0.0.1", port: int = 0):
+        super().__init__(DriveHandler, host, port)
+        self.server.tree = tree
@@ -0,0 +1,132 @@
+"""OTLP/HTTP trace collector stand-in.
+
+Accepts ``POST /v1/traces`` with the JSON encoding of
+``ExportTraceServiceRequest`` (what ``bench.tracing`` and
+``src/lib/tracing.ts`` send; protobuf gets a 415) and keeps the spans
+flattened to ``trace_id``, ``span_id``, ``parent_id``, ``name``, ``kind``,
+``service``, ``start_ns``, ``ms``, ``status`` and ``attributes``.
+``GET /v1/traces?trace_id=<hex>`` returns them, ``GET /stats`` the counters.
+
+Run it next to the app when starting the dev server with
+``OTEL_EXPORTER_OTLP_ENDPOINT=http://127.0.0.1:4318``::
+
+    python -m bench.standins.otlp --port 4318 --out tmp/bench/spans.jsonl
+"""
+
+import argparse
+import json
+import threading
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .server import StandIn, StandInHandler, StandInHTTPServer
+
+
+def _value(value: dict):
+    if "arrayValue" in value:
+        return [_value(v) for v in value["arrayValue"].get("values", [])]
+    for key in ("stringValue", "boolValue", "doubleValue"):
+        if key in value:
+            return value[key]
+    if "intValue" in value:
+        return int(value["intValue"])
+    return None
+
+
+def _attributes(items: Optional[list]) -> dict:
+    return {item["key"]: _value(item.get("value") or {}) for item in items or []}
+
+
+def flatten(request: dict) -> List[dict]:
+    """Spans of an ``ExportTraceServiceRequest`` as flat dicts."""
+    spans = []
+    for resource_spans in request.get("resourceSpans", []):
+        service = _attributes((resource_spans.get("resource") or {}).get("attributes")).get("service.name", "")
+        for scope_spans in resource_spans.get("scopeSpans", []):
+            for span in scope_spans.get("spans", []):
+                start, end = int(span["startTimeUnixNano"]), int(span["endTimeUnixNano"])
+                spans.append({
+                    "trace_id": span["traceId"].lower(),
+                    "span_id": span["spanId"].lower(),
+                    "parent_id": (span.get("parentSpanId") or "").lower() or None,
+                    "name": span.get("name", ""),
+                    "kind": span.get("kind", 0),
+                    "service": service,
+                    "start_ns": start,
+                    "ms": round((end - start) / 1e6, 3),
+                    "status": (span.get("status") or {}).get("code", 0),
+                    "attributes": _attributes(span.get("attributes")),
+                })
+    return spans
+
+
+class OtlpHTTPServer(StandInHTTPServer):
+    def __init__(self, address, handler):
+        super().__init__(address, handler)
+        self.traces: Dict[str, List[dict]] = defaultdict(list)
+        self.out: Optional[Path] = None
+        self.out_lock = threading.Lock()
+
+
+class OtlpHandler(StandInHandler):
+    server: OtlpHTTPServer
+
+    def do_POST(self) -> None:
+        body = self.read_body()
+        if self.route != "/v1/traces":
+            self.send_json(404, {"error": "not found"})
+            return
+        if not self.headers.get("Content-Type", "").startswith("application/json"):
+            self.count("rejected")
+            self.send_json(415, {"error": "only the OTLP JSON encoding is supported"})
+            return
+        spans = flatten(self.read_json(body))
+        with self.server.lock:
+            for span in spans:
+                self.server.traces[span["trace_id"]].append(span)
+            self.server.counters["exports"] += 1
+            self.server.counters["spans"] += len(spans)
+        if self.server.out:
+            with self.server.out_lock, self.server.out.open("a", encoding="utf-8") as handle:
+                handle.writelines(json.dumps(span) + "\n" for span in spans)
+        self.send_json(200, {"partialSuccess": {}})
+
+    def do_GET(self) -> None:
+        if self.route == "/stats":
+            with self.server.lock:
+                self.send_json(200, {**self.server.counters, "traces": len(self.server.traces)})
+        elif self.route == "/v1/traces":
+            trace_id = self.query.get("trace_id", "").lower()
+            with self.server.lock:
+                spans = list(self.server.traces.get(trace_id, []))
+            self.send_json(200, {"spans": spans})
+        else:
+            self.send_json(404, {"error": "not found"})
+
+
+class OtlpStandIn(StandIn):
+    server_class = OtlpHTTPServer
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, out: Optional[Path] = None):
+        super().__init__(OtlpHandler, host, port)
+        if out:
+            out.parent.mkdir(parents=True, exist_ok=True)
+            self.server.out = out
+
+    def spans(self, trace_id: str) -> List[dict]:
+        with self.server.lock:
+            return list(self.server.traces.get(trace_id.lower(), []))
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=4318)
+    parser.add_argument("--out", type=Path, help="also append every span to this JSONL file")
+    args = parser.parse_args(argv)
+    OtlpStandIn(args.host, args.port, args.out).server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
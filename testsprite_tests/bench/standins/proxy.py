@@ -0,0 +1,93 @@
+"""Counting reverse proxy for Supabase.
+
+Start the app with ``NEXT_PUBLIC_SUPABASE_URL`` pointing at
+``CountingProxy.url`` and every PostgREST/RPC/Auth call the server makes goes
+through here on its way to the real project. Counters are keyed by
+``"<METHOD> <resource>"`` (``GET cuota``, ``POST rpc/actualizar_cuotas_vencidas``),
+which is the number of database round-trips a route costs, plus response
+bytes per key.
+"""
+
+import http.client
+import time
+from typing import Dict
+from urllib.parse import urlsplit
+
+from .server import StandIn, StandInHandler, StandInHTTPServer
+
+_HOP_BY_HOP = {"connection", "keep-alive", "transfer-encoding", "te", "trailer", "upgrade",
+               "proxy-authorization", "proxy-authenticate", "host", "content-length"}
+_PREFIXES = ("/rest/v1/", "/auth/v1/", "/storage/v1/", "/functions/v1/")
+
+
+def resource_of(path: str) -> str:
+    """``/rest/v1/cuota?select=...`` -> ``cuota``; other APIs keep their prefix."""
+    path = urlsplit(path).path
+    if path.startswith("/rest/v1/"):
+        return path[len("/rest/v1/"):] or "/"
+    for prefix in _PREFIXES:
+        if path.startswith(prefix):
+            return prefix.strip("/").split("/")[0] + ":" + path[len(prefix):]
+    return path
+
+
+class ProxyHandler(StandInHandler):
+    server: "ProxyHTTPServer"
+
+    def _forward(self):
+        upstream = self.server.upstream
+        body = self.read_body()
+        headers = {k: v for k, v in self.headers.items() if k.lower() not in _HOP_BY_HOP}
+        headers["Host"] = upstream.netloc
+        connection_class = (http.client.HTTPSConnection if upstream.scheme == "https"
+                            else http.client.HTTPConnection)
+        connection = connection_class(upstream.netloc, timeout=600)
+        started = time.perf_counter()
+        try:
+            connection.request(self.command, self.path, body=body or None, headers=headers)
+            response = connection.getresponse()
+            payload = response.read()
+        finally:
+            connection.close()
+        key = f"{self.command} {resource_of(self.path)}"
+        self.count(key)
+        self.count(f"{key} bytes", len(payload))
+        self.count(f"{key} ms", int((time.perf_counter() - started) * 1000))
+
+        self.send_response(response.status)
+        for name, value in response.getheaders():
+            if name.lower() not in _HOP_BY_HOP:
+                self.send_header(name, value)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    do_GET = do_POST = do_PATCH = do_PUT = do_DELETE = do_HEAD = do_OPTIONS = _forward
+
+
+class ProxyHTTPServer(StandInHTTPServer):
+    upstream = urlsplit("http://127.0.0.1")
+
+
+class CountingProxy(StandIn):
+    server_class = ProxyHTTPServer
+
+    def __init__(self, upstream: str, host: str = "127.0.0.1", port: int = 0):
+        super().__init__(ProxyHandler, host, port)
+        self.server.upstream = urlsplit(upstream)
+
+    def round_trips(self, reset: bool = False) -> Dict[str, dict]:
+        """Per resource: ``{"calls", "bytes", "ms"}``."""
+        counters = self.counters(reset)
+        trips: Dict[str, dict] = {}
+        for key, value in counters.items():
+            name, _, unit = key.rpartition(" ")
+            if unit in ("bytes", "ms"):
+                trips.setdefault(name, {})[unit] = value
+            else:
+                trips.setdefault(key, {})["calls"] = value
+        return trips
+
+    @staticmethod
+    def total_calls(trips: Dict[str, dict]) -> int:
+        return sum(t.get("calls", 0) for t in trips.values())
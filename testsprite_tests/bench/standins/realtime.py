@@ -0,0 +1,202 @@
+"""Supabase Realtime stand-in for the notificaciones channel.
+
+Speaks the Phoenix JSON protocol (``vsn=1.0.0``) that ``@supabase/realtime-js``
+uses on ``/realtime/v1/websocket``: ``phx_join`` with a ``postgres_changes``
+config, heartbeats, ``access_token`` refreshes and ``phx_leave``. Rows posted
+to ``/rest/v1/notificacion`` (PostgREST shape) are fanned out as
+``postgres_changes`` INSERT events.
+
+``NotificationsDropdown.tsx`` subscribes without a server-side filter, so
+Realtime evaluates every change against every subscriber's RLS policy; the
+stand-in does the same (``usuario_id`` must equal the token's ``sub``) and
+counts those checks next to actual deliveries. ``GET /stats`` returns the
+counters and open connections.
+
+It runs in-process (``RealtimeStandIn``) or as its own process, so its RSS
+can be sampled and it can be killed to force a reconnect storm::
+
+    python -m bench.standins.realtime --port 8916
+"""
+
+import argparse
+import base64
+import itertools
+import json
+import threading
+import uuid
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+from .. import websocket
+from .server import StandIn, StandInHandler, StandInHTTPServer
+
+TABLE = ("crm", "notificacion")
+
+
+def token_subject(token: str) -> Optional[str]:
+    """``sub`` claim of a JWT, unverified (the stand-in trusts its clients)."""
+    try:
+        payload = token.split(".")[1]
+        return json.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4))).get("sub")
+    except (IndexError, ValueError, AttributeError):
+        return None
+
+
+class Subscriber:
+    def __init__(self, handler: "RealtimeHandler", topic: str, subject: Optional[str], ids: Dict[str, int]):
+        self.handler = handler
+        self.topic = topic
+        self.subject = subject
+        self.ids = ids
+
+
+class RealtimeHTTPServer(StandInHTTPServer):
+    # Reconnect storms open hundreds of sockets at once; the default backlog of 5 would refuse them.
+    request_queue_size = 1024
+
+    def __init__(self, address, handler):
+        super().__init__(address, handler)
+        self.subscribers: Dict[int, Subscriber] = {}
+        self.open_connections = 0
+        self.change_ids = itertools.count(1)
+
+
+class RealtimeHandler(StandInHandler):
+    server: RealtimeHTTPServer
+
+    def do_GET(self) -> None:
+        if self.route == "/stats":
+            with self.server.lock:
+                stats = {**self.server.counters, "open_connections": self.server.open_connections,
+                         "subscribers": len(self.server.subscribers)}
+            self.send_json(200, stats)
+        elif self.route == "/realtime/v1/websocket" and self.headers.get("Upgrade", "").lower() == "websocket":
+            self._serve_websocket()
+        else:
+            self.send_json(404, {"error": "not found"})
+
+    def do_POST(self) -> None:
+        if self.route != "/rest/v1/notificacion":
+            self.send_json(404, {"error": "not found"})
+            return
+        body = self.read_json()
+        rows = body if isinstance(body, list) else [body]
+        now = datetime.now(timezone.utc).isoformat()
+        inserted = [{"id": str(uuid.uuid4()), "leida": False, "created_at": now, **row} for row in rows]
+        for row in inserted:
+            self._fan_out(row, now)
+        self.send_json(201, inserted)
+
+    def _fan_out(self, record: dict, commit_timestamp: str) -> None:
+        with self.server.lock:
+            subscribers = list(self.server.subscribers.values())
+            self.server.counters["changes"] += 1
+            self.server.counters["rls_checks"] += len(subscribers)
+        delivered = 0
+        for subscriber in subscribers:
+            if subscriber.subject != record.get("usuario_id"):
+                continue
+            message = {"topic": subscriber.topic, "event": "postgres_changes", "ref": None, "payload": {
+                "ids": [subscriber.ids["INSERT"]],
+                "data": {"schema": TABLE[0], "table": TABLE[1], "commit_timestamp": commit_timestamp,
+                         "type": "INSERT", "record": record, "columns": [], "errors": None},
+            }}
+            if subscriber.handler.send_text(json.dumps(message)):
+                delivered += 1
+        self.count("delivered", delivered)
+
+    # -- websocket -------------------------------------------------------------------------------
+
+    def _serve_websocket(self) -> None:
+        self.send_response(101)
+        self.send_header("Upgrade", "websocket")
+        self.send_header("Connection", "Upgrade")
+        self.send_header("Sec-WebSocket-Accept", websocket.accept_key(self.headers.get("Sec-WebSocket-Key", "")))
+        self.end_headers()
+        self.wfile.flush()
+        self.send_lock = threading.Lock()
+        self.close_connection = True
+        with self.server.lock:
+            self.server.counters["handshakes"] += 1
+            self.server.open_connections += 1
+        try:
+            while True:
+                opcode, payload = websocket.read_frame(self.rfile)
+                if opcode == websocket.CLOSE:
+                    break
+                if opcode == websocket.PING:
+                    self._send_frame(websocket.encode(payload, websocket.PONG))
+                elif opcode == websocket.TEXT:
+                    self._on_message(json.loads(payload))
+        except (websocket.ConnectionClosed, OSError, ValueError):
+            pass
+        finally:
+            with self.server.lock:
+                self.server.open_connections -= 1
+                for key in [k for k, s in self.server.subscribers.items() if s.handler is self]:
+                    del self.server.subscribers[key]
+
+    def send_text(self, text: str) -> bool:
+        return self._send_frame(websocket.encode(text.encode("utf-8")))
+
+    def _send_frame(self, frame: bytes) -> bool:
+        try:
+            with self.send_lock:
+                self.wfile.write(frame)
+                self.wfile.flush()
+            return True
+        except OSError:
+            return False
+
+    def _reply(self, message: dict, response: dict, status: str = "ok") -> None:
+        self.send_text(json.dumps({"topic": message["topic"], "event": "phx_reply", "ref": message.get("ref"),
+                                   "payload": {"status": status, "response": response}}))
+
+    def _on_message(self, message: dict) -> None:
+        event, topic = message.get("event"), message.get("topic", "")
+        key = hash((id(self), topic))
+        if event == "heartbeat":
+            self._reply(message, {})
+        elif event == "phx_join":
+            payload = message.get("payload") or {}
+            changes = [c for c in (payload.get("config") or {}).get("postgres_changes", [])
+                       if (c.get("schema"), c.get("table")) == TABLE]
+            ids = {c["event"]: next(self.server.change_ids) for c in changes}
+            with self.server.lock:
+                self.server.counters["joins"] += 1
+                if "INSERT" in ids or "*" in ids:
+                    ids.setdefault("INSERT", ids.get("*", 0))
+                    self.server.subscribers[key] = Subscriber(self, topic, token_subject(
+                        payload.get("access_token", "")), ids)
+            self._reply(message, {"postgres_changes": [{**c, "id": ids[c["event"]]} for c in changes]})
+            self.send_text(json.dumps({"topic": topic, "event": "system", "ref": None, "payload": {
+                "channel": topic.split(":", 1)[-1], "extension": "postgres_changes", "status": "ok",
+                "message": "Subscribed to PostgreSQL"}}))
+        elif event == "access_token":
+            with self.server.lock:
+                subscriber = self.server.subscribers.get(key)
+                if subscriber:
+                    subscriber.subject = token_subject((message.get("payload") or {}).get("access_token", ""))
+        elif event == "phx_leave":
+            with self.server.lock:
+                self.server.subscribers.pop(key, None)
+            self._reply(message, {})
+
+
+class RealtimeStandIn(StandIn):
+    server_class = RealtimeHTTPServer
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        super().__init__(RealtimeHandler, host, port)
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8916)
+    args = parser.parse_args(argv)
+    RealtimeStandIn(args.host, args.port).server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
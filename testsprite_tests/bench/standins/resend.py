@@ -0,0 +1,104 @@
+"""Resend stand-in.
+
+Implements ``POST /emails``, the only call ``src/lib/services/email.ts`` makes
+through the ``resend`` SDK. Point the SDK at it with
+``RESEND_BASE_URL=<ResendStandIn.url without the trailing slash>``.
+
+Provider behaviour is configurable so retries can be exercised:
+
+* ``latency_ms`` / ``jitter_ms``: service time per accepted email,
+* ``rps``: a one-second sliding window; requests above it get the 429 body
+  Resend returns (``rate_limit_exceeded``),
+* ``error_ratio``: random 500s (``application_error``).
+"""
+
+import random
+import threading
+import time
+import uuid
+from collections import deque
+from typing import Deque, Optional
+
+from .server import StandIn, StandInHandler
+
+
+class ProviderProfile:
+    def __init__(self, latency_ms: float = 40.0, jitter_ms: float = 10.0, rps: Optional[float] = None,
+                 error_ratio: float = 0.0, seed: int = 1):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.rps = rps
+        self.error_ratio = error_ratio
+        self._rng = random.Random(seed)
+        self._window: Deque[float] = deque()
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+    def admit(self) -> Optional[str]:
+        """Return an error name for this request, or ``None`` to accept it."""
+        with self._lock:
+            if self.rps:
+                now = time.monotonic()
+                while self._window and now - self._window[0] >= 1.0:
+                    self._window.popleft()
+                if len(self._window) >= self.rps:
+                    return "rate_limit_exceeded"
+                self._window.append(now)
+            if self.error_ratio and self._rng.random() < self.error_ratio:
+                return "application_error"
+            return None
+
+    def service_time(self) -> float:
+        with self._lock:
+            delay = self._rng.gauss(self.latency_ms, self.jitter_ms) if self.jitter_ms else self.latency_ms
+        return max(0.0, delay) / 1000
+
+
+class ResendHandler(StandInHandler):
+    server: "ResendHTTPServer"
+
+    def do_POST(self):
+        payload = self.read_json()
+        if self.route != "/emails":
+            self.send_json(404, {"statusCode": 404, "name": "not_found", "message": "Route not found"})
+            return
+        profile = self.server.profile
+        refused = profile.admit()
+        if refused == "rate_limit_exceeded":
+            self.count("rate_limited")
+            self.send_json(429, {"statusCode": 429, "name": refused,
+                                 "message": "Too many requests. You can only make limited requests per second."})
+            return
+        if refused:
+            self.count("errors")
+            self.send_json(500, {"statusCode": 500, "name": refused, "message": "Internal server error"})
+            return
+
+        with self.server.lock:
+            profile.in_flight += 1
+            profile.peak_in_flight = max(profile.peak_in_flight, profile.in_flight)
+        try:
+            time.sleep(profile.service_time())
+        finally:
+            with self.server.lock:
+                profile.in_flight -= 1
+        self.count("emails")
+        self.count("recipients", len(payload.get("to") or []))
+        self.send_json(200, {"id": str(uuid.uuid4())})
+
+
+class ResendHTTPServer(StandIn.server_class):
+    profile: ProviderProfile
+
+
+class ResendStandIn(StandIn):
+    server_class = ResendHTTPServer
+
+    def __init__(self, profile: ProviderProfile, host: str = "127.0.0.1", port: int = 0):
+        super().__init__(ResendHandler, host, port)
+        self.server.profile = profile
+
+    @property
+    def peak_in_flight(self) -> int:
+        return self.server.profile.peak_in_flight
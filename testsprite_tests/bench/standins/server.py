@@ -0,0 +1,97 @@
+"""Threaded HTTP server base shared by the stand-ins."""
+
+import json
+import threading
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional, Type
+from urllib.parse import parse_qs, urlsplit
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Request handler with JSON helpers and per-route counters."""
+
+    protocol_version = "HTTP/1.1"
+    server: "StandInHTTPServer"
+
+    def log_message(self, format, *args):  # noqa: A002 - signature from BaseHTTPRequestHandler
+        pass
+
+    @property
+    def route(self) -> str:
+        return urlsplit(self.path).path
+
+    @property
+    def query(self) -> dict:
+        return {k: v[-1] for k, v in parse_qs(urlsplit(self.path).query).items()}
+
+    def read_body(self) -> bytes:
+        length = int(self.headers.get("Content-Length") or 0)
+        return self.rfile.read(length) if length else b""
+
+    def read_json(self, body: Optional[bytes] = None) -> dict:
+        body = self.read_body() if body is None else body
+        try:
+            return json.loads(body) if body else {}
+        except ValueError:
+            return {}
+
+    def send_json(self, status: int, payload) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def count(self, name: str, amount: int = 1) -> None:
+        with self.server.lock:
+            self.server.counters[name] += amount
+
+
+class StandInHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, handler: Type[StandInHandler]):
+        super().__init__(address, handler)
+        self.lock = threading.Lock()
+        self.counters: Counter = Counter()
+
+
+class StandIn:
+    """Start/stop wrapper: ``with StandIn(Handler, port=8911) as s: s.url``."""
+
+    server_class = StandInHTTPServer
+
+    def __init__(self, handler: Type[StandInHandler], host: str = "127.0.0.1", port: int = 0):
+        self.server = self.server_class((host, port), handler)
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    def counters(self, reset: bool = False) -> dict:
+        with self.server.lock:
+            snapshot = dict(self.server.counters)
+            if reset:
+                self.server.counters.clear()
+        return snapshot
+
+    def start(self) -> "StandIn":
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+        if self._thread:
+            self._thread.join(timeout=5)
+
+    def __enter__(self) -> "StandIn":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
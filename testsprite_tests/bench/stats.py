@@ -0,0 +1,53 @@
+"""Small helpers to summarise latency samples."""
+
+import math
+import random
+import time
+from contextlib import contextmanager
+from typing import Iterable, Iterator, List
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Nearest-rank percentile of ``samples`` (``pct`` in 0..100)."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def keep_sample(samples: List[float], value: float, seen: int, size: int = 5000) -> None:
+    """Reservoir sampling: ``samples`` stays a uniform sample of at most ``size`` of ``seen`` values."""
+    if len(samples) < size:
+        samples.append(value)
+    else:
+        slot = random.randrange(seen)
+        if slot < size:
+            samples[slot] = value
+
+
+def summarize(samples: Iterable[float]) -> dict:
+    """Return count, mean and the usual percentiles, rounded to 0.1 ms."""
+    values = list(samples)
+    if not values:
+        return {"count": 0}
+    return {
+        "count": len(values),
+        "min": round(min(values), 1),
+        "mean": round(sum(values) / len(values), 1),
+        "p50": round(percentile(values, 50), 1),
+        "p95": round(percentile(values, 95), 1),
+        "p99": round(percentile(values, 99), 1),
+        "max": round(max(values), 1),
+    }
+
+
+@contextmanager
+def stopwatch() -> Iterator[dict]:
+    """Measure a block in milliseconds: ``with stopwatch() as t: ...; t["ms"]``."""
+    timing = {"ms": 0.0}
+    start = time.perf_counter()
+    try:
+        yield timing
+    finally:
+        timing["ms"] = (time.perf_counter() - start) * 1000
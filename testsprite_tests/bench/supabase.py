@@ -0,0 +1,98 @@
+"""Minimal PostgREST client used to seed and clean up benchmark data.
+
+Seeding goes straight to Supabase with the service-role key, bypassing the
+app, so the measured endpoints only see reads. Rows created by a run are
+tagged (``etiquetas`` / ``data``) with its run id to make cleanup exact.
+"""
+
+import json
+from typing import Iterable, List, Optional
+
+from playwright.async_api import APIRequestContext, Playwright
+
+from . import config
+
+
+class SupabaseRest:
+    def __init__(self, request: APIRequestContext):
+        self._request = request
+
+    @classmethod
+    async def open(cls, pw: Playwright) -> "SupabaseRest":
+        if not config.SUPABASE_URL or not config.SUPABASE_SERVICE_ROLE_KEY:
+            raise RuntimeError(
+                "Seeding requires NEXT_PUBLIC_SUPABASE_URL and SUPABASE_SERVICE_ROLE_KEY"
+            )
+        request = await pw.request.new_context(
+            base_url=f"{config.SUPABASE_URL}/rest/v1/",
+            extra_http_headers={
+                "apikey": config.SUPABASE_SERVICE_ROLE_KEY,
+                "Authorization": f"Bearer {config.SUPABASE_SERVICE_ROLE_KEY}",
+            },
+        )
+        return cls(request)
+
+    async def close(self) -> None:
+        await self._request.dispose()
+
+    async def select(self, table: str, params: dict, schema: str = "crm") -> List[dict]:
+        response = await self._request.get(
+            table, params=params, headers={"Accept-Profile": schema}
+        )
+        self._raise_for_status(response.status, table, await response.text())
+        return await response.json()
+
+    async def count(self, table: str, params: dict, schema: str = "crm") -> int:
+        """Exact row count for a filter, without transferring the rows."""
+        response = await self._request.head(
+            table, params=params, headers={"Accept-Profile": schema, "Prefer": "count=exact"}
+        )
+        self._raise_for_status(response.status, table, "")
+        return int(response.headers.get("content-range", "*/0").rsplit("/", 1)[-1] or 0)
+
+    async def insert(self, table: str, rows: Iterable[dict], schema: str = "crm",
+                     batch_size: int = 1000, returning: Optional[str] = None) -> List[dict]:
+        """Insert ``rows`` in batches. Returns the inserted rows if ``returning`` is set."""
+        headers = {
+            "Content-Profile": schema,
+            "Content-Type": "application/json",
+            "Prefer": "return=representation" if returning else "return=minimal",
+        }
+        params = {"select": returning} if returning else None
+        inserted: List[dict] = []
+        batch: List[dict] = []
+
+        async def flush() -> None:
+            response = await self._request.post(
+                table, data=json.dumps(batch), headers=headers, params=params
+            )
+            self._raise_for_status(response.status, table, await response.text())
+            if returning:
+                inserted.extend(await response.json())
+            batch.clear()
+
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= batch_size:
+                await flush()
+        if batch:
+            await flush()
+        return inserted
+
+    async def update(self, table: str, params: dict, values: dict, schema: str = "crm") -> None:
+        response = await self._request.patch(
+            table, params=params, data=json.dumps(values),
+            headers={"Content-Profile": schema, "Content-Type": "application/json"},
+        )
+        self._raise_for_status(response.status, table, await response.text())
+
+    async def delete(self, table: str, params: dict, schema: str = "crm") -> None:
+        response = await self._request.delete(
+            table, params=params, headers={"Content-Profile": schema}
+        )
+        self._raise_for_status(response.status, table, await response.text())
+
+    @staticmethod
+    def _raise_for_status(status: int, table: str, body: str) -> None:
+        if status >= 400:
+            raise RuntimeError(f"PostgREST {table} -> {status}: {body[:300]}")
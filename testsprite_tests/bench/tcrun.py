@@ -0,0 +1,164 @@
+"""Run one unmodified TC script under an emulation profile.
+
+``python -m bench.tcrun TC020_....py out.json`` (with ``BENCH_PROFILE`` set)
+patches Playwright's ``Browser.new_context`` so whatever context the script
+creates gets the profile's device options and throttling plus the Web Vitals
+collector (and, with ``--coverage``, the JS/CSS coverage collector), then
+executes the script as ``__main__``. The fixed sleeps the
+generated scripts are full of (``page.wait_for_timeout``, ``asyncio.sleep``)
+are added up so they can be subtracted from the wall time, and document and
+API requests are timed from Playwright's resource timing. ``bench.harness``
+reports the runner's own CPU time, loop lag and protocol round trips, and
+``bench.responses`` samples go back to the parent's collector.
+
+Writes ``out.json`` and exits 1 when the script raised. Scenarios call
+:func:`run_tc`, which runs this in a subprocess.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import runpy
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit
+
+from playwright.async_api import Browser, BrowserContext, Page, Request
+
+from . import config, profiles
+from .coverage import CoverageCollector
+from .harness import HARNESS
+from .responses import RESPONSES
+from .vitals import COLLECTOR, normalize_route
+
+TIMED_TYPES = {"document": "document", "fetch": "api", "xhr": "api"}
+
+
+def tc_scripts(selection: str = "") -> List[Path]:
+    """``TC0xx_*.py`` scripts, optionally only the comma-separated ids in ``selection``."""
+    scripts = sorted(config.TESTS_DIR.glob("TC0*.py"))
+    wanted = {tc.strip().upper() for tc in selection.split(",") if tc.strip()}
+    return [s for s in scripts if not wanted or s.name.split("_")[0] in wanted]
+
+
+async def run_tc(script: Path, out: Path, timeout: float, profile: Optional[str] = None,
+                 coverage: bool = False) -> dict:
+    """Run ``script`` through this module in a subprocess and return its report."""
+    process = await asyncio.create_subprocess_exec(
+        sys.executable, "-m", "bench.tcrun", str(script), str(out), *(["--coverage"] if coverage else []),
+        cwd=config.TESTS_DIR, env={**os.environ, "BENCH_PROFILE": profile or config.PROFILE},
+        stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.PIPE,
+    )
+    try:
+        _, stderr = await asyncio.wait_for(process.communicate(), timeout)
+    except asyncio.TimeoutError:
+        process.kill()
+        await process.wait()
+        return {"passed": False, "error": f"timed out after {timeout:.0f}s"}
+    if not out.exists():
+        lines = stderr.decode("utf-8", "replace").strip().splitlines()
+        return {"passed": False, "error": lines[-1] if lines else f"exit {process.returncode}"}
+    report = json.loads(out.read_text(encoding="utf-8"))
+    RESPONSES.merge(report.pop("responses", {}))
+    return report
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m bench.tcrun")
+    parser.add_argument("script")
+    parser.add_argument("out")
+    parser.add_argument("--coverage", action="store_true")
+    options = parser.parse_args(argv)
+    script, out = os.path.abspath(options.script), options.out
+    profile = profiles.get(config.PROFILE)
+    fixed_waits = {"ms": 0.0}
+    requests: Dict[str, List[float]] = defaultdict(list)
+    coverage = CoverageCollector() if options.coverage else None
+
+    def on_request_finished(request: Request) -> None:
+        kind = TIMED_TYPES.get(request.resource_type)
+        ms = request.timing.get("responseEnd", -1)
+        if kind and ms >= 0:
+            requests[f"{kind} {normalize_route(urlsplit(request.url).path)}"].append(round(ms, 1))
+
+    new_context = Browser.new_context
+
+    async def profiled_new_context(self, *args, **kwargs):
+        if config.HARNESS_ENABLED:
+            HARNESS.start()  # the script's loop is running now: starts the lag monitor
+        context = await new_context(self, *args, **{**kwargs, **profile.context_options()})
+        profiles.apply(context, profile)
+        if config.VITALS_ENABLED:
+            await COLLECTOR.attach(context)
+        if config.RESPONSES_ENABLED:
+            RESPONSES.attach(context)
+        if coverage:
+            coverage.apply(context)
+        context.on("requestfinished", on_request_finished)
+        return context
+
+    close_context = BrowserContext.close
+
+    async def flushed_close(self, *args, **kwargs):
+        if coverage:
+            await coverage.flush()
+        return await close_context(self, *args, **kwargs)
+
+    wait_for_timeout = Page.wait_for_timeout
+
+    async def counted_wait_for_timeout(self, timeout: float) -> None:
+        fixed_waits["ms"] += timeout
+        await wait_for_timeout(self, timeout)
+
+    sleep = asyncio.sleep
+
+    async def counted_sleep(delay, *args, **kwargs):
+        # Only the script's own sleeps; Playwright sleeps internally too.
+        if sys._getframe(1).f_code.co_filename == script:
+            fixed_waits["ms"] += delay * 1000
+        return await sleep(delay, *args, **kwargs)
+
+    Browser.new_context = profiled_new_context
+    BrowserContext.close = flushed_close
+    Page.wait_for_timeout = counted_wait_for_timeout
+    asyncio.sleep = counted_sleep
+
+    if config.HARNESS_ENABLED:
+        HARNESS.install()
+        HARNESS.start(config.HARNESS_SAMPLER_HZ)
+    error = None
+    start = time.perf_counter()
+    try:
+        runpy.run_path(script, run_name="__main__")
+    except Exception as exc:
+        error = f"{type(exc).__name__}: {str(exc).strip().splitlines()[0] if str(exc).strip() else ''}"
+    wall_s = time.perf_counter() - start
+    HARNESS.stop()
+    harness = HARNESS.summary()
+    stacks = HARNESS.write_stacks(f"{Path(script).name.split('_')[0]}-{profile.name}")
+    if stacks:
+        harness["stacks"] = str(stacks)
+
+    Path(out).write_text(json.dumps({
+        "script": Path(script).name,
+        "profile": profile.name,
+        "passed": error is None,
+        "error": error,
+        "wall_s": round(wall_s, 2),
+        "fixed_waits_s": round(fixed_waits["ms"] / 1000, 2),
+        "active_s": round(max(0.0, wall_s - fixed_waits["ms"] / 1000), 2),
+        "requests": requests,
+        "vitals_visits": list(COLLECTOR.visits.values()),
+        "responses": RESPONSES.dump(),
+        "coverage_windows": coverage.windows if coverage else [],
+        "harness": harness,
+    }, ensure_ascii=False), encoding="utf-8")
+    return 0 if error is None else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
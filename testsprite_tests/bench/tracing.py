@@ -0,0 +1,199 @@
+"""W3C trace context for TC flows, exported as OTLP/HTTP JSON.
+
+A :class:`FlowTrace` opens a root span per flow and a child span per step.
+Once attached to a browser context it routes every same-origin request
+(``config.BASE_URL``) through a handler that opens a client span under the
+current step and adds its ``traceparent`` header; the span ends on
+``requestfinished``/``requestfailed`` with the response status. Cross-origin
+requests (Supabase, tiles, fonts) are left alone, since an extra header would
+make them CORS-preflighted. ``page.request`` calls bypass routing and are not
+traced.
+
+With ``OTEL_EXPORTER_OTLP_ENDPOINT`` set, the app (``src/lib/tracing.ts``)
+continues the trace: Next's request span becomes a child of the client span
+and its ``fetch`` spans to ``/rest/v1/`` are the database calls, so one trace
+reads ``TC020 -> step -> GET /dashboard/clientes -> fetch GET .../rest/v1/cliente``.
+
+Spans go to an OTLP collector, e.g. ``bench.standins.otlp``.
+"""
+
+import asyncio
+import json
+import os
+import time
+import urllib.error
+import urllib.request
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+from playwright.async_api import BrowserContext, Request, Route
+
+from . import config
+
+SERVICE_NAME = "bench"
+SCOPE = "bench.tracing"
+# OTLP span kinds (0 is unspecified).
+INTERNAL, SERVER, CLIENT = 1, 2, 3
+STATUS_OK, STATUS_ERROR = 1, 2
+
+
+def _new_id(size: int) -> str:
+    return os.urandom(size).hex()
+
+
+def _attribute(key: str, value) -> dict:
+    if isinstance(value, bool):
+        return {"key": key, "value": {"boolValue": value}}
+    if isinstance(value, int):
+        return {"key": key, "value": {"intValue": str(value)}}
+    if isinstance(value, float):
+        return {"key": key, "value": {"doubleValue": value}}
+    return {"key": key, "value": {"stringValue": str(value)}}
+
+
+class Span:
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str] = None, kind: int = INTERNAL,
+                 attributes: Optional[dict] = None):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = _new_id(8)
+        self.parent_id = parent_id
+        self.kind = kind
+        self.attributes = dict(attributes or {})
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.status = 0
+        self.message = ""
+
+    def traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-01"
+
+    def child(self, name: str, kind: int = INTERNAL, **attributes) -> "Span":
+        return Span(name, self.trace_id, self.span_id, kind, attributes)
+
+    def end(self, error: str = "") -> None:
+        if self.end_ns is not None:
+            return
+        self.end_ns = time.time_ns()
+        if error:
+            self.status, self.message = STATUS_ERROR, error
+        elif not self.status:
+            self.status = STATUS_OK
+
+    def to_otlp(self) -> dict:
+        span = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": self.kind,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns or time.time_ns()),
+            "attributes": [_attribute(k, v) for k, v in self.attributes.items()],
+            "status": {"code": self.status, **({"message": self.message} if self.message else {})},
+        }
+        if self.parent_id:
+            span["parentSpanId"] = self.parent_id
+        return span
+
+
+def otlp_request(spans: List[Span]) -> dict:
+    return {"resourceSpans": [{
+        "resource": {"attributes": [_attribute("service.name", SERVICE_NAME)]},
+        "scopeSpans": [{"scope": {"name": SCOPE}, "spans": [span.to_otlp() for span in spans]}],
+    }]}
+
+
+def export(endpoint: str, spans: List[Span]) -> bool:
+    """POST ``spans`` to ``<endpoint>/v1/traces``; False if the collector is unreachable."""
+    request = urllib.request.Request(
+        f"{endpoint.rstrip('/')}/v1/traces", data=json.dumps(otlp_request(spans)).encode("utf-8"),
+        headers={"Content-Type": "application/json"}, method="POST")
+    try:
+        with urllib.request.urlopen(request, timeout=10) as response:
+            return response.status < 300
+    except (OSError, urllib.error.URLError):
+        return False
+
+
+class FlowTrace:
+    def __init__(self, case_id: str, endpoint: str):
+        self.endpoint = endpoint
+        self.root = Span(case_id, _new_id(16), attributes={"bench.case_id": case_id})
+        self.current = self.root
+        self.spans: List[Span] = [self.root]
+        self._requests: Dict[Request, Span] = {}
+
+    @property
+    def trace_id(self) -> str:
+        return self.root.trace_id
+
+    async def attach(self, context: BrowserContext) -> None:
+        """Trace same-origin requests of ``context`` under the current step."""
+        await context.route(f"{config.BASE_URL}/**", self._route)
+        context.on("response", self._on_response)
+        context.on("requestfinished", lambda request: self._end(request))
+        context.on("requestfailed", lambda request: self._end(request, request.failure or "failed"))
+
+    async def _route(self, route: Route) -> None:
+        request = route.request
+        path = request.url[len(config.BASE_URL):].split("?", 1)[0] or "/"
+        span = self.current.child(f"{request.method} {path}", CLIENT, **{
+            "http.method": request.method, "http.url": request.url,
+            "bench.resource_type": request.resource_type,
+        })
+        self.spans.append(span)
+        self._requests[request] = span
+        await route.continue_(headers={**request.headers, "traceparent": span.traceparent()})
+
+    def _on_response(self, response) -> None:
+        span = self._requests.get(response.request)
+        if span is not None:
+            span.attributes["http.status_code"] = response.status
+            if response.status >= 500:
+                span.status = STATUS_ERROR
+
+    def _end(self, request: Request, error: str = "") -> None:
+        span = self._requests.pop(request, None)
+        if span is not None:
+            span.end(error)
+
+    @contextmanager
+    def step(self, name: str) -> Iterator[Span]:
+        span = self.root.child(name)
+        self.spans.append(span)
+        self.current = span
+        try:
+            yield span
+        except BaseException as error:
+            span.end(str(error).strip().splitlines()[0] if str(error).strip() else type(error).__name__)
+            raise
+        finally:
+            span.end()
+            self.current = self.root
+
+    async def finish(self, passed: bool) -> bool:
+        """End open spans and export the trace; True if the collector accepted it."""
+        for span in self._requests.values():
+            span.end("unfinished")
+        self._requests.clear()
+        self.root.attributes["bench.passed"] = passed
+        self.root.end("" if passed else "flow failed")
+        return await asyncio.to_thread(export, self.endpoint, self.spans)
+
+
+def render_tree(spans: List[dict]) -> List[str]:
+    """Indented ``name (ms) [service]`` lines for flattened collector spans."""
+    children: Dict[Optional[str], List[dict]] = {}
+    ids = {span["span_id"] for span in spans}
+    for span in spans:
+        parent = span.get("parent_id") if span.get("parent_id") in ids else None
+        children.setdefault(parent, []).append(span)
+    lines: List[str] = []
+
+    def walk(parent: Optional[str], depth: int) -> None:
+        for span in sorted(children.get(parent, []), key=lambda s: s["start_ns"]):
+            lines.append(f"{'  ' * depth}{span['name']} ({span['ms']:.1f} ms) [{span['service']}]")
+            walk(span["span_id"], depth + 1)
+
+    walk(None, 0)
+    return lines
@@ -0,0 +1,27 @@
+"""Run the TypeScript drivers in ``bench/node`` with the repo's tsx.
+
+The drivers import app modules through the ``@/`` alias, so they run from the
+repository root where ``tsconfig.json`` lives.
+"""
+
+import asyncio
+import os
+import shlex
+from pathlib import Path
+from typing import Optional
+
+from . import config
+
+NODE_DIR = Path(__file__).resolve().parent / "node"
+
+
+async def run_driver(name: str, *args: str, env: Optional[dict] = None) -> None:
+    """Run ``node/<name>``; raises RuntimeError with the last stderr line on failure."""
+    process = await asyncio.create_subprocess_exec(
+        *shlex.split(config.TSX), str(NODE_DIR / name), *args,
+        cwd=config.REPO_ROOT, env={**os.environ, **(env or {})}, stderr=asyncio.subprocess.PIPE,
+    )
+    _, stderr = await process.communicate()
+    if process.returncode != 0:
+        lines = stderr.decode("utf-8", "replace").strip().splitlines()
+        raise RuntimeError(f"{name} exited with {process.returncode}: {lines[-1] if lines else ''}")
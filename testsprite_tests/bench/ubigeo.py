@@ -0,0 +1,53 @@
+"""The INEI ubigeo tree from ``data/inei-csvs`` (the files ``/api/ubigeo`` serves)."""
+
+import csv
+import random
+from collections import defaultdict
+from itertools import accumulate
+from typing import Dict, List, Sequence, Tuple
+
+from . import config
+
+CSV_DIR = config.REPO_ROOT / "data" / "inei-csvs"
+# Departamentos by number of clients a Lima-based real-estate CRM tends to see.
+POPULARIDAD = ("15", "07", "04", "13", "20", "14", "08", "12", "11", "02", "06", "21", "22", "16")
+
+
+def zipf_weights(count: int, skew: float) -> List[float]:
+    """Cumulative Zipf weights for ``random.choices(..., cum_weights=...)``."""
+    return list(accumulate(1 / (rank ** skew) for rank in range(1, count + 1)))
+
+
+class Ubigeo:
+    def __init__(self):
+        def rows(name: str) -> List[dict]:
+            with (CSV_DIR / f"{name}.csv").open(encoding="utf-8") as handle:
+                return list(csv.DictReader(handle))
+
+        self.departamentos = {r["code"]: r["name"] for r in rows("departamentos")}
+        self.provincias: Dict[str, List[Tuple[str, str]]] = defaultdict(list)
+        self.distritos: Dict[str, List[Tuple[str, str]]] = defaultdict(list)
+        for r in rows("provincias"):
+            self.provincias[r["departamento_code"]].append((r["code"], r["name"]))
+        for r in rows("distritos"):
+            self.distritos[r["provincia_code"]].append((r["code"], r["name"]))
+        for children in (*self.provincias.values(), *self.distritos.values()):
+            children.sort()
+        self.names = {**self.departamentos, **{code: name for children in (
+            *self.provincias.values(), *self.distritos.values()) for code, name in children}}
+        self._order = list(POPULARIDAD) + sorted(set(self.departamentos) - set(POPULARIDAD))
+        self._weights: Dict[Tuple[int, float], List[float]] = {}
+
+    def _choice(self, rng: random.Random, items: Sequence, skew: float):
+        key = (len(items), skew)
+        weights = self._weights.get(key)
+        if weights is None:
+            weights = self._weights[key] = zipf_weights(len(items), skew)
+        return rng.choices(items, cum_weights=weights)[0]
+
+    def sample(self, rng: random.Random, skew: float) -> Tuple[str, str, str]:
+        """Departamento, provincia and distrito codes, capitals and popular departamentos first."""
+        dep = self._choice(rng, self._order, skew)
+        prov = self._choice(rng, self.provincias[dep], skew)[0]
+        dist = self._choice(rng, self.distritos[prov], skew)[0]
+        return dep, prov, dist
@@ -0,0 +1,230 @@
+"""Perceptual screenshot comparison against content-addressed baselines.
+
+Region screenshots (a chart, the reports panel) are stored once under
+``BENCH_VISUAL_DIR/objects/<sha256[:2]>/<sha256>.png``; ``baselines.json``
+maps each check key (``dashboard/chart-0@desktop``) to the object it should
+match plus that image's 64-bit difference hash (dHash).
+
+A comparison goes through three levels, stopping at the first that decides:
+
+1. same sha256 as the baseline: identical, nothing is decoded,
+2. dHash within ``threshold`` bits of the baseline's: same rendering (text
+   antialiasing, a one-pixel shift),
+3. full pixel diff: the share of pixels whose channels differ by more than
+   ``tolerance`` must stay under ``max_ratio``; a diff image is written
+   otherwise.
+
+Images are decoded and compared in a pool of blank Chromium pages
+(``createImageBitmap`` plus an ``OffscreenCanvas``), so no imaging library
+is needed and comparisons run while the capturing pages move on.
+"""
+
+import asyncio
+import base64
+import hashlib
+import json
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from playwright.async_api import Browser, BrowserContext, Page
+
+from . import config
+
+_DECODE_JS = """
+  const decode = async (b64) => {
+    const blob = await (await fetch('data:image/png;base64,' + b64)).blob();
+    const bitmap = await createImageBitmap(blob);
+    const canvas = new OffscreenCanvas(bitmap.width, bitmap.height);
+    const ctx = canvas.getContext('2d', {willReadFrequently: true});
+    ctx.drawImage(bitmap, 0, 0);
+    return {bitmap, ctx, width: bitmap.width, height: bitmap.height};
+  };
+"""
+
+# dHash: 9x8 grayscale thumbnail, one bit per horizontal gradient sign.
+HASH_JS = "async (b64) => {" + _DECODE_JS + """
+  const {bitmap, width, height} = await decode(b64);
+  const thumb = new OffscreenCanvas(9, 8).getContext('2d', {willReadFrequently: true});
+  thumb.drawImage(bitmap, 0, 0, 9, 8);
+  const px = thumb.getImageData(0, 0, 9, 8).data;
+  const luma = (x, y) => { const i = (y * 9 + x) * 4; return 0.299 * px[i] + 0.587 * px[i + 1] + 0.114 * px[i + 2]; };
+  let bits = '';
+  for (let y = 0; y < 8; y++) for (let x = 0; x < 8; x++) bits += luma(x, y) > luma(x + 1, y) ? '1' : '0';
+  return {hash: BigInt('0b' + bits).toString(16).padStart(16, '0'), width, height};
+}
+"""
+
+DIFF_JS = "async ([currentB64, baselineB64, tolerance]) => {" + _DECODE_JS + """
+  const current = await decode(currentB64);
+  const baseline = await decode(baselineB64);
+  const width = Math.max(current.width, baseline.width), height = Math.max(current.height, baseline.height);
+  const a = current.ctx.getImageData(0, 0, width, height).data;
+  const b = baseline.ctx.getImageData(0, 0, width, height).data;
+  const out = new OffscreenCanvas(width, height);
+  const octx = out.getContext('2d');
+  const diff = octx.createImageData(width, height);
+  let changed = 0;
+  for (let i = 0; i < a.length; i += 4) {
+    const delta = Math.max(Math.abs(a[i] - b[i]), Math.abs(a[i + 1] - b[i + 1]),
+                           Math.abs(a[i + 2] - b[i + 2]), Math.abs(a[i + 3] - b[i + 3]));
+    if (delta > tolerance) {
+      changed++;
+      diff.data.set([255, 0, 0, 255], i);
+    } else {
+      const gray = (b[i] + b[i + 1] + b[i + 2]) / 3;
+      diff.data.set([gray, gray, gray, 64], i);
+    }
+  }
+  let image = null;
+  if (changed) {
+    octx.putImageData(diff, 0, 0);
+    const blob = await out.convertToBlob({type: 'image/png'});
+    const bytes = new Uint8Array(await blob.arrayBuffer());
+    let binary = '';
+    for (let i = 0; i < bytes.length; i += 0x8000) binary += String.fromCharCode(...bytes.subarray(i, i + 0x8000));
+    image = btoa(binary);
+  }
+  return {changed, total: width * height, image};
+}
+"""
+
+
+def hamming(a: str, b: str) -> int:
+    return bin(int(a, 16) ^ int(b, 16)).count("1")
+
+
+class Store:
+    """PNG objects by sha256 plus the key -> baseline index."""
+
+    def __init__(self, directory: Path = config.VISUAL_DIR):
+        self.objects = directory / "objects"
+        self.index_path = directory / "baselines.json"
+        try:
+            self.index: Dict[str, dict] = json.loads(self.index_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            self.index = {}
+
+    def put(self, png: bytes) -> str:
+        sha = hashlib.sha256(png).hexdigest()
+        path = self.objects / sha[:2] / f"{sha}.png"
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(png)
+        return sha
+
+    def get(self, sha: str) -> bytes:
+        return (self.objects / sha[:2] / f"{sha}.png").read_bytes()
+
+    def baseline(self, key: str) -> Optional[dict]:
+        return self.index.get(key)
+
+    def set_baseline(self, key: str, sha: str, dhash: str, size: List[int]) -> None:
+        self.index[key] = {"sha": sha, "dhash": dhash, "size": size, "at": time.time()}
+
+    def save(self) -> None:
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        self.index_path.write_text(json.dumps(self.index, indent=2, sort_keys=True), encoding="utf-8")
+
+    def prune(self) -> int:
+        """Delete objects no baseline points to; returns how many."""
+        keep = {entry["sha"] for entry in self.index.values()}
+        removed = 0
+        for path in self.objects.glob("*/*.png"):
+            if path.stem not in keep:
+                path.unlink()
+                removed += 1
+        return removed
+
+
+class ComparePool:
+    """Comparison workers, one blank page each, fed from a queue.
+
+    :meth:`submit` stores the capture and returns at once; :meth:`drain`
+    waits for every queued comparison and returns the outcomes in order.
+    """
+
+    def __init__(self, chromium: Browser, store: Store, diff_dir: Path, workers: int = 4, threshold: int = 0,
+                 tolerance: int = 16, max_ratio: float = 0.001, update: bool = False):
+        self.chromium = chromium
+        self.store = store
+        self.diff_dir = diff_dir
+        self.workers = max(1, workers)
+        self.threshold = threshold
+        self.tolerance = tolerance
+        self.max_ratio = max_ratio
+        self.update = update
+        self.queue: "asyncio.Queue[Optional[dict]]" = asyncio.Queue()
+        self.outcomes: List[dict] = []
+        self._context: Optional[BrowserContext] = None
+        self._tasks: List[asyncio.Task] = []
+
+    async def start(self) -> None:
+        self._context = await self.chromium.new_context()
+        pages = [await self._context.new_page() for _ in range(self.workers)]
+        self._tasks = [asyncio.create_task(self._worker(page)) for page in pages]
+
+    def submit(self, key: str, png: bytes) -> None:
+        outcome = {"key": key, "sha": self.store.put(png), "bytes": len(png)}
+        self.outcomes.append(outcome)
+        self.queue.put_nowait({"outcome": outcome, "png": png})
+
+    async def drain(self) -> List[dict]:
+        for _ in self._tasks:
+            self.queue.put_nowait(None)
+        await asyncio.gather(*self._tasks)
+        self._tasks = []
+        if self._context:
+            await self._context.close()
+            self._context = None
+        if self.update or any(o["status"] == "new" for o in self.outcomes):
+            self.store.save()
+        return self.outcomes
+
+    async def _worker(self, page: Page) -> None:
+        while True:
+            job = await self.queue.get()
+            if job is None:
+                return
+            outcome = job["outcome"]
+            start = time.perf_counter()
+            try:
+                await self._compare(page, outcome, job["png"])
+            except Exception as error:  # a bad capture must not stop the other comparisons
+                outcome.update(status="error", error=str(error).strip().splitlines()[0])
+            outcome["compare_ms"] = round((time.perf_counter() - start) * 1000, 1)
+
+    async def _compare(self, page: Page, outcome: dict, png: bytes) -> None:
+        baseline = self.store.baseline(outcome["key"])
+        if baseline and baseline["sha"] == outcome["sha"]:
+            outcome.update(status="identical", level="sha256")
+            return
+
+        current = await page.evaluate(HASH_JS, base64.b64encode(png).decode("ascii"))
+        outcome.update(dhash=current["hash"], size=[current["width"], current["height"]])
+        if not baseline or self.update:
+            self.store.set_baseline(outcome["key"], outcome["sha"], current["hash"], outcome["size"])
+            outcome.update(status="updated" if baseline else "new", level="baseline")
+            return
+
+        outcome["hash_distance"] = hamming(current["hash"], baseline["dhash"])
+        if outcome["hash_distance"] <= self.threshold and outcome["size"] == baseline["size"]:
+            outcome.update(status="match", level="dhash")
+            return
+
+        diff = await page.evaluate(DIFF_JS, [
+            base64.b64encode(png).decode("ascii"),
+            base64.b64encode(self.store.get(baseline["sha"])).decode("ascii"),
+            self.tolerance,
+        ])
+        ratio = diff["changed"] / diff["total"] if diff["total"] else 0.0
+        outcome.update(level="pixels", changed_pixels=diff["changed"], changed_ratio=round(ratio, 6))
+        if outcome["size"] != baseline["size"]:
+            outcome["baseline_size"] = baseline["size"]
+        changed = ratio > self.max_ratio or outcome["size"] != baseline["size"]
+        outcome["status"] = "changed" if changed else "match"
+        if changed and diff["image"]:
+            path = self.diff_dir / (outcome["key"].replace("/", "__").replace("@", "--") + ".png")
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(base64.b64decode(diff["image"]))
+            outcome["diff"] = str(path)
@@ -0,0 +1,158 @@
+"""Core Web Vitals for every page a scenario opens.
+
+``browser.new_context()`` attaches :data:`COLLECTOR` to each context: an init
+script observes TTFB, FCP, LCP, CLS and INP in the page and reports them
+through a Playwright binding every time a value changes, so nothing is lost
+when the context closes. A "visit" starts with each document load (``hard``)
+and with each client-side route change of the Next.js app (``soft``; only
+CLS and INP are meaningful there, browsers do not emit paint timings for
+them).
+
+``python -m bench`` adds :meth:`VitalsCollector.summary` to every results
+file: per-route p50/p75/p95 and a pass/fail against the budget at p75, the
+percentile web-vitals uses. Budgets default to Google's "good" thresholds
+and can be overridden per route in ``BENCH_VITALS_BUDGETS``.
+"""
+
+import re
+from collections import defaultdict
+from typing import Dict, List
+
+from playwright.async_api import BrowserContext
+
+from . import budgets as budget_files
+from . import config
+from .stats import percentile
+
+METRICS = ("ttfb", "fcp", "lcp", "cls", "inp")
+HARD_ONLY = ("ttfb", "fcp", "lcp")
+DEFAULT_BUDGETS = {"ttfb": 800, "fcp": 1800, "lcp": 2500, "cls": 0.1, "inp": 200}
+
+_ID_SEGMENT = re.compile(r"/(?:[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}|\d+)(?=/|$)", re.I)
+
+COLLECTOR_JS = """
+(() => {
+  if (window.__benchVitals || typeof PerformanceObserver === "undefined") return;
+  const report = window.__benchVitalsReport;
+  const doc = Math.random().toString(36).slice(2);
+  let seq = 0, visit = null, pending = false;
+
+  const send = () => {
+    pending = false;
+    if (!visit) return;
+    const { id, route, kind, ttfb, fcp, lcp, cls, inp } = visit;
+    report({ id, route, kind, ttfb, fcp, lcp, cls, inp }).catch(() => {});
+  };
+  const changed = () => { if (!pending) { pending = true; setTimeout(send, 50); } };
+  const start = (kind) => {
+    visit = { id: doc + ":" + seq++, route: location.pathname, kind, ttfb: null, fcp: null, lcp: null,
+              cls: 0, inp: null, session: 0, first: 0, last: 0, interactions: new Map() };
+    changed();
+  };
+  const observe = (type, cb, extra) => {
+    try { new PerformanceObserver((list) => list.getEntries().forEach(cb))
+            .observe({ type, buffered: true, ...extra }); } catch (e) {}
+  };
+
+  start("hard");
+  const nav = performance.getEntriesByType("navigation")[0];
+  if (nav) visit.ttfb = Math.max(0, nav.responseStart);
+
+  observe("paint", (e) => {
+    if (e.name === "first-contentful-paint" && visit.kind === "hard") { visit.fcp = e.startTime; changed(); }
+  });
+  observe("largest-contentful-paint", (e) => {
+    if (visit.kind === "hard") { visit.lcp = e.startTime; changed(); }
+  });
+  observe("layout-shift", (e) => {
+    if (e.hadRecentInput) return;
+    // Session windows: shifts < 1s apart, window capped at 5s; CLS is the worst window.
+    if (visit.session && e.startTime - visit.last < 1000 && e.startTime - visit.first < 5000) {
+      visit.session += e.value;
+    } else {
+      visit.session = e.value;
+      visit.first = e.startTime;
+    }
+    visit.last = e.startTime;
+    visit.cls = Math.max(visit.cls, visit.session);
+    changed();
+  });
+  observe("event", (e) => {
+    if (!e.interactionId) return;
+    const longest = Math.max(visit.interactions.get(e.interactionId) || 0, e.duration);
+    visit.interactions.set(e.interactionId, longest);
+    // INP: worst interaction, ignoring one outlier per 50 interactions.
+    const sorted = [...visit.interactions.values()].sort((a, b) => b - a);
+    visit.inp = sorted[Math.min(sorted.length - 1, Math.floor(sorted.length / 50))];
+    changed();
+  }, { durationThreshold: 16 });
+
+  const softNavigation = () => {
+    if (location.pathname === visit.route) return;
+    send();
+    start("soft");
+  };
+  for (const method of ["pushState", "replaceState"]) {
+    const original = history[method];
+    history[method] = function (...args) {
+      const result = original.apply(this, args);
+      softNavigation();
+      return result;
+    };
+  }
+  window.addEventListener("popstate", softNavigation);
+  window.__benchVitals = true;
+})();
+"""
+
+
+def normalize_route(path: str) -> str:
+    """``/dashboard/clientes/3f2c…`` -> ``/dashboard/clientes/[id]``."""
+    return _ID_SEGMENT.sub("/[id]", path.split("?")[0].rstrip("/") or "/")
+
+
+class VitalsCollector:
+    def __init__(self):
+        self.visits: Dict[str, dict] = {}
+
+    async def attach(self, context: BrowserContext) -> None:
+        await context.expose_binding("__benchVitalsReport", self._report)
+        await context.add_init_script(COLLECTOR_JS)
+
+    def _report(self, source, entry: dict) -> None:
+        self.visits[entry["id"]] = entry
+
+    def reset(self) -> None:
+        self.visits.clear()
+
+    def summary(self) -> dict:
+        values: Dict[str, Dict[str, List[float]]] = defaultdict(lambda: defaultdict(list))
+        for visit in self.visits.values():
+            route = normalize_route(visit["route"])
+            for metric in METRICS:
+                if visit.get(metric) is None or (metric in HARD_ONLY and visit["kind"] != "hard"):
+                    continue
+                values[route][metric].append(visit[metric])
+
+        budgets = budget_files.load(config.VITALS_BUDGETS_FILE, DEFAULT_BUDGETS)
+        routes, failures = {}, []
+        for route, metrics in sorted(values.items()):
+            budget = budget_files.for_route(budgets, route)
+            routes[route] = {}
+            p75s = {}
+            for metric, samples in metrics.items():
+                digits = 3 if metric == "cls" else 1
+                p75s[metric] = round(percentile(samples, 75), digits)
+                routes[route][metric] = {
+                    "count": len(samples),
+                    "p50": round(percentile(samples, 50), digits),
+                    "p75": p75s[metric],
+                    "p95": round(percentile(samples, 95), digits),
+                    "budget": budget[metric],
+                    "pass": p75s[metric] <= budget[metric],
+                }
+            failures.extend(budget_files.exceeded(route, p75s, budget))
+        return {"visits": len(self.visits), "routes": routes, "budget_failures": failures}
+
+
+COLLECTOR = VitalsCollector()
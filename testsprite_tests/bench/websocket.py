@@ -0,0 +1,127 @@
+"""Minimal RFC 6455 framing shared by the realtime stand-in and its clients.
+
+Only what the Phoenix/Supabase Realtime protocol needs: text frames,
+ping/pong and close, unfragmented. Server-side helpers work on the blocking
+``rfile``/``wfile`` of a ``BaseHTTPRequestHandler``; :class:`Connection` is
+the asyncio client used for lightweight subscribers.
+"""
+
+import asyncio
+import base64
+import hashlib
+import os
+import ssl
+import struct
+from typing import BinaryIO, Optional, Tuple
+from urllib.parse import urlsplit
+
+GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+TEXT, CLOSE, PING, PONG = 0x1, 0x8, 0x9, 0xA
+
+
+class ConnectionClosed(Exception):
+    pass
+
+
+def accept_key(key: str) -> str:
+    return base64.b64encode(hashlib.sha1((key + GUID).encode("ascii")).digest()).decode("ascii")
+
+
+def encode(payload: bytes, opcode: int = TEXT, mask: bool = False) -> bytes:
+    length = len(payload)
+    if length < 126:
+        header = struct.pack("!BB", 0x80 | opcode, (0x80 if mask else 0) | length)
+    elif length < 1 << 16:
+        header = struct.pack("!BBH", 0x80 | opcode, (0x80 if mask else 0) | 126, length)
+    else:
+        header = struct.pack("!BBQ", 0x80 | opcode, (0x80 if mask else 0) | 127, length)
+    if not mask:
+        return header + payload
+    key = os.urandom(4)
+    return header + key + _unmask(payload, key)
+
+
+def _unmask(payload: bytes, key: bytes) -> bytes:
+    if not payload:
+        return payload
+    repeated = (key * (len(payload) // 4 + 1))[:len(payload)]
+    return (int.from_bytes(payload, "big") ^ int.from_bytes(repeated, "big")).to_bytes(len(payload), "big")
+
+
+def _lengths(head: bytes) -> Tuple[int, int, bool, int]:
+    opcode, masked, length = head[0] & 0x0F, bool(head[1] & 0x80), head[1] & 0x7F
+    extra = {126: 2, 127: 8}.get(length, 0)
+    return opcode, length, masked, extra
+
+
+def read_frame(rfile: BinaryIO) -> Tuple[int, bytes]:
+    """Blocking read of one frame from a client (masked) or server."""
+    head = rfile.read(2)
+    if len(head) < 2:
+        raise ConnectionClosed()
+    opcode, length, masked, extra = _lengths(head)
+    if extra:
+        length = int.from_bytes(rfile.read(extra), "big")
+    key = rfile.read(4) if masked else b""
+    payload = rfile.read(length)
+    if len(payload) < length:
+        raise ConnectionClosed()
+    return opcode, _unmask(payload, key) if masked else payload
+
+
+class Connection:
+    """Asyncio WebSocket client: ``await Connection.open(url)``, ``send``, ``recv``."""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+
+    @classmethod
+    async def open(cls, url: str, timeout: float = 10.0) -> "Connection":
+        parts = urlsplit(url)
+        secure = parts.scheme in ("wss", "https")
+        port = parts.port or (443 if secure else 80)
+        reader, writer = await asyncio.wait_for(asyncio.open_connection(
+            parts.hostname, port, ssl=ssl.create_default_context() if secure else None,
+            limit=1 << 22), timeout)
+        key = base64.b64encode(os.urandom(16)).decode("ascii")
+        target = parts.path + (f"?{parts.query}" if parts.query else "")
+        writer.write((
+            f"GET {target} HTTP/1.1\r\nHost: {parts.netloc}\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+            f"Sec-WebSocket-Key: {key}\r\nSec-WebSocket-Version: 13\r\n\r\n"
+        ).encode("ascii"))
+        await writer.drain()
+        response = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), timeout)
+        status = response.split(b"\r\n", 1)[0]
+        if b" 101 " not in status or accept_key(key).encode("ascii") not in response:
+            writer.close()
+            raise ConnectionClosed(f"handshake failed: {status.decode('latin-1')}")
+        return cls(reader, writer)
+
+    async def send(self, text: str) -> None:
+        self.writer.write(encode(text.encode("utf-8"), TEXT, mask=True))
+        await self.writer.drain()
+
+    async def recv(self) -> Optional[str]:
+        """Next text message; ``None`` once the server closes the connection."""
+        while True:
+            try:
+                head = await self.reader.readexactly(2)
+                opcode, length, masked, extra = _lengths(head)
+                if extra:
+                    length = int.from_bytes(await self.reader.readexactly(extra), "big")
+                key = await self.reader.readexactly(4) if masked else b""
+                payload = await self.reader.readexactly(length)
+            except (asyncio.IncompleteReadError, ConnectionError):
+                return None
+            if masked:
+                payload = _unmask(payload, key)
+            if opcode == TEXT:
+                return payload.decode("utf-8")
+            if opcode == PING:
+                self.writer.write(encode(payload, PONG, mask=True))
+            elif opcode == CLOSE:
+                return None
+
+    def close(self) -> None:
+        self.writer.close()